@@ -0,0 +1,508 @@
+import weakref
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# --- Per-Frame Cache ---
+# DataFrame 객체(identity)별로 한 번만 만드는 파생 구조(큐브/코호트/인덱스) 캐시. 프레임은 약한 참조로만 잡아서
+# 페이지가 다시 로드해 이전 프레임을 놓으면 항목도 바로 사라짐. 최대 size개(오래 안 쓴 것부터 제거), 로드 워커/렌더 스레드에서 함께 사용 (lock)
+# 값(파생 구조)은 프레임을 강하게 참조하면 안 됨 (참조하면 프레임이 해제되지 않음)
+class FrameCache:
+    def __init__(self, build, size=8): self.build = build; self.size = size; self.items = OrderedDict(); self.lock = threading.RLock()
+    def _lookup(self, k, df):
+        hit = self.items.get(k)
+        if hit is not None and hit[0]() is df: self.items.move_to_end(k); return hit[1]
+        return None
+    def get(self, df, *key):
+        k = (id(df),) + key
+        with self.lock: value = self._lookup(k, df)
+        if value is not None: return value
+        value = self.build(df, *key)   # 생성은 락 밖에서 (다른 프레임 조회를 막지 않음), 그 사이 다른 스레드가 넣었으면 그것을 사용
+        with self.lock:
+            hit = self._lookup(k, df)
+            if hit is not None: return hit
+            self.items[k] = (weakref.ref(df, lambda _, k=k: self.discard(k)), value)
+            while len(self.items) > self.size: self.items.popitem(last=False)
+        return value
+    def discard(self, k):
+        # 프레임이 해제될 때 (같은 id를 새 프레임이 이미 쓰고 있으면 그대로 둠)
+        with self.lock:
+            hit = self.items.get(k)
+            if hit is not None and hit[0]() is None: del self.items[k]
+    def clear(self):
+        with self.lock: self.items.clear()
+
+# --- YTD Prefix-Sum Cube ---
+# Brand × Region × Year × Time 합계를 시간축으로 누적(prefix-sum)해 두고, 임의 cutoff의 YTD 합계는 인덱싱 한 번으로 조회
+class YTDCube:
+    def __init__(self, df, time_col, brand_col="Brand_Group", region_col="Region", value_col="Sales"):
+        self.time_col = time_col; self.brand_col = brand_col; self.region_col = region_col
+        t = pd.to_numeric(df[time_col], errors='coerce').values; y = pd.to_numeric(df["Year"], errors='coerce').values
+        ok = ~(np.isnan(t.astype(float)) | np.isnan(y.astype(float)))
+        t = np.clip(t[ok].astype(int), 0, None); y = y[ok].astype(int); v = pd.to_numeric(df[value_col], errors='coerce').fillna(0).values[ok].astype(float)
+        b_codes, self.brands = pd.factorize(df[brand_col].values[ok], sort=True); self.brands = np.asarray(self.brands, dtype=object)
+        r_codes, self.regions = pd.factorize(df[region_col].values[ok], sort=True); self.regions = np.asarray(self.regions, dtype=object)
+        self.years = np.unique(y); y_codes = np.searchsorted(self.years, y); self.n_time = int(t.max()) + 1 if len(t) else 1
+        shape = (len(self.brands), len(self.regions), len(self.years), self.n_time); size = int(np.prod(shape))
+        flat = np.ravel_multi_index((b_codes, r_codes, y_codes, t), shape) if size else np.empty(0, dtype=int)
+        self.cum = np.bincount(flat, weights=v, minlength=size).reshape(shape).cumsum(axis=3)
+        self.cnt = np.bincount(flat, minlength=size).reshape(shape).cumsum(axis=3)
+    def year_index(self, year):
+        i = int(np.searchsorted(self.years, year))
+        return i if i < len(self.years) and self.years[i] == year else None
+    def _cut(self, cutoff): return int(np.clip(cutoff, 0, self.n_time - 1))
+    def _select(self, arr, brand=None, region=None):
+        if brand is not None: arr = arr[self.brands == brand]
+        if region is not None: arr = arr[:, self.regions == region]
+        return arr
+    def count(self, cutoff): return int(self.cnt[..., self._cut(cutoff)].sum())
+    def latest_time(self, year, default=None, brand=None, region=None):
+        # 해당 연도에 데이터가 있는 마지막 시점 (= df[df.Year == year][time_col].max())
+        yi = self.year_index(year)
+        if yi is None: return default
+        per_t = np.diff(self._select(self.cnt[:, :, yi, :], brand, region).sum(axis=(0, 1)), prepend=0); nz = np.nonzero(per_t)[0]
+        return int(nz[-1]) if len(nz) else default
+    def ytd(self, year, cutoff):
+        # pivot_table(index=brand, columns=region, fill_value=0)과 같은 모양 (데이터가 있는 행/열만)
+        yi = self.year_index(year)
+        if yi is None or cutoff is None or cutoff < 0: return pd.DataFrame()
+        c = self._cut(cutoff); cnt = self.cnt[:, :, yi, c]; rows = cnt.sum(axis=1) > 0; cols = cnt.sum(axis=0) > 0
+        return pd.DataFrame(self.cum[:, :, yi, c][np.ix_(rows, cols)], index=pd.Index(self.brands[rows], name=self.brand_col), columns=pd.Index(self.regions[cols], name=self.region_col))
+    def ytd_by(self, cutoff, years, by="brand", brand=None, region=None):
+        # 연도 × (brand | region) YTD 표. brand/region을 지정하면 해당 축을 하나로 고정
+        c = self._cut(cutoff); axis = 1 if by == "brand" else 0
+        vol = self._select(self.cum[..., c], brand, region).sum(axis=axis); cnt = self._select(self.cnt[..., c], brand, region).sum(axis=axis)
+        labels = self.brands if by == "brand" else self.regions; keep = [self.year_index(y) for y in years]; keep = [i for i in keep if i is not None]
+        has = cnt[:, keep].sum(axis=1) > 0 if keep else np.zeros(len(labels), dtype=bool)
+        out = pd.DataFrame(vol[has][:, keep].T, index=pd.Index(self.years[keep], name="Year"), columns=pd.Index(labels[has], name=self.brand_col if by == "brand" else self.region_col))
+        return out.reindex(pd.Index(years, name="Year"))
+
+_CUBES = FrameCache(YTDCube)
+def cube_for(df, time_col, brand_col="Brand_Group", region_col="Region"):
+    # 같은 DataFrame 객체에 대해서는 한 번만 생성 (Heatmap/Trend가 공유)
+    return _CUBES.get(df, time_col, brand_col, region_col)
+
+# --- Year-Pair Comparison Cube ---
+def year_pairs(years):
+    years = sorted(int(y) for y in years)
+    return [(a, b) for i, a in enumerate(years) for b in years[i+1:]]
+
+def default_year_pair(years):
+    # 가장 최근 두 연도 (연도가 하나뿐이면 자기 자신과 비교)
+    years = sorted(int(y) for y in years)
+    if not years: return None
+    return (years[-2], years[-1]) if len(years) > 1 else (years[-1], years[-1])
+
+def display_years(years, pair, span=3):
+    # 차트에 함께 그릴 연도: 비교 연도 기준 최근 span개 + 기준 연도
+    base, comp = pair
+    return [int(y) for y in sorted(years) if y == base or comp - span < y <= comp]
+
+class YoYCube:
+    # cutoff 시점 YTD 볼륨에서 모든 연도 쌍의 차이/성장률을 한 번에 계산 (B × R × Y(base) × Y(comp))
+    def __init__(self, ytd_cube, cutoff):
+        self.src = ytd_cube; self.cutoff = cutoff; c = ytd_cube._cut(cutoff)
+        self.vol = ytd_cube.cum[..., c]; self.cnt = ytd_cube.cnt[..., c]
+        base = self.vol[..., :, None]; comp = self.vol[..., None, :]; self.diff = comp - base
+        with np.errstate(divide='ignore', invalid='ignore'): self.pct = np.where(base != 0, self.diff / base * 100, np.where(comp > 0, 100.0, 0.0))
+    def volumes(self, year): return self.src.ytd(year, self.cutoff)
+    def pair(self, base, comp): return self.volumes(base), self.volumes(comp)
+    def _pair_frame(self, arr, base, comp):
+        bi = self.src.year_index(base); ci = self.src.year_index(comp)
+        if bi is None or ci is None: return pd.DataFrame()
+        cnt = self.cnt[..., bi] + self.cnt[..., ci]; rows = cnt.sum(axis=1) > 0; cols = cnt.sum(axis=0) > 0
+        return pd.DataFrame(arr[..., bi, ci][np.ix_(rows, cols)], index=pd.Index(self.src.brands[rows], name=self.src.brand_col), columns=pd.Index(self.src.regions[cols], name=self.src.region_col))
+    def diff_frame(self, base, comp): return self._pair_frame(self.diff, base, comp)
+    def pct_frame(self, base, comp): return self._pair_frame(self.pct, base, comp)
+
+# --- Long-tail "Others" Folding ---
+# 행(브랜드) × 열(지역) 행렬에서 열마다 작은 행을 Others 행으로 합침. 기준 행렬로 만든 접기 마스크를 다른 연도에도 그대로 적용
+def fold_mask(values, threshold=None, top_n=None, eligible=None):
+    eligible = np.ones(values.shape[0], dtype=bool) if eligible is None else np.asarray(eligible, dtype=bool)
+    mask = np.zeros(values.shape, dtype=bool)
+    if threshold is not None: mask |= values < threshold
+    if top_n is not None:
+        # 열마다 대상 행 중 상위 top_n 외는 접음 (대상이 아닌 행은 순위 계산에서 제외)
+        ranked = np.where(eligible[:, None], values, -np.inf); rank = np.argsort(np.argsort(-ranked, axis=0, kind='stable'), axis=0); mask |= rank >= top_n
+    return mask & eligible[:, None]
+
+class FoldMap:
+    # 어떤 (행, 열) 칸이 Others로 접혔는지 기록 → Others 드릴다운이 히트맵과 같은 기준을 사용
+    def __init__(self, mask, label="Others"): self.mask = mask; self.label = label
+    def members(self, col=None):
+        m = self.mask.values if col is None or col not in self.mask.columns else self.mask[[col]].values
+        return self.mask.index[m.any(axis=1)].tolist()
+    def select(self, rows, cols):
+        # 행/열 라벨 배열(원본 데이터 각 행) 중 Others에 합쳐지는 위치 (원래 Others 그룹 포함)
+        rows = np.asarray(rows, dtype=object); ri = self.mask.index.get_indexer(rows); ci = self.mask.columns.get_indexer(np.asarray(cols, dtype=object))
+        ok = (ri >= 0) & (ci >= 0); out = np.zeros(len(rows), dtype=bool); out[ok] = self.mask.values[ri[ok], ci[ok]]
+        return out | (rows == self.label)
+
+def fold_others(base, *others, threshold=None, top_n=None, keep=(), label="Others"):
+    # base 기준으로 접기 마스크 생성 → base와 others 모두 같은 (행, 열) 축으로 맞춘 뒤 한 번에 접음
+    frames = (base,) + others; index = base.index; columns = base.columns
+    for f in others: index = index.append(f.index.difference(index)); columns = columns.append(f.columns.difference(columns))
+    if label not in index: index = index.append(pd.Index([label]))
+    index = index.rename(base.index.name); columns = columns.rename(base.columns.name)
+    vals = [f.reindex(index=index, columns=columns, fill_value=0).values.astype(float) for f in frames]
+    eligible = index.isin(base.index) & ~index.isin(list(keep) + [label])
+    mask = fold_mask(vals[0], threshold, top_n, eligible); li = index.get_loc(label); out = []
+    for v in vals:
+        moved = np.where(mask, v, 0).sum(axis=0); v = np.where(mask, 0, v); v[li] += moved
+        out.append(pd.DataFrame(v, index=index, columns=columns))
+    return out, FoldMap(pd.DataFrame(mask, index=index, columns=columns), label)
+
+# --- Region × Brand YoY Tables ---
+# Heatmap 위젯과 배치(CLI)가 같은 집계를 쓰도록 화면과 무관한 부분만 분리
+BRAND_GROUPS = {"APPLE": "Apple", "GOOGLE": "Google", "HONOR": "Honor", "HUAWEI": "Huawei", "SAMSUNG": "Samsung", "XIAOMI": "Xiaomi", "VIVO": "vivo"}
+EXCLUDED_REGIONS = ["East Europe", "E.Europe", "E. Europe", "East Europe "]
+
+def group_brand(name):
+    u_name = str(name).strip().upper()
+    if u_name in ["OPPO", "ONEPLUS", "REALME"]: return "Oppo"
+    return BRAND_GROUPS.get(u_name, "Others")
+
+def region_frame(raw_data, time_col, region_map=None):
+    # 시트별 프레임 → Region/Sales/Brand_Group을 갖춘 하나의 프레임 (Region 열이 없으면 시트명 → region_map, 동유럽 제외)
+    all_dfs = []
+    for sheet_name, df in raw_data.items():
+        temp = df.copy()
+        if "Region" not in temp.columns: temp["Region"] = (region_map or {}).get(sheet_name, sheet_name)
+        temp["Sales"] = pd.to_numeric(temp["Sales"], errors='coerce').fillna(0)
+        if time_col in temp.columns: temp[time_col] = pd.to_numeric(temp[time_col], errors='coerce')
+        temp["Brand_Group"] = temp["Brand"].map({b: group_brand(b) for b in temp["Brand"].unique()}); all_dfs.append(temp)
+    full_df = pd.concat(all_dfs)
+    return full_df[~full_df['Region'].isin(EXCLUDED_REGIONS)]
+
+def region_rollup(raw_data, grain, split=False, region_map=None):
+    # 시트별 주간 데이터 → 기간(grain) × (Total + 지역) 판매량 표 (Mu), 행 라벨은 기간 표시 문자열. 데이터가 없으면 None
+    frames = [df.assign(Region=(region_map or {}).get(sheet, sheet)) if "Region" not in df.columns else df for sheet, df in raw_data.items() if df is not None and not df.empty]
+    if not frames: return None
+    out = rollup(pd.concat(frames, ignore_index=True), grain, by=["Region"], split=split)
+    table = out.pivot_table(index="Period", columns="Region", values="Sales", aggfunc="sum", fill_value=0) / 1000000.0
+    table.insert(0, "Total", table.sum(axis=1)); table.index = period_labels(table.index, grain)
+    return table
+
+def yoy_tables(p24, p25, threshold=None, top_n=None):
+    # 기준 연도(p24) 볼륨 기준으로 지역별 소형 브랜드를 Others로 접고 Total 행/열 추가 → (p24, p25, fold_map)
+    (p24, p25), fold_map = fold_others(p24, p25, threshold=threshold, top_n=top_n, keep=["Total"])
+    brands = sorted(b for b in p24.index if b not in ("Total", "Others")); regions = sorted(r for r in p24.columns if r != "Total")
+    final_idx = ["Total"] + brands + ["Others"]; final_cols = ["Total"] + regions
+    p24 = p24.reindex(index=final_idx, columns=final_cols, fill_value=0); p25 = p25.reindex(index=final_idx, columns=final_cols, fill_value=0)
+    for p in (p24, p25): p["Total"] = p[regions].sum(axis=1); p.loc["Total"] = p.loc[brands + ["Others"]].sum(axis=0)
+    return p24, p25, fold_map
+
+def yoy_change(p24, p25):
+    # 히트맵 pct 모드와 같은 성장률 (기준 0 → 비교 > 0이면 100%)
+    with np.errstate(divide='ignore', invalid='ignore'): return pd.DataFrame(np.where(p24 != 0, (p25 - p24) / p24 * 100, np.where(p25 > 0, 100.0, 0.0)), index=p25.index, columns=p25.columns)
+
+SELLIN_BRANDS = ["Apple", "MX", "Xiaomi", "Oppo", "Vivo", "Transsion", "Honor", "Huawei"]
+SELLIN_REGIONS = ["Total", "China", "India", "US", "W.Europe", "Others"]
+
+def sellin_brand_group(name):
+    n = str(name).strip().upper()
+    if n == "SAMSUNG": return "MX"
+    if n in ["OPPO", "REALME", "ONEPLUS"]: return "Oppo"
+    if "TRANSSION" in n: return "Transsion"
+    if n in ["APPLE", "XIAOMI", "VIVO", "HONOR", "HUAWEI"]: return name.strip()
+    return "Others_Calc"
+
+def sellthru_frame(weekly_data, region_map):
+    # Weekly 시트를 Sell-in과 같은 지역명/브랜드 그룹으로 맞춰 하나로 합침 (Reconciliation 입력)
+    frames = [df.assign(Region=region) for sheet, region in region_map.items() if (df := weekly_data.get(sheet)) is not None and not df.empty and "Sales" in df.columns]
+    if not frames: return pd.DataFrame()
+    st = pd.concat(frames, ignore_index=True); st["Sales"] = pd.to_numeric(st["Sales"], errors='coerce').fillna(0)
+    st["Brand_Group"] = st["Brand"].map({b: sellin_brand_group(b) for b in st["Brand"].unique()}).replace("Others_Calc", "Others")
+    return st
+
+def sellin_pivot(p):
+    # Brand_Group × Region YTD → 지역 × (Total + 지정 브랜드 + Others), Others 지역 = Total - 주요 지역
+    if p.empty: return pd.DataFrame()
+    (p,), _ = fold_others(p, threshold=float('inf'), keep=SELLIN_BRANDS)
+    p = p.T.reindex(columns=SELLIN_BRANDS + ["Others"], fill_value=0)
+    p.insert(0, "Total", p.sum(axis=1))
+    if "Total" in p.index:
+        sub_regions_sum = pd.Series(0, index=p.columns)
+        for r in SELLIN_REGIONS[1:-1]:
+            if r in p.index: sub_regions_sum += p.loc[r]
+        p.loc["Others"] = p.loc["Total"] - sub_regions_sum
+    return p.reindex(SELLIN_REGIONS, fill_value=0)
+
+# --- Brand × Period Tables ---
+# Flagship/Omdia/TI 히트맵과 Trend/Line 차트가 그리는 표 (위젯은 결과만 받아 렌더링)
+def ytd_cutoff(cube, year, time_col, cap=None):
+    # cap: 최대 월까지의 마지막 시점 (month_cutoffs, 해당 연도 데이터가 없으면 -1) → 월 필터한 큐브의 latest_time과 같음
+    default = 52 if time_col == "Week" else 12
+    if cap is None: return cube.latest_time(year, default=default)
+    return cap if cap >= 0 else default
+
+def month_cutoffs(df, time_col):
+    # 연도 × 최대 월(1~12) → 그 월까지의 마지막 시점 (없으면 -1). 주차의 월은 주차 순서대로 늘어나므로
+    # "MonthNum <= m" 필터는 연도별 시간 cutoff와 같음 → 최대 월을 바꿀 때 큐브를 다시 만들지 않고 cutoff로 조회
+    t = pd.to_numeric(df[time_col], errors='coerce'); ok = t.notna().values & (df["MonthNum"].values >= 1)
+    last = t[ok].groupby([df["Year"].values[ok], df["MonthNum"].values[ok]]).max().unstack()
+    return last.reindex(columns=range(1, 13)).cummax(axis=1).ffill(axis=1).fillna(-1).astype(int)
+
+def with_total(p):
+    # Total 행 추가 → 마지막 열 기준 내림차순, Total은 맨 위
+    p = p.copy(); p.loc['Total'] = p.sum(axis=0); order = p.sort_values(by=p.columns[-1], ascending=False).index
+    return p.reindex(['Total'] + [x for x in order if x != 'Total'])
+
+def flagship_table(df, category, target_years=None):
+    # Brand × 연도 (모든 연도를 최신 데이터의 마지막 월까지만 합산, 열 라벨은 문자열 연도)
+    filtered_df = indexed_for(df).select(Category=category)
+    if not filtered_df.empty: filtered_df = filtered_df[filtered_df['Date'].dt.month <= filtered_df['Date'].max().month]
+    year = filtered_df['Date'].dt.year
+    if target_years: keep = year.isin([int(y) for y in target_years]); filtered_df = filtered_df[keep]; year = year[keep]
+    p = filtered_df.groupby(["Brand", year])["Sales"].sum().unstack(fill_value=0).sort_index(axis=1)
+    if p.empty: return p
+    p.columns = p.columns.astype(str); return with_total(p)
+
+def omdia_table(df, category, target_years=None):
+    # Brand × 분기 (분기 코드로 집계해 열이 시간순 → 라벨은 고유 열에 대해서만 생성)
+    filtered_df = indexed_for(df).select(Category=category); code = pd.Series(period_codes(filtered_df, "Quarter"), index=filtered_df.index)
+    if target_years: keep = np.isin(period_year(code, "Quarter"), [int(y) for y in target_years]); filtered_df = filtered_df[keep]; code = code[keep]
+    p = filtered_df.groupby(["Brand", code])["Sales"].sum().unstack(fill_value=0).sort_index(axis=1)
+    if p.empty: return p
+    p.columns = period_labels(p.columns, "Quarter"); return with_total(p)
+
+def ti_ytd_table(df, measure=None, target_years=None):
+    # Brand × 연도 YTD (모든 연도를 최신 연도의 마지막 월까지), 해당 측정값 데이터가 없으면 None
+    cube = cube_for(df, "Month", brand_col="Brand", region_col="Measure")
+    years = [int(y) for y in cube.years if not target_years or str(y) in target_years]
+    years = [y for y in years if cube.latest_time(y, region=measure) is not None]
+    if not years: return None
+    return cube.ytd_by(cube.latest_time(max(years), region=measure), years, by="brand", region=measure).T
+
+def growth_tables(vol):
+    # 연도(열)별 볼륨 → (볼륨, 전년 대비 증감, 성장률 %). 첫 연도는 0, Total 행 포함, 마지막 연도 볼륨 순 정렬
+    vol = vol.reindex(columns=sorted(vol.columns)); vol.loc['Total'] = vol.sum(axis=0); prev = vol.shift(1, axis=1)
+    diff = vol - prev; diff.iloc[:, 0] = 0; yoy = (diff / prev.replace(0, np.nan) * 100).fillna(0)
+    order = vol.sort_values(by=vol.columns[-1], ascending=False).index; order = ['Total'] + [x for x in order if x != 'Total']
+    return vol.reindex(order), diff.reindex(order), yoy.reindex(order)
+
+def ytd_breakdown(cube, pair, brand="Total", region="Total"):
+    # 연도 × 카테고리 YTD (Total/Total: 브랜드별, 브랜드 지정: 지역별, 지역 지정: 브랜드별), 열은 전체 합계 순 → (pivot, 연도, cutoff)
+    max_time = ytd_cutoff(cube, pair[1], cube.time_col); years = display_years(cube.years, pair)
+    if brand == "Total" and region == "Total": pivot = cube.ytd_by(max_time, years, by="brand")
+    elif brand != "Total": pivot = cube.ytd_by(max_time, years, by="region", brand=brand)
+    else: pivot = cube.ytd_by(max_time, years, by="brand", region=region)
+    return pivot[pivot.sum(axis=0).sort_values(ascending=False).index], years, max_time
+
+def trend_table(full_df, brand, region, years, time_col, base_year, fold_map=None, threshold=None, top_n=None):
+    # 시점 × 연도 판매량 (Region × Brand_Group 행 위치 인덱스로 선택, Others는 히트맵과 같은 접기 맵 적용, 53주는 52주로 합침)
+    where = {} if region == "Total" else {"Region": region}; idx = indexed_for(full_df)
+    if "Brand_Group" not in full_df.columns: target_df = idx.select(**where).assign(Brand_Group=lambda d: d["Brand"].apply(group_brand))
+    else: target_df = idx.select(**where) if brand in ("Total", "Others") else idx.select(Brand_Group=brand, **where)
+    if brand == "Others":
+        if fold_map is None:
+            # 히트맵 접기 맵이 없으면 기준 연도 Brand × Region 합계로 같은 엔진을 돌려 생성
+            base = target_df[target_df['Year'] == base_year].pivot_table(index="Brand_Group", columns="Region", values="Sales", aggfunc="sum", fill_value=0)
+            _, fold_map = fold_others(base, threshold=threshold, top_n=top_n, keep=["Total"])
+        target_df = target_df[fold_map.select(target_df['Brand_Group'].values, target_df['Region'].values)]
+    elif brand != "Total" and "Brand_Group" not in full_df.columns: target_df = target_df[target_df['Brand_Group'] == brand]
+    target_df = target_df[target_df['Year'].isin(years)]
+    if time_col == "Week" and "Week" in target_df.columns: target_df = target_df.assign(Week=target_df["Week"].where(target_df["Week"] != 53, 52))
+    return target_df.pivot_table(index=time_col, columns="Year", values="Sales", aggfunc="sum")
+
+# --- Period Dimension ---
+# 정수 기간 코드: Month = Year*12 + (Month-1), Quarter = Year*4 + (Quarter-1), Week = Year*53 + (Week-1)
+# 정렬/필터는 코드로 하고, 라벨 문자열은 화면 표시할 때 고유값에 대해서만 생성
+PERIODS_PER_YEAR = {"Month": 12, "Quarter": 4, "Week": 53}
+PERIOD_FORMATS = {"Month": "{y}-{n:02d}", "Quarter": "{y} {n}Q", "Week": "{y} W{n:02d}"}
+BYMODEL_PERIOD_FMT = "{y} Q{n}"  # By-Model 비교 (Omdia/TI/GfK) 분기 표기
+
+def period_code(year, n, unit): return year * PERIODS_PER_YEAR[unit] + (n - 1)
+
+def period_codes(df, unit):
+    if unit == "Week": return period_code(pd.to_numeric(df["Year"], errors='coerce').values, pd.to_numeric(df["Week"], errors='coerce').values, unit)
+    if "Date" in df.columns and pd.api.types.is_datetime64_any_dtype(df["Date"]): year = df["Date"].dt.year.values; month = df["Date"].dt.month.values
+    else: year = pd.to_numeric(df["Year"], errors='coerce').values; month = (pd.to_numeric(df["Quarter"], errors='coerce').values - 1) * 3 + 1 if unit == "Quarter" else pd.to_numeric(df["Month"], errors='coerce').values
+    return period_code(year, month, unit) if unit == "Month" else period_code(year, (month - 1) // 3 + 1, unit)
+
+def period_year(codes, unit): return np.asarray(codes) // PERIODS_PER_YEAR[unit]
+
+def period_label(code, unit, fmt=None):
+    y, n = divmod(int(code), PERIODS_PER_YEAR[unit])
+    return (fmt or PERIOD_FORMATS[unit]).format(y=y, n=n + 1)
+
+def period_labels(codes, unit, fmt=None): return [period_label(c, unit, fmt) for c in codes]
+
+# --- Calendar Engine ---
+# 주 → 월 → 분기 매핑. 주 시작일은 Date 열("%y%m%d-...")에서, 없으면 ISO 주차(Year, Week)로 계산
+# 주는 과반(4일 이상)이 속한 달에 배정하고, split=True면 일수 비율로 두 달에 나눔. 계산은 고유 주 단위로만 수행
+GRAIN_ORDER = {"Week": 0, "Month": 1, "Quarter": 2, "Year": 3}
+
+def iso_week_start(years, weeks):
+    jan4 = (np.asarray(years, dtype=np.int64) - 1970).astype('datetime64[Y]').astype('datetime64[D]') + 3
+    return jan4 - (jan4.astype(np.int64) + 3) % 7 + (np.asarray(weeks, dtype=np.int64) - 1) * 7
+
+def iso_weeks_in_year(years):
+    # 12/28이 들어있는 주차 = 해당 연도의 주 수 (52 또는 53)
+    dec28 = (np.asarray(years, dtype=np.int64) - 1969).astype('datetime64[Y]').astype('datetime64[D]') - 4
+    return ((dec28 - iso_week_start(years, 1)).astype(np.int64) // 7 + 1).astype(int)
+
+def week_starts(df):
+    date_col = next((c for c in df.columns if str(c).strip().lower() == "date"), None); starts = np.full(len(df), np.datetime64('NaT'), dtype='datetime64[D]')
+    if date_col is not None:
+        codes, uniques = pd.factorize(df[date_col].astype(str).str.split('-').str[0].str.strip())
+        parsed = pd.to_datetime(pd.Series(uniques), format='%y%m%d', errors='coerce').values.astype('datetime64[D]')
+        starts = np.append(parsed, np.datetime64('NaT'))[codes]
+    missing = np.isnat(starts)
+    if missing.any() and "Year" in df.columns and "Week" in df.columns:
+        y = pd.to_numeric(df["Year"], errors='coerce').values[missing]; w = pd.to_numeric(df["Week"], errors='coerce').values[missing]; ok = ~(np.isnan(y) | np.isnan(w)) & (w >= 1)
+        iso = np.full(len(y), np.datetime64('NaT'), dtype='datetime64[D]')
+        # 53주가 없는 해의 Week 53은 그 해 마지막 주로 접음
+        iso[ok] = iso_week_start(y[ok], np.minimum(w[ok], iso_weeks_in_year(y[ok]))); starts[missing] = iso
+    return starts
+
+def week_months(starts, split=False):
+    # 고유 시작일마다 7일의 월 코드(Year*12 + Month-1)를 만들고 행으로 펼침. 시작일이 없으면 -1
+    codes, uniq = pd.factorize(starts); days = np.asarray(uniq, dtype='datetime64[D]')[:, None] + np.arange(7)
+    ym = days.astype('datetime64[M]').astype(np.int64) + 1970 * 12; first = ym[:, 0]; last = ym[:, 6]; n_first = (ym == first[:, None]).sum(axis=1)
+    first = np.append(first, -1); last = np.append(last, -1); frac = np.append(n_first / 7.0, 1.0)
+    if not split: return np.where(frac >= 4 / 7.0, first, last)[codes]
+    return first[codes], last[codes], frac[codes]
+
+def week_month_in_year(df):
+    # 주간 데이터의 월(1~12). 과반 규칙으로 다른 해의 달에 걸리면 레코드 연도 안으로 고정 (연말 53주차 등)
+    m = week_months(week_starts(df)); year = pd.to_numeric(df["Year"], errors='coerce').fillna(0).values.astype(int); my = m // 12
+    return np.where(m < 0, 0, np.where(my > year, 12, np.where(my < year, 1, m % 12 + 1)))
+
+def _to_grain(month_codes, grain):
+    if grain == "Month": return month_codes
+    return month_codes // 12 * 4 + month_codes % 12 // 3 if grain == "Quarter" else month_codes // 12
+
+def source_grain(df):
+    for g in ("Week", "Month", "Quarter"):
+        if g in df.columns: return g
+    return "Year"
+
+def rollup(df, grain, values=("Sales",), by=(), split=False):
+    # 어떤 데이터셋이든 더 거친 단위(월/분기/연)로 합산. 결과: by..., Year, <grain>, Period(정수 코드), values
+    src = source_grain(df); by = list(by); values = list(values)
+    if grain == "Week" or GRAIN_ORDER[grain] < GRAIN_ORDER[src]: raise ValueError(f"Cannot roll {src} data up to {grain}")
+    vals = df[values].apply(pd.to_numeric, errors='coerce').fillna(0).values; keys = [df[c].values for c in by]
+    if src == "Week":
+        starts = week_starts(df)
+        if split:
+            first, last, frac = week_months(starts, split=True)
+            codes = np.concatenate([first, last]); vals = np.concatenate([vals * frac[:, None], vals * (1 - frac)[:, None]]); keys = [np.concatenate([k, k]) for k in keys]
+        else: codes = week_months(starts)
+    else:
+        # 월/분기/연 데이터는 기간 첫 달의 월 코드로 맞춘 뒤 변환
+        codes = pd.to_numeric(df["Year"], errors='coerce').values * 12.0 if src == "Year" else period_codes(df, src).astype(float) * (3 if src == "Quarter" else 1)
+        codes = np.where(np.isnan(codes), -1, codes).astype(np.int64)
+    ok = (codes >= 0) & np.any(vals != 0, axis=1) if split else codes >= 0
+    period = _to_grain(codes[ok], grain)
+    frame = pd.DataFrame(vals[ok], columns=values); frame["Period"] = period
+    for c, k in zip(by, keys): frame[c] = k[ok]
+    out = frame.groupby(by + ["Period"], sort=True)[values].sum().reset_index()
+    per = PERIODS_PER_YEAR.get(grain, 1); out.insert(len(by), "Year", out["Period"] // per)
+    if grain != "Year": out.insert(len(by) + 1, grain, out["Period"] % per + 1)
+    else: out = out.drop(columns=["Period"])
+    return out
+
+# --- Launch Cohort Matrices ---
+
+class LaunchCohorts:
+    # 브랜드/카테고리별 모델 × (출시 후 경과 기간 | 달력 기간) 행렬을 로드 시 한 번에 생성 → 차트/테이블은 행/열 선택만
+    def __init__(self, df, unit="Month"):
+        self.units = ("Month", "Quarter") if unit == "Month" else ("Quarter",); self.mats = {}; self._models = {}
+        sales = pd.to_numeric(df["Sales"], errors='coerce').fillna(0).values; brand = df["Brand"].values; cat = df["Category"].values; model = df["Model"].values
+        for u in self.units:
+            code = period_codes(df, u).astype(float)
+            # 출시 시점 = 판매량 > 0 인 첫 기간 (Brand, Model 기준)
+            launch = pd.Series(np.where(sales > 0, code, np.nan)).groupby([brand, model]).transform('min').values
+            since = code - launch; ok = since >= 0
+            keys = [brand[ok], cat[ok], model[ok]]
+            for kind, col in (("since", since[ok].astype(int)), ("calendar", code[ok].astype(int))):
+                s = pd.Series(sales[ok]).groupby(keys + [col]).sum()
+                for (b, c), g in s.groupby(level=[0, 1]):
+                    m = g.droplevel([0, 1]).unstack().sort_index().sort_index(axis=1); m.index.name = "Model"; m.columns.name = kind
+                    self.mats[(b, c, kind, u, False)] = m; self.mats[(b, c, kind, u, True)] = m.cumsum(axis=1)
+                    self._models[(b, c)] = m.index.tolist()
+    def models(self, brand, category): return self._models.get((brand, category), [])
+    def matrix(self, brand, category, kind="since", unit=None, cumulative=False, models=None):
+        m = self.mats.get((brand, category, kind, unit or self.units[0], cumulative))
+        if m is None: return pd.DataFrame()
+        if models is not None: m = m.loc[m.index.intersection(models, sort=False)] if len(models) else m.iloc[:0]
+        return m
+
+_COHORTS = FrameCache(LaunchCohorts)
+def cohorts_for(df, unit=None):
+    # 로드 스레드에서 미리 생성해 두고, 화면에서는 같은 DataFrame 객체로 조회 (Flagship: 월 단위, Omdia: 분기 단위)
+    return _COHORTS.get(df, unit or ("Month" if "MonthsSinceLaunch" in df.columns else "Quarter"))
+
+# --- Indexed Frame ---
+# 로드된 DataFrame의 차원(Brand/Category/Region/Year/Model 및 조합)별 행 위치 배열. 필터 비용 = 일치하는 행 수
+class IndexedFrame:
+    DIMS = ("Brand", "Category", "Region", "Year", "Model")
+    COMBOS = (("Brand", "Category"),)
+    def __init__(self, df):
+        # 프레임은 약한 참조 (FrameCache 값이 프레임을 붙잡지 않도록). 호출하는 쪽은 indexed_for(df)로 프레임을 쥔 채 사용
+        self._df = weakref.ref(df); self._pos = {}
+        for dims in [(d,) for d in self.DIMS] + list(self.COMBOS):
+            if all(d in df.columns for d in dims): self.positions_for(dims)
+    def positions_for(self, dims):
+        # 처음 쓰는 조합은 한 번 그룹핑해서 {키: 행 위치 배열} 저장
+        dims = tuple(sorted(dims))
+        if dims not in self._pos: self._pos[dims] = self.df.groupby(list(dims), sort=False).indices if len(self.df) else {}
+        return self._pos[dims]
+    def positions(self, **where):
+        dims = tuple(sorted(where)); key = tuple(where[d] for d in dims)
+        return self.positions_for(dims).get(key[0] if len(key) == 1 else key, np.empty(0, dtype=np.intp))
+    @property
+    def df(self): return self._df()
+    def select(self, **where): return self.df.iloc[self.positions(**where)] if where else self.df
+    def values(self, dim): return list(self.positions_for((dim,)).keys())
+
+_INDEXED = FrameCache(IndexedFrame)
+def indexed_for(df):
+    # cube_for와 같은 방식으로 DataFrame 객체별로 한 번만 생성
+    return _INDEXED.get(df)
+
+# --- Sell-in vs Sell-through Reconciliation ---
+# Brand_Group × Region × 월 큐브로 맞춘 뒤 Sell-in - Sell-through, 누적 채널 재고 증감, 재고 주수(Weeks of Cover)를 한 번에 계산
+class Reconciliation:
+    METRICS = ("gap", "inventory", "woc")
+    def __init__(self, sellin, sellthru, brand_col="Brand_Group", region_col="Region", value_col="Sales"):
+        self.brand_col = brand_col; self.region_col = region_col
+        si = self._month_frame(sellin, value_col); st = self._month_frame(sellthru, value_col)
+        # 두 데이터가 모두 있는 지역/기간만 비교 (브랜드는 합집합)
+        regions = sorted(set(si[region_col].unique()) & set(st[region_col].unique()) - {"Total"})
+        si = si[si[region_col].isin(regions)]; st = st[st[region_col].isin(regions)]
+        self.brands = np.array(sorted(set(si[brand_col].unique()) | set(st[brand_col].unique())), dtype=object); self.regions = np.array(regions, dtype=object)
+        if not len(si) or not len(st) or not regions: self.months = np.empty(0, dtype=np.int64); self.si = self.st = np.zeros((len(self.brands) + 1, len(regions) + 1, 0)); self._derive(); return
+        m0 = max(si["Period"].min(), st["Period"].min()); m1 = min(si["Period"].max(), st["Period"].max()); self.months = np.arange(m0, m1 + 1)
+        self.si = self._cube(si); self.st = self._cube(st); self._derive()
+    def _month_frame(self, df, value_col):
+        if "Period" in df.columns and "Month" in df.columns: return df
+        # 주간 데이터는 일수 비율로 월에 나눠서 월간 Sell-in과 같은 기준으로 맞춤
+        return rollup(df, "Month", values=[value_col], by=[self.brand_col, self.region_col], split=True).rename(columns={value_col: "Sales"})
+    def _cube(self, df):
+        # 마지막 인덱스 = Total (브랜드/지역 합계) → 비율 지표도 합계 기준으로 바로 계산
+        df = df[(df["Period"] >= self.months[0]) & (df["Period"] <= self.months[-1])]
+        b = np.searchsorted(self.brands, df[self.brand_col].values); r = np.searchsorted(self.regions, df[self.region_col].values); t = (df["Period"].values - self.months[0]).astype(int)
+        shape = (len(self.brands), len(self.regions), len(self.months)); cube = np.zeros((shape[0] + 1, shape[1] + 1, shape[2]))
+        cube[:-1, :-1] = np.bincount(np.ravel_multi_index((b, r, t), shape), weights=df["Sales"].values.astype(float), minlength=int(np.prod(shape))).reshape(shape)
+        cube[-1, :-1] = cube[:-1, :-1].sum(axis=0); cube[:, -1] = cube[:, :-1].sum(axis=1)
+        return cube
+    def _derive(self):
+        self.gap = self.si - self.st; self.inventory = np.cumsum(self.gap, axis=2)
+        # 월 Sell-through를 주 단위로 환산 (해당 월 일수 / 7)
+        m = (self.months - 1970 * 12).astype('datetime64[M]'); days = ((m + 1).astype('datetime64[D]') - m.astype('datetime64[D]')).astype(float)
+        weekly = self.st / (days / 7.0)
+        with np.errstate(divide='ignore', invalid='ignore'): self.woc = np.where(weekly > 0, self.inventory / weekly, np.nan)
+    def month_index(self, year, month):
+        if not len(self.months): return None
+        i = period_code(int(year), int(month), "Month") - self.months[0]
+        return int(i) if 0 <= i < len(self.months) else None
+    def frame(self, metric, year, month):
+        # 행: Region (+Total), 열: Brand (+Total). gap은 해당 연도 1월~month 누적, inventory/woc는 month 말 기준
+        t = self.month_index(year, month)
+        if t is None: return pd.DataFrame()
+        if metric == "gap": t0 = max(period_code(int(year), 1, "Month") - self.months[0], 0); vals = self.gap[..., t0:t + 1].sum(axis=2)
+        else: vals = getattr(self, metric)[..., t]
+        return pd.DataFrame(vals.T, index=pd.Index(list(self.regions) + ["Total"], name=self.region_col), columns=pd.Index(list(self.brands) + ["Total"], name=self.brand_col))
@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+import time
+import argparse
+import functools
+import importlib.util
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+import config
+import data_loader as dl
+from analytics import YTDCube, YoYCube, default_year_pair, ytd_cutoff, region_frame, yoy_tables, yoy_change, sellin_brand_group, sellin_pivot
+
+# --- Headless Batch Mode ---
+# GUI 없이 주간/월간 old↔new 비교, Region×Brand·Sell-in 집계, 캐시 미리 만들기를 여러 파일에 대해 병렬 실행
+# 작업 하나 = 파일(쌍) 하나 = 프로세스 풀의 작업 하나 (각자 Excel 세션). 캐시는 GUI와 같은 키/폴더를 사용하므로 미리 만든 캐시를 앱이 그대로 씀
+#   python batch.py weekly old.xlsx new.xlsx [newer.xlsx ...] -o reports --format xlsx csv
+#   python batch.py monthly old.xlsx new.xlsx
+#   python batch.py region file.xlsx [...] --years 2024 2025
+#   python batch.py sellin file.xlsx [...] --month 6
+#   python batch.py cache weekly file.xlsx [...]
+#   python batch.py run manifest.json
+
+# 캐시 종류 → 로더 (GUI 페이지와 같은 캐시 키)
+LOADERS = {
+    "weekly": functools.partial(dl.load_task, cache_key="weekly", read_func=dl._read_weekly_impl),
+    "monthly": functools.partial(dl.load_task, cache_key="monthly", read_func=dl._read_monthly_impl),
+    "weekly_simple": dl.load_weekly_simple, "flagship": dl.load_flagship, "region": dl.load_region_brand,
+    "omdia": dl.load_omdia, "ti": dl.load_ti, "sellin": dl.load_sellin,
+}
+COMPARES = {"weekly": dl.compare_weekly, "monthly": dl.compare_monthly}
+FORMATS = ["xlsx", "csv", "parquet"]
+
+def stem(path): return os.path.splitext(os.path.basename(path))[0]
+
+def write_tables(out_dir, name, tables, formats):
+    # tables: {표 이름: DataFrame} → xlsx는 한 워크북에 시트별, csv/parquet는 표마다 파일. 의미 있는 인덱스(피벗 행 라벨)만 기록
+    os.makedirs(out_dir, exist_ok=True); written = []
+    keep_index = lambda df: not isinstance(df.index, pd.RangeIndex)
+    if "xlsx" in formats:
+        p = os.path.join(out_dir, f"{name}.xlsx")
+        with pd.ExcelWriter(p) as w:
+            for t, df in tables.items(): df.to_excel(w, sheet_name=t[:31], index=keep_index(df))
+        written.append(p)
+    for fmt in ("csv", "parquet"):
+        if fmt not in formats: continue
+        for t, df in tables.items():
+            p = os.path.join(out_dir, f"{name}_{t.replace(' ', '_').replace('%', 'pct')}.{fmt}")
+            if fmt == "csv": df.to_csv(p, index=keep_index(df), encoding="utf-8-sig")
+            else: (df.reset_index() if keep_index(df) else df).rename(columns=str).to_parquet(p, index=False)
+            written.append(p)
+    return written
+
+def yoy_sheets(p24, p25, pair):
+    base, comp = pair
+    return {f"Base {base}": p24, f"Comp {comp}": p25, "Diff": p25 - p24, "YoY %": yoy_change(p24, p25)}
+
+# --- 작업 (프로세스 풀에서 실행, 모두 모듈 최상위 함수라 피클 가능) ---
+def task_compare(kind, old, new, out_dir, formats):
+    load = LOADERS[kind]; df, sumy, _ = COMPARES[kind](load(new), load(old))
+    return write_tables(out_dir, f"{stem(new)}_{kind}_diff", {"Changes": df, "Summary": pd.DataFrame(sumy)}, formats)
+
+def task_region(path, out_dir, formats, years=None):
+    full_df = region_frame(dl.load_region_brand(path), "Month", config.WEEKLY_MAP); cube = YTDCube(full_df, "Month")
+    pair = tuple(years) if years else default_year_pair(cube.years)
+    if pair is None: raise ValueError("No data")
+    p24, p25 = YoYCube(cube, ytd_cutoff(cube, pair[1], "Month")).pair(*pair)
+    p24, p25, _ = yoy_tables(p24, p25, threshold=config.OTHERS_THRESHOLD, top_n=config.OTHERS_TOP_N)
+    return write_tables(out_dir, f"{stem(path)}_region_brand", yoy_sheets(p24, p25, pair), formats)
+
+def task_sellin(path, out_dir, formats, years=None, month=None):
+    df = dl.load_sellin(path)
+    if df.empty: raise ValueError("No data")
+    cube = YTDCube(df.assign(Brand_Group=df["Brand"].map({b: sellin_brand_group(b) for b in df["Brand"].unique()})), "Month")
+    pair = tuple(years) if years else default_year_pair(cube.years)
+    # 기준 월: 지정하지 않으면 최신 연도의 마지막 월 (Sell-in 페이지 기본값과 같음)
+    month = month or cube.latest_time(int(df["Year"].max()), default=12)
+    p24 = sellin_pivot(cube.ytd(pair[0], month)); p25 = sellin_pivot(cube.ytd(pair[1], month))
+    return write_tables(out_dir, f"{stem(path)}_sellin_m{month}", yoy_sheets(p24, p25, pair), formats)
+
+def task_cache(kind, path): LOADERS[kind](path); return []
+
+def _init_worker(cache_dir):
+    # 풀 프로세스 자체가 격리 단위 → 읽기를 다시 자식 프로세스로 띄우지 않고, 파일 단위 병렬(-j)이 Excel 세션 수를 정함
+    config.ISOLATED_READERS = False; config.SHEET_WORKERS = 1
+    if cache_dir: config.CACHE_DIR = cache_dir
+
+# --- 실행 ---
+def plan(args):
+    # 명령행 → [(라벨, 함수, 인자)]
+    out, fmts = args.out, args.format
+    if args.cmd in COMPARES:
+        if len(args.files) < 2: raise SystemExit(f"{args.cmd}: at least two files (old, new) are required")
+        # 주어진 순서대로 연속 비교: f1→f2, f2→f3, ...
+        return [(f"{args.cmd} {stem(o)} -> {stem(n)}", task_compare, (args.cmd, o, n, out, fmts)) for o, n in zip(args.files, args.files[1:])]
+    if args.cmd == "region": return [(f"region {stem(p)}", task_region, (p, out, fmts, args.years)) for p in args.files]
+    if args.cmd == "sellin": return [(f"sellin {stem(p)}", task_sellin, (p, out, fmts, args.years, args.month)) for p in args.files]
+    if args.cmd == "cache": return [(f"cache {args.kind} {stem(p)}", task_cache, (args.kind, p)) for p in args.files]
+    return manifest_plan(args)
+
+def manifest_plan(args):
+    # {"out": ..., "format": [...], "jobs": N, "tasks": [{"kind": "weekly", "old": ..., "new": ...}, {"kind": "region", "path": ..., "years": [2024, 2025]},
+    #  {"kind": "sellin", "path": ..., "month": 6}, {"kind": "cache", "loader": "omdia", "path": ...}]}  (상대 경로는 매니페스트 폴더 기준)
+    with open(args.manifest, encoding="utf-8") as f: m = json.load(f)
+    base = os.path.dirname(os.path.abspath(args.manifest)); at = lambda p: os.path.join(base, p)
+    args.out = at(m.get("out", args.out)); args.format = m.get("format", args.format); args.jobs = m.get("jobs", args.jobs); tasks = []
+    for t in m.get("tasks", []):
+        kind = t.get("kind")
+        if kind in COMPARES: tasks.append((f"{kind} {stem(t['old'])} -> {stem(t['new'])}", task_compare, (kind, at(t["old"]), at(t["new"]), args.out, args.format)))
+        elif kind == "region": tasks.append((f"region {stem(t['path'])}", task_region, (at(t["path"]), args.out, args.format, t.get("years"))))
+        elif kind == "sellin": tasks.append((f"sellin {stem(t['path'])}", task_sellin, (at(t["path"]), args.out, args.format, t.get("years"), t.get("month"))))
+        elif kind == "cache" and t.get("loader") in LOADERS: tasks.append((f"cache {t['loader']} {stem(t['path'])}", task_cache, (t["loader"], at(t["path"]))))
+        else: raise SystemExit(f"Unknown manifest task: {t}")
+    return tasks
+
+def run(tasks, workers, cache_dir=None):
+    # 작업마다 결과 출력, 실패가 있어도 나머지는 계속 → 실패 수 반환
+    failed = 0; start = time.time()
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(tasks))), mp_context=mp.get_context("spawn"), initializer=_init_worker, initargs=(cache_dir,)) as ex:
+        futures = {ex.submit(fn, *a): label for label, fn, a in tasks}
+        for f in as_completed(futures):
+            try: written = f.result(); print(f"[OK]   {futures[f]}" + "".join(f"\n       {p}" for p in written))
+            except Exception as e: failed += 1; print(f"[FAIL] {futures[f]}: {e}")
+    print(f"{len(tasks) - failed}/{len(tasks)} tasks done in {time.time() - start:.1f}s")
+    return failed
+
+def build_parser():
+    p = argparse.ArgumentParser(prog="batch", description="Headless comparisons, aggregations and cache prebuilds")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-o", "--out", default=config.BATCH_OUT_DIR, help="output folder")
+    common.add_argument("--format", nargs="+", choices=FORMATS, default=list(config.BATCH_FORMATS), help="output formats")
+    common.add_argument("-j", "--jobs", type=int, default=config.BATCH_WORKERS or config.JOB_LIMITS["excel"], help="files processed in parallel")
+    common.add_argument("--cache-dir", default=None, help="cache folder (default: config.CACHE_DIR)")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    for kind in COMPARES: sub.add_parser(kind, parents=[common], help=f"{kind} old/new diff (consecutive files)").add_argument("files", nargs="+")
+    for kind in ("region", "sellin"):
+        s = sub.add_parser(kind, parents=[common], help=f"{kind} YTD YoY tables"); s.add_argument("files", nargs="+")
+        s.add_argument("--years", nargs=2, type=int, metavar=("BASE", "COMP"))
+        if kind == "sellin": s.add_argument("--month", type=int, help="YTD cutoff month (default: latest)")
+    s = sub.add_parser("cache", parents=[common], help="prebuild caches"); s.add_argument("kind", choices=list(LOADERS)); s.add_argument("files", nargs="+")
+    sub.add_parser("run", parents=[common], help="run a JSON manifest").add_argument("manifest")
+    return p
+
+def main(argv=None):
+    args = build_parser().parse_args(argv); tasks = plan(args)
+    if "parquet" in args.format and not (importlib.util.find_spec("pyarrow") or importlib.util.find_spec("fastparquet")):
+        raise SystemExit("parquet output requires pyarrow (pip install pyarrow)")
+    if not tasks: print("Nothing to do"); return 0
+    return 1 if run(tasks, args.jobs, args.cache_dir) else 0
+
+if __name__ == "__main__":
+    mp.freeze_support()
+    sys.exit(main())
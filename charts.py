@@ -1,576 +1,854 @@
+import queue
+import warnings
+import threading
+import functools
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.colors import LinearSegmentedColormap
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QMessageBox, QTableWidget, QTableWidgetItem, 
-                             QAbstractItemView, QHBoxLayout, QLabel, QComboBox, QPushButton, 
-                             QListWidget, QListWidgetItem, QFrame, QRadioButton, QButtonGroup, QHeaderView)
-from PyQt5.QtCore import pyqtSignal, Qt
+from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QMessageBox, QTableWidget, QTableWidgetItem, 
+                             QAbstractItemView, QHBoxLayout, QLabel, QComboBox, QPushButton, 
+                             QListWidget, QListWidgetItem, QFrame, QRadioButton, QButtonGroup, QHeaderView)
+from PyQt5.QtCore import pyqtSignal, Qt, QThread, QObject
 from PyQt5.QtGui import QFont, QColor
 import config
+from analytics import (cube_for, default_year_pair, display_years, cohorts_for, indexed_for, group_brand, region_frame, yoy_tables, yoy_change,
+                       ytd_cutoff, month_cutoffs, flagship_table, omdia_table, ti_ytd_table, growth_tables, ytd_breakdown, trend_table,
+                       period_year, period_label, period_labels, BYMODEL_PERIOD_FMT)
+from data_loader import slice_to_month
+
+try: from scipy.spatial import cKDTree
+except ImportError: cKDTree = None
+
+# --- 폰트 설정 (config는 matplotlib을 import하지 않으므로 차트 모듈에서 적용) ---
+plt.rcParams['font.family'] = config.PLOT_FONT
+plt.rcParams['axes.unicode_minus'] = False
+
+# --- Hover Hit-Test Index ---
+# 차트를 그릴 때 한 번 만들어두고 마우스 이벤트마다 재사용 (line.contains 순회 대체)
+class HoverIndex:
+    def __init__(self, radius_px=8):
+        self.radius_px = radius_px; self.clear()
+    def clear(self):
+        self.lines = []; self.xs = []; self.ys = []
+        self.pts = np.empty((0, 2)); self.owner = np.empty(0, dtype=int)
+        self._disp = None; self._tree = None; self._key = None
+    def build(self, lines, data=None):
+        self.clear()
+        for line in lines:
+            x, y = data[line] if data else (line.get_xdata(), line.get_ydata())
+            x = np.asarray(x, dtype=float); y = np.asarray(y, dtype=float)
+            ok = ~(np.isnan(x) | np.isnan(y)); x = x[ok]; y = y[ok]
+            if not len(x): continue
+            order = np.argsort(x, kind='stable'); self.lines.append(line); self.xs.append(x[order]); self.ys.append(y[order])
+        if self.lines:
+            self.pts = np.column_stack([np.concatenate(self.xs), np.concatenate(self.ys)])
+            self.owner = np.repeat(np.arange(len(self.lines)), [len(x) for x in self.xs])
+    def _display_points(self, ax):
+        # 화면 좌표는 축 범위/크기가 바뀔 때만 다시 계산
+        key = (tuple(ax.bbox.bounds), ax.get_xlim(), ax.get_ylim())
+        if key != self._key:
+            self._key = key; self._disp = ax.transData.transform(self.pts); self._tree = None
+            if cKDTree is not None and len(self._disp) > 64: self._tree = cKDTree(self._disp)
+        return self._disp
+    def nearest(self, ax, event):
+        if not self.lines or event.x is None: return None
+        disp = self._display_points(ax); target = np.array([event.x, event.y], dtype=float)
+        if self._tree is not None:
+            dist, i = self._tree.query(target, distance_upper_bound=self.radius_px)
+            if not np.isfinite(dist): return None
+        else:
+            d2 = ((disp - target) ** 2).sum(axis=1); i = int(np.argmin(d2))
+            if d2[i] > self.radius_px ** 2: return None
+        return self.lines[self.owner[i]], self.pts[i, 0], self.pts[i, 1]
+    def snap(self, ax, event):
+        # 커서 x에 가장 가까운 점을 시리즈별로 searchsorted로 찾고, 화면상 y가 가장 가까운 시리즈 선택
+        if not self.lines or event.xdata is None: return None
+        best = None; best_d = np.inf; to_disp = ax.transData.transform
+        for line, xs, ys in zip(self.lines, self.xs, self.ys):
+            j = int(np.searchsorted(xs, event.xdata))
+            if j == len(xs) or (j > 0 and event.xdata - xs[j-1] <= xs[j] - event.xdata): j -= 1
+            if j < 0: continue
+            d = abs(to_disp((xs[j], ys[j]))[1] - event.y)
+            if d < best_d: best_d = d; best = (line, xs[j], ys[j])
+        return best
+
+# --- Downsampling ---
+def decimate_minmax(x, y, n_buckets):
+    # 버킷마다 최소/최대 점을 남겨 피크를 보존하는 decimation
+    n = len(x)
+    if n <= 2 * n_buckets or n_buckets < 1: return x, y
+    k = int(np.ceil(n / n_buckets)); pad = n_buckets * k - n
+    y_lo = np.concatenate([y, np.full(pad, np.inf)]).reshape(-1, k); y_hi = np.concatenate([y, np.full(pad, -np.inf)]).reshape(-1, k)
+    base = np.arange(n_buckets) * k
+    idx = np.concatenate([[0, n - 1], base + np.argmin(y_lo, axis=1), base + np.argmax(y_hi, axis=1)])
+    idx = np.unique(idx[idx < n])
+    return x[idx], y[idx]
+
+# --- Off-thread Rendering ---
+# 피벗 계산 + Figure 그리기/래스터화는 위젯별 워커 스레드에서 수행하고, 완성된 Figure만 메인 스레드에서 캔버스에 교체
+_SCENE_PRIVATE = ('_widget', '_gen', '_drawn', 'canvas')
+
+class SceneMixin:
+    # 워커용 위젯 대리 객체: 제출 시점에 메인 스레드에서 찍어 둔 위젯 상태만 읽고 (원본 위젯에 위임하지 않음), 쓰기는 자기 자신에 모았다가 한 번에 반영
+    def __getattr__(self, name):
+        # 스냅샷에 없는 속성은 그냥 없음 (초기화하지 않은 Qt 래퍼의 동적 속성 조회로 넘어가지 않게)
+        raise AttributeError(name)
+    def cancel_renders(self): pass
+
+def snapshot_state(widget):
+    # 메인 스레드에서 호출: (원본 값, 워커용 값). 내장 컨테이너는 얕은 복사 → 워커가 제자리 수정해도 (예: 색상 캐시) 위젯 원본은 그대로
+    # DataFrame 등은 제자리 수정하지 않고 새 객체로 바꾸는 것이 이 모듈의 관례라 그대로 공유. Qt 객체는 넘기지 않음
+    orig = {k: v for k, v in widget.__dict__.items() if k not in _SCENE_PRIVATE and not isinstance(v, QObject)}
+    return orig, {k: _copy_state(v) for k, v in orig.items()}
+
+def _copy_state(v): return v.copy() if type(v) in (dict, list, set) else v
+
+def _same_state(a, b):
+    # 워커용 값 a가 원본 b와 같은 상태인지 (복사본은 항목 identity 비교)
+    if a is b: return True
+    if type(a) is not type(b) or type(a) not in (dict, list, set) or len(a) != len(b): return False
+    if type(a) is dict: return all(k in b and b[k] is v for k, v in a.items())
+    if type(a) is list: return all(x is y for x, y in zip(a, b))
+    return a == b
+
+class SceneCanvas:
+    def __init__(self, scene, agg): self.scene = scene; self.agg = agg
+    def draw(self):
+        # 그 사이 더 새로운 요청이 들어왔으면 래스터화 생략
+        d = self.scene.__dict__; d['_drawn'] = True
+        if d['_gen'] == d['_widget'].render_gen: self.agg.draw()
+    draw_idle = draw
+
+_SCENE_CLASSES = {}
+def scene_class(cls):
+    if cls not in _SCENE_CLASSES: _SCENE_CLASSES[cls] = type(cls.__name__ + "Scene", (SceneMixin, cls), {})
+    return _SCENE_CLASSES[cls]
+
+def render_offthread(method):
+    # 메인 스레드에서 호출되면 워커 큐로 넘기고, 워커(Scene) 안에서는 그대로 실행
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if isinstance(self, SceneMixin) or not self.ASYNC_RENDER: return method(self, *args, **kwargs)
+        self.submit_render(method, args, kwargs)
+    return wrapper
+
+class RenderThread(QThread):
+    # 위젯 하나당 워커 하나. 워커는 위젯에 직접 쓰지 않고 (데이터 상태, 화면 상태 또는 None)을 rendered로 보내 메인 스레드에서 반영
+    # 메인 스레드가 아직 반영하지 않은 데이터 상태(pending)는 다음 작업의 대리 객체에 미리 넣어 이어지는 작업이 최신 값을 읽게 함
+    rendered = pyqtSignal(int, object); error = pyqtSignal(int, str)
+    def __init__(self): super().__init__(); self.jobs = queue.Queue(); self.pending = {}; self.lock = threading.Lock()
+    def submit(self, job): self.jobs.put(job)
+    def stop(self): self.jobs.put(None); self.wait(2000)
+    def applied(self, state):
+        # 메인 스레드에서 반영이 끝난 값은 pending에서 제거 (그 사이 더 새 값으로 바뀐 키는 유지)
+        with self.lock:
+            for k, v in state.items():
+                if self.pending.get(k, v) is v: self.pending.pop(k, None)
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None: return
+            widget, gen, method, args, kwargs, frame, (orig, state) = job
+            try:
+                with self.lock: seed = dict(self.pending)
+                base = {**orig, **seed}; state = {**state, **{k: _copy_state(v) for k, v in seed.items()}}
+                scene = widget.make_scene(gen, frame, state); method(scene, *args, **kwargs); d = scene.__dict__
+                # 바뀐 데이터 상태만 메인 스레드로 (제자리 수정된 복사본 포함)
+                data = {k: v for k, v in d.items() if k not in widget.SCENE_ATTRS and k not in _SCENE_PRIVATE and not (k in base and _same_state(v, base[k]))}
+                with self.lock: self.pending.update(data)
+                self.rendered.emit(gen, (data, {k: v for k, v in d.items() if k in widget.SCENE_ATTRS} if d['_drawn'] else None))
+            except Exception as e: self.error.emit(gen, str(e))
+
+def year_colors(years):
+    # 최근 연도부터 COLOR_25, COLOR_24, COLOR_23 순서, 그보다 오래된 연도는 그라데이션
+    years = sorted(years); fixed = [config.COLOR_23, config.COLOR_24, config.COLOR_25]
+    older = years[:-3] if len(years) > 3 else []
+    return dict(zip(years, config.generate_gradient_colors(len(older)) + fixed[-(len(years) - len(older)):] if years else []))
 
 # --- Base Chart Widget ---
 class BaseChartWidget(QWidget):
-    def __init__(self):
-        super().__init__()
-        self.fig, self.ax = plt.subplots(1, 1, figsize=(10, 5))
-        self.fig.patch.set_facecolor('none')
-        self.ax.set_facecolor('none')
-        self.canvas = FigureCanvas(self.fig)
-        self.canvas.setStyleSheet("background:transparent;")
-        self.layout = QVBoxLayout(self)
-        self.layout.setContentsMargins(0, 0, 0, 0)
-        self.layout.addWidget(self.canvas)
-        self.annot = None; self.highlight_dot = None; self.lines_dict = {}
-        self.canvas.mpl_connect('button_press_event', self.on_click)
-        self.canvas.mpl_connect('motion_notify_event', self.on_hover)
-    def clear_plot(self, message="Ready to Analyze"):
-        self.ax.clear(); self.ax.set_xticks([]); self.ax.set_yticks([])
-        self.ax.text(0.5, 0.5, message, ha='center', va='center')
-        self.annot = None; self.canvas.draw()
-    def on_click(self, event): pass 
-    def on_hover(self, event): pass 
-    @staticmethod
-    def group_brand_static(name):
-        name_str = str(name).strip(); u_name = name_str.upper()
-        if u_name in ["OPPO", "ONEPLUS", "REALME"]: return "Oppo"
-        target_map = {"APPLE": "Apple", "GOOGLE": "Google", "HONOR": "Honor", "HUAWEI": "Huawei", "SAMSUNG": "Samsung", "XIAOMI": "Xiaomi", "VIVO": "vivo"}
-        if u_name in target_map: return target_map[u_name]
-        return "Others"
-    def group_brand(self, name): return self.group_brand_static(name)
+    def __init__(self):
+        super().__init__()
+        self.fig, self.ax = plt.subplots(1, 1, figsize=(10, 5))
+        self.fig.patch.set_facecolor('none')
+        self.ax.set_facecolor('none')
+        self.canvas = FigureCanvas(self.fig)
+        self.canvas.setStyleSheet("background:transparent;")
+        self.layout = QVBoxLayout(self)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.layout.addWidget(self.canvas)
+        self.annot = None; self.highlight_dot = None; self.lines_dict = {}
+        self.hover_index = HoverIndex()
+        self.render_gen = 0; self.render_thread = None; self._mpl_events = []
+        self.connect_event('button_press_event', self.on_click)
+        self.connect_event('motion_notify_event', self.on_hover)
+    ASYNC_RENDER = True
+    # 반경 안에 점이 없을 때 커서 x에 가장 가까운 점으로 붙일지 (선 차트처럼 x축이 연속인 차트용)
+    hover_snap = False
+    SCENE_ATTRS = ('fig', 'ax', 'annot', 'highlight_dot', 'lines_dict', 'hover_index', 'cbar', 'series', '_label_ctx', '_label_artists', '_full_xlim', '_view')
+    def connect_event(self, name, fn): self._mpl_events.append((name, fn)); self.canvas.mpl_connect(name, fn)
+    def cancel_renders(self): self.render_gen += 1
+    def submit_render(self, method, args, kwargs):
+        self.render_gen += 1
+        if self.render_thread is None:
+            self.render_thread = RenderThread(); self.render_thread.rendered.connect(self.swap_scene); self.render_thread.error.connect(self.on_render_error); self.render_thread.start()
+            app = QApplication.instance()
+            if app: app.aboutToQuit.connect(self.render_thread.stop)
+        sp = self.fig.subplotpars; frame = (tuple(self.fig.get_size_inches()), self.fig.dpi, getattr(self.fig, '_original_dpi', self.fig.dpi), dict(left=sp.left, right=sp.right, top=sp.top, bottom=sp.bottom))
+        scene_class(type(self)); self.render_thread.submit((self, self.render_gen, method, args, kwargs, frame, snapshot_state(self)))
+    def make_scene(self, gen, frame, state):
+        # 현재 캔버스와 같은 크기의 오프스크린 Agg Figure 위에 그릴 대리 객체 생성 (워커 스레드). state: 제출 시점 위젯 상태 + 아직 반영 안 된 결과
+        size, dpi, original_dpi, margins = frame
+        fig = Figure(figsize=size, dpi=dpi); fig._original_dpi = original_dpi; agg = FigureCanvasAgg(fig)
+        fig.patch.set_facecolor('none'); fig.subplots_adjust(**margins); ax = fig.add_subplot(111); ax.set_facecolor('none')
+        cls = scene_class(type(self)); scene = cls.__new__(cls); scene.__dict__.update(state)
+        scene.__dict__.update(_widget=self, _gen=gen, _drawn=False, fig=fig, ax=ax, canvas=SceneCanvas(scene, agg), annot=None, highlight_dot=None, lines_dict={}, hover_index=HoverIndex(), cbar=None, series={}, _label_artists=[])
+        return scene
+    def swap_scene(self, gen, result):
+        # 데이터 상태는 요청 순서대로 항상 반영, 화면(Figure)은 가장 최근 요청의 것만 교체
+        data, scene = result; self.__dict__.update(data); self.render_thread.applied(data)
+        if scene is None or gen != self.render_gen: return
+        old = self.fig; fig = scene['fig']; agg = fig.canvas; callbacks = self.canvas.callbacks
+        self.__dict__.update(scene); fig.set_canvas(self.canvas); self.canvas.figure = fig
+        if self.canvas.callbacks is not callbacks:
+            for name, fn in self._mpl_events: self.canvas.mpl_connect(name, fn)
+        same_size = np.allclose(fig.get_size_inches(), old.get_size_inches()) and fig.dpi == old.dpi
+        if same_size and getattr(agg, 'renderer', None) is not None:
+            # 워커에서 래스터화한 버퍼를 그대로 사용 (메인 스레드에서 다시 그리지 않음)
+            self.canvas.renderer = agg.renderer; self.canvas._lastKey = agg._lastKey; self.canvas.update()
+        else: fig.set_size_inches(old.get_size_inches(), forward=False); self.canvas.draw_idle()
+    def on_render_error(self, gen, msg):
+        if gen == self.render_gen: self.show_message(f"Error: {msg}")
+    def clear_plot(self, message="Ready to Analyze"):
+        self.annot = None; self.hover_index.clear(); self.show_message(message)
+    def show_message(self, message):
+        self.cancel_renders(); self.ax.clear(); self.ax.set_xticks([]); self.ax.set_yticks([])
+        self.ax.text(0.5, 0.5, message, ha='center', va='center'); self.canvas.draw()
+    def export_figure(self, path, dpi=150):
+        # 리포트/클립보드용 내보내기는 백엔드와 무관하게 matplotlib Figure 사용
+        self.fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    def on_click(self, event): pass
+    def on_hover(self, event): pass
+    def find_hover_point(self, event):
+        hit = self.hover_index.nearest(self.ax, event)
+        if hit is None and self.hover_snap: hit = self.hover_index.snap(self.ax, event)
+        return hit
+    def group_brand(self, name): return group_brand(name)
 
 # --- Heatmap Widget ---
 class HeatmapWidget(BaseChartWidget):
-    cell_clicked = pyqtSignal(object, object)
-    def __init__(self, time_col="Week"):
-        super().__init__(); self.time_col = time_col
-        self.fig.subplots_adjust(left=0.15, right=0.95, top=0.9, bottom=0.15)
-        self.p24 = None; self.p25 = None; self.current_mode = "diff"; self.full_df = None; self.selected_idx = None
-        self.clear_plot()
-    def safe_remove_cbar(self):
-        if hasattr(self, 'cbar') and self.cbar:
-            try: self.cbar.remove()
-            except: pass
-            self.cbar = None
-    def clear_plot(self, msg="Ready to Analyze"): self.safe_remove_cbar(); super().clear_plot(msg)
-    def set_mode(self, mode): 
-        self.current_mode = mode 
-        if hasattr(self, 'p25') and self.p25 is not None: self.refresh_view()
-    def copy_data(self):
-        if self.p25 is None: QMessageBox.warning(self, "Warning", "No data to copy."); return
-        export_df = pd.DataFrame()
-        if self.current_mode == "pct" and self.p24 is not None:
-             safe_p24 = self.p24.replace(0, np.nan); export_df = (self.p25 - self.p24) / safe_p24 * 100
-        elif self.current_mode == "diff" and self.p24 is not None: export_df = (self.p25 - self.p24) / 1000000.0
-        else: export_df = self.p25 / 1000000.0 
-        if not export_df.empty: export_df.to_clipboard(); QMessageBox.information(self, "Info", f"Copied!")
-        else: QMessageBox.warning(self, "Warning", "Data empty.")
-    def reset_state(self): self.selected_idx = None; self.refresh_view(); self.cell_clicked.emit(None, None)
-    def on_click(self, event):
-        if self.p25 is None or event.inaxes != self.ax: self.reset_state(); return
-        col_idx = int(round(event.xdata)); row_idx = int(round(event.ydata))
-        if 0 <= row_idx < len(self.p25.index) and 0 <= col_idx < len(self.p25.columns):
-            self.selected_idx = (row_idx, col_idx); self.refresh_view(); self.cell_clicked.emit(self.p25.index[row_idx], self.p25.columns[col_idx])
-        else: self.reset_state()
-    def on_hover(self, event):
-        if event.inaxes != self.ax or self.p25 is None: 
-            if self.annot and self.annot.get_visible(): self.annot.set_visible(False); self.canvas.draw_idle()
-            return
-        col_idx = int(round(event.xdata)); row_idx = int(round(event.ydata))
-        if 0 <= row_idx < len(self.p25.index) and 0 <= col_idx < len(self.p25.columns):
-            if self.annot:
-                if self.p24 is not None and self.current_mode == "pct":
-                    val_24 = self.p24.iloc[row_idx, col_idx] / 1000000.0; val_25 = self.p25.iloc[row_idx, col_idx] / 1000000.0
-                    self.annot.set_text(f"Old: {val_24:.2f} Mu\nNew: {val_25:.2f} Mu")
-                else:
-                    val = self.p25.iloc[row_idx, col_idx]
-                    try: 
-                        fval = float(val)
-                        # 화면 표시용 (/1M)
-                        self.annot.set_text(f"{fval/1000000:.2f} Mu")
-                    except: self.annot.set_text(str(val))
-                self.annot.xy = (col_idx, row_idx); self.annot.set_visible(True); self.canvas.draw_idle()
-        else:
-            if self.annot and self.annot.get_visible(): self.annot.set_visible(False); self.canvas.draw_idle()
-    def update_data(self, raw_data): # Weekly
-        all_dfs = []
-        for sheet_name, df in raw_data.items():
-            temp = df.copy()
-            if "Region" not in temp.columns: temp["Region"] = config.WEEKLY_MAP.get(sheet_name, sheet_name)
-            temp["Sales"] = pd.to_numeric(temp["Sales"], errors='coerce').fillna(0)
-            if self.time_col in temp.columns: temp[self.time_col] = pd.to_numeric(temp[self.time_col], errors='coerce')
-            temp["Brand_Group"] = temp["Brand"].apply(self.group_brand); all_dfs.append(temp)
-        self.full_df = pd.concat(all_dfs); exclude = ["East Europe", "E.Europe", "E. Europe", "East Europe "]; self.full_df = self.full_df[~self.full_df['Region'].isin(exclude)]
-        if 2025 in self.full_df['Year'].unique(): max_time = self.full_df[self.full_df['Year'] == 2025][self.time_col].max()
-        else: max_time = 52 if self.time_col == "Week" else 12
-        df_ytd = self.full_df[self.full_df[self.time_col] <= max_time]
-        self.p24 = df_ytd[df_ytd['Year'] == 2024].pivot_table(index="Brand_Group", columns="Region", values="Sales", aggfunc="sum", fill_value=0)
-        self.p25 = df_ytd[df_ytd['Year'] == 2025].pivot_table(index="Brand_Group", columns="Region", values="Sales", aggfunc="sum", fill_value=0)
-        self._process_others_and_total(); self.selected_idx = None; self.refresh_view()
-    def update_data_flagship(self, df, category, target_years=None):
-        filtered_df = df[df['Category'] == category].copy()
-        if not filtered_df.empty:
-            max_date = filtered_df['Date'].max(); max_month = max_date.month
-            filtered_df = filtered_df[filtered_df['Date'].dt.month <= max_month]
-        filtered_df['YearStr'] = filtered_df['Date'].dt.year.astype(str)
-        if target_years: filtered_df = filtered_df[filtered_df['YearStr'].isin(target_years)]
-        self.p25 = filtered_df.pivot_table(index="Brand", columns="YearStr", values="Sales", aggfunc="sum", fill_value=0)
-        self.p24 = None
-        if self.p25.empty: self.clear_plot("No Data"); return
-        self.p25.loc['Total'] = self.p25.sum(axis=0); last_col = self.p25.columns[-1]; self.p25 = self.p25.sort_values(by=last_col, ascending=False)
-        if 'Total' in self.p25.index: self.p25 = pd.concat([self.p25.loc[['Total']], self.p25.drop('Total')])
-        self.selected_idx = None; self.refresh_view()
-    def update_data_omdia(self, df, category, target_years=None):
-        filtered_df = df[df['Category'] == category].copy()
-        filtered_df['TimeLabel'] = filtered_df['Year'].astype(str) + " " + filtered_df['Quarter'].astype(str) + "Q"
-        if target_years: filtered_df = filtered_df[filtered_df['Year'].astype(str).isin(target_years)]
-        self.p25 = filtered_df.pivot_table(index="Brand", columns="TimeLabel", values="Sales", aggfunc="sum", fill_value=0)
-        self.p24 = None
-        if self.p25.empty: self.clear_plot("No Data"); return
-        cols = sorted(self.p25.columns, key=lambda x: (int(x.split()[0]), int(x.split()[1][0])))
-        self.p25 = self.p25[cols]; self.p25.loc['Total'] = self.p25.sum(axis=0)
-        last_col = self.p25.columns[-1]; self.p25 = self.p25.sort_values(by=last_col, ascending=False)
-        if 'Total' in self.p25.index: self.p25 = pd.concat([self.p25.loc[['Total']], self.p25.drop('Total')])
-        self.selected_idx = None; self.refresh_view()
-    def update_data_ti_ytd(self, df, measure_filter, target_years):
-        target_df = df.copy()
-        if measure_filter: target_df = target_df[target_df['Measure'] == measure_filter]
-        if target_years: target_df = target_df[target_df['Year'].astype(str).isin(target_years)]
-        if target_df.empty: self.clear_plot("No Data"); return
-        max_year = target_df['Year'].max()
-        max_month = target_df[target_df['Year'] == max_year]['Month'].max()
-        target_df = target_df[target_df['Month'] <= max_month]
-        self.p25 = target_df.pivot_table(index="Brand", columns="Year", values="Sales", aggfunc="sum", fill_value=0)
-        self.ti_vol = self.p25.copy(); self.ti_diff = pd.DataFrame(index=self.p25.index); self.ti_yoy = pd.DataFrame(index=self.p25.index)
-        cols = sorted(self.p25.columns)
-        for i, col in enumerate(cols):
-            if i == 0: self.ti_diff[col] = 0; self.ti_yoy[col] = 0
-            else:
-                prev_col = cols[i-1]; self.ti_diff[col] = self.ti_vol[col] - self.ti_vol[prev_col]
-                prev_val = self.ti_vol[prev_col].replace(0, np.nan); self.ti_yoy[col] = (self.ti_vol[col] - self.ti_vol[prev_col]) / prev_val * 100
-                self.ti_yoy[col] = self.ti_yoy[col].fillna(0)
-        self.ti_vol.loc['Total'] = self.ti_vol.sum(axis=0); self.ti_diff.loc['Total'] = self.ti_diff.sum(axis=0)
-        for i, col in enumerate(cols):
-            if i > 0:
-                prev = self.ti_vol.loc['Total', cols[i-1]]; curr = self.ti_vol.loc['Total', col]
-                val = (curr - prev) / prev * 100 if prev != 0 else 0
-                self.ti_yoy.loc['Total', col] = val
-            else: self.ti_yoy.loc['Total', col] = 0
-        last_col = cols[-1]; sorted_idx = self.ti_vol.sort_values(by=last_col, ascending=False).index
-        if 'Total' in sorted_idx: sorted_idx = ['Total'] + [x for x in sorted_idx if x != 'Total']
-        self.ti_vol = self.ti_vol.reindex(sorted_idx); self.ti_diff = self.ti_diff.reindex(sorted_idx); self.ti_yoy = self.ti_yoy.reindex(sorted_idx)
-        self.p25 = self.ti_vol; self.selected_idx = None; self.refresh_view_ti() 
-    def refresh_view_ti(self):
-        self.safe_remove_cbar(); self.fig.clear(); self.ax = self.fig.add_subplot(111); self.ax.set_facecolor('none')
-        self.fig.subplots_adjust(left=0.15, right=0.95, top=0.85, bottom=0.05)
-        if self.current_mode == "pct": data = self.ti_yoy; fmt_type = "pct"; vmin, vmax = -50, 50
-        elif self.current_mode == "diff": data = self.ti_diff; fmt_type = "diff"; mx = data.abs().max().max(); vmin, vmax = -mx, mx
-        else: data = self.ti_vol; fmt_type = "vol"; vmin, vmax = 0, data.max().max()
-        self.draw_heatmap(data, self.ti_vol, vmin, vmax, fmt_type); self.canvas.draw()
-    def _process_others_and_total(self):
-        if "Others" not in self.p24.index: self.p24.loc["Others"] = 0
-        if "Others" not in self.p25.index: self.p25.loc["Others"] = 0
-        target_brands = [b for b in self.p24.index if b != "Others"]
-        for region in self.p24.columns:
-            low_vol = self.p24.loc[target_brands, region]
-            move = low_vol[low_vol < 1000000].index.tolist()
-            if move:
-                self.p24.loc["Others", region] += self.p24.loc[move, region].sum(); self.p24.loc[move, region] = 0
-                self.p25.loc["Others", region] += self.p25.loc[move, region].sum(); self.p25.loc[move, region] = 0
-        self.p24['Total'] = self.p24.sum(axis=1); self.p25['Total'] = self.p25.sum(axis=1)
-        self.p24.loc['Total'] = self.p24.sum(axis=0); self.p25.loc['Total'] = self.p25.sum(axis=0)
-        all_brands = sorted(list(set(self.p24.index) | set(self.p25.index)))
-        if "Total" in all_brands: all_brands.remove("Total")
-        if "Others" in all_brands: all_brands.remove("Others")
-        final_idx = ["Total"] + all_brands + ["Others"]
-        all_regions = sorted(list(set(self.p24.columns) | set(self.p25.columns)))
-        if "Total" in all_regions: all_regions.remove("Total")
-        final_cols = ["Total"] + all_regions
-        self.p24 = self.p24.reindex(index=[x for x in final_idx if x in self.p24.index], columns=final_cols, fill_value=0)
-        self.p25 = self.p25.reindex(index=[x for x in final_idx if x in self.p25.index], columns=final_cols, fill_value=0)
-    def refresh_view(self):
-        if hasattr(self, 'ti_vol') and self.ti_vol is not None: self.refresh_view_ti(); return
-        self.safe_remove_cbar(); self.fig.clear(); self.ax = self.fig.add_subplot(111); self.ax.set_facecolor('none')
-        self.fig.subplots_adjust(left=0.15, right=0.95, top=0.85, bottom=0.05)
-        self.annot = self.ax.annotate("", xy=(0,0), xytext=(10,10), textcoords="offset points", bbox=dict(boxstyle="round", fc="w", alpha=0.9), arrowprops=dict(arrowstyle="->")); self.annot.set_visible(False)
-        data = None; fmt_type = "vol"; vmin, vmax = 0, 1
-        if self.p24 is None: data = self.p25; fmt_type = "vol"; vmin, vmax = 0, data.max().max()
-        else:
-            if self.current_mode == "pct":
-                safe_p24 = self.p24.replace(0, np.nan); data = (self.p25 - self.p24) / safe_p24 * 100
-                mask_zero = (self.p24 == 0); data[mask_zero] = np.where(self.p25[mask_zero] > 0, 100.0, 0.0); fmt_type = "pct"; vmin, vmax = -50, 50
-            elif self.current_mode == "diff": data = self.p25 - self.p24; fmt_type = "diff"; max_val = data.abs().max().max(); vmin, vmax = -max_val, max_val if max_val > 0 else 1
-            elif self.current_mode == "raw": data = self.p25; fmt_type = "vol"; vmin, vmax = 0, data.max().max()
-        self.draw_heatmap(data, self.p25, vmin, vmax, fmt_type); self.canvas.draw()
-    def draw_heatmap(self, data_df, vol_df, vmin, vmax, fmt_type):
-        colors = ["#ffffff", "#2563EB"] if fmt_type == "vol" else ["#f44336", "#ffffff", "#90caf9"]
-        custom_cmap = LinearSegmentedColormap.from_list("custom_cmap", colors); norm = plt.Normalize(vmin, vmax)
-        mapped_data = custom_cmap(norm(data_df.values))
-        if self.selected_idx: sel_r, sel_c = self.selected_idx; mapped_data[..., 3] = 0.3; mapped_data[sel_r, sel_c, 3] = 1.0
-        im = self.ax.imshow(mapped_data, aspect='auto'); self.ax.xaxis.tick_top()
-        self.ax.set_xticks(range(len(data_df.columns))); self.ax.set_yticks(range(len(data_df.index)))
-        xt = self.ax.set_xticklabels(data_df.columns, fontsize=11, rotation=45, ha='left')
-        yt = self.ax.set_yticklabels(data_df.index, fontsize=12)
-        for label in xt + yt:
-            if label.get_text() == "Total": label.set_fontweight('bold')
-        sm = plt.cm.ScalarMappable(cmap=custom_cmap, norm=norm); sm.set_array([]); self.cbar = self.fig.colorbar(sm, ax=self.ax, fraction=0.046, pad=0.04)
-        cbar_label = 'Volume (Mu)' if fmt_type == "vol" else ('Growth Rate (%)' if fmt_type == "pct" else 'Volume Diff (Mu)')
-        self.cbar.set_label(cbar_label, rotation=270, labelpad=15)
-        for i in range(len(data_df.index)):
-            for j in range(len(data_df.columns)):
-                val = data_df.iloc[i, j]; vol = vol_df.iloc[i, j]
-                is_dark = abs(val) > 40 if fmt_type == "pct" else (abs(val) > (vmax * 0.6) if fmt_type == "diff" else val > (vmax * 0.5))
-                text_color = "white" if is_dark else "black"
-                text_alpha = 1.0 if not self.selected_idx or (i, j) == self.selected_idx else 0.3
-                if fmt_type == "pct":
-                    if vol == 0 and val == 0: txt = "-"
-                    elif val == 100.0 and vol > 0 and data_df.iloc[i,j] == 100.0: txt = "New"
-                    else: txt = f"{val:+.1f}%"
-                else:
-                    # [MODIFIED] Divide by 1M for Mu display
-                    display_val = val / 1000000.0
-                    txt = f"{display_val:,.2f}"
-                self.ax.text(j, i, txt, ha="center", va="center", color=text_color, fontsize=11, alpha=text_alpha)
-  class ComparisonTableWidget(QWidget):
-    cellClicked = pyqtSignal(str, str) # model, quarter
-    def __init__(self):
-        super().__init__()
-        layout = QVBoxLayout(self)
-        self.table = QTableWidget()
-        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.table.cellClicked.connect(self.on_cell_clicked)
-        self.table.setStyleSheet("""
-            QTableWidget { background-color: transparent; gridline-color: #d0d0d0; font-family: 'Malgun Gothic'; font-size: 10pt; }
-            QHeaderView::section { background-color: #f0f0f0; padding: 4px; border: 1px solid #d0d0d0; font-weight: bold; }
-        """)
-        layout.addWidget(self.table)
-        self.df = None
-        self.full_data = None
-
-    def update_data(self, df):
-        self.full_data = df
-        if df.empty:
-            self.table.clear(); self.table.setRowCount(0); self.table.setColumnCount(0); return
-        
-        # Calculate Average
-        pivot = df.pivot_table(index='Model', columns='Date', values='Value', aggfunc='mean', fill_value=0)
-        
-        # Sort Columns
-        try:
-            cols = sorted(pivot.columns, key=lambda x: (int(x.split()[0]), int(x.split()[1][1]))) # YYYY Qn -> split by space? "2023 Q1" -> 2023, 1
-            pivot = pivot[cols]
-        except: pass
-        
-        self.df = pivot
-        
-        self.table.clear()
-        self.table.setRowCount(len(pivot.index))
-        self.table.setColumnCount(len(pivot.columns))
-        
-        self.table.setVerticalHeaderLabels(pivot.index.astype(str))
-        self.table.setHorizontalHeaderLabels(pivot.columns.astype(str))
-        
-        for i in range(len(pivot.index)):
-            for j in range(len(pivot.columns)):
-                val = pivot.iloc[i, j]
-                txt = f"{val:,.2f}" if val != 0 else "-"
-                item = QTableWidgetItem(txt)
-                item.setTextAlignment(Qt.AlignCenter)
-                self.table.setItem(i, j, item)
-        self.table.resizeColumnsToContents()
-
-    def on_cell_clicked(self, row, col):
-        if self.df is None: return
-        model = self.df.index[row]
-        quarter = self.df.columns[col]
-        self.cellClicked.emit(model, quarter)
-
-    def copy_data(self):
-        if self.df is not None:
-            self.df.to_clipboard()
-            QMessageBox.information(self, "Info", "Copied Average Data")
+    cell_clicked = pyqtSignal(object, object)
+    LABEL_MIN_W = 34; LABEL_MIN_H = 12; LABEL_MAX_CELLS = 600
+    def __init__(self, time_col="Week"):
+        super().__init__(); self.time_col = time_col
+        self.fig.subplots_adjust(left=0.15, right=0.95, top=0.9, bottom=0.15)
+        self.p24 = None; self.p25 = None; self.current_mode = "diff"; self.full_df = None; self.selected_idx = None
+        self.source_df = None; self.ytd_cube = None; self.month_cuts = None; self.max_month = None; self.year_pair = None; self.max_time = None; self.fold_map = None
+        self._label_ctx = None; self._label_artists = []; self._view = None
+        self.connect_event('scroll_event', self.on_scroll); self.connect_event('resize_event', self.on_resize)
+        self.clear_plot()
+    def safe_remove_cbar(self):
+        if hasattr(self, 'cbar') and self.cbar:
+            try: self.cbar.remove()
+            except: pass
+            self.cbar = None
+    def clear_plot(self, msg="Ready to Analyze"): self.safe_remove_cbar(); self._label_ctx = None; self._label_artists = []; super().clear_plot(msg)
+    def set_mode(self, mode): 
+        self.current_mode = mode 
+        if hasattr(self, 'p25') and self.p25 is not None: self.refresh_view()
+    def copy_data(self):
+        if self.p25 is None: QMessageBox.warning(self, "Warning", "No data to copy."); return
+        export_df = pd.DataFrame()
+        if self.current_mode == "pct" and self.p24 is not None:
+             safe_p24 = self.p24.replace(0, np.nan); export_df = (self.p25 - self.p24) / safe_p24 * 100
+        elif self.current_mode == "diff" and self.p24 is not None: export_df = (self.p25 - self.p24) / 1000000.0
+        else: export_df = self.p25 / 1000000.0 
+        if not export_df.empty: export_df.to_clipboard(); QMessageBox.information(self, "Info", f"Copied!")
+        else: QMessageBox.warning(self, "Warning", "Data empty.")
+    def reset_state(self): self.selected_idx = None; self.refresh_view(); self.cell_clicked.emit(None, None)
+    def on_click(self, event):
+        if self.p25 is None or event.inaxes != self.ax: self.reset_state(); return
+        self.select_cell(int(round(event.ydata)), int(round(event.xdata)))
+    def select_cell(self, row_idx, col_idx):
+        if self.p25 is not None and 0 <= row_idx < len(self.p25.index) and 0 <= col_idx < len(self.p25.columns):
+            self.selected_idx = (row_idx, col_idx); self.refresh_view(); self.cell_clicked.emit(self.p25.index[row_idx], self.p25.columns[col_idx])
+        else: self.reset_state()
+    def on_hover(self, event):
+        if event.inaxes != self.ax or self.p25 is None: 
+            if self.annot and self.annot.get_visible(): self.annot.set_visible(False); self.canvas.draw_idle()
+            return
+        col_idx = int(round(event.xdata)); row_idx = int(round(event.ydata))
+        if 0 <= row_idx < len(self.p25.index) and 0 <= col_idx < len(self.p25.columns):
+            if self.annot:
+                self.annot.set_text(self.cell_tooltip(row_idx, col_idx))
+                self.annot.xy = (col_idx, row_idx); self.annot.set_visible(True); self.canvas.draw_idle()
+        else:
+            if self.annot and self.annot.get_visible(): self.annot.set_visible(False); self.canvas.draw_idle()
+    def cell_tooltip(self, row_idx, col_idx):
+        if self.p24 is not None and self.current_mode == "pct":
+            val_24 = self.p24.iloc[row_idx, col_idx] / 1000000.0; val_25 = self.p25.iloc[row_idx, col_idx] / 1000000.0
+            return f"Old: {val_24:.2f} Mu\nNew: {val_25:.2f} Mu"
+        val = self.p25.iloc[row_idx, col_idx]
+        # 화면 표시용 (/1M)
+        try: return f"{float(val)/1000000:.2f} Mu"
+        except: return str(val)
+    @render_offthread
+    def update_data(self, raw_data, year_pair=None, max_month=None): # Weekly
+        # 로드 시 한 번: 지역 프레임(MonthNum 순), YTD 누적합 큐브, 연도별 월 cutoff (TrendWidget도 같은 큐브 사용)
+        df = region_frame(raw_data, self.time_col, config.WEEKLY_MAP)
+        if "MonthNum" in df.columns: df = df.sort_values("MonthNum", kind="stable", ignore_index=True)
+        self.source_df = df; self.ytd_cube = cube_for(df, self.time_col)
+        self.month_cuts = month_cutoffs(df, self.time_col) if "MonthNum" in df.columns else None
+        self.max_month = max_month; self._apply_max_month(year_pair); indexed_for(self.full_df)
+    @render_offthread
+    def set_max_month(self, max_month, year_pair=None):
+        # 최대 월 변경: 재집계 없이 (슬라이스 + 큐브 cutoff 조회)
+        if self.ytd_cube is None: return
+        self.max_month = max_month; self._apply_max_month(year_pair)
+    def _apply_max_month(self, year_pair):
+        capped = self.max_month is not None and self.month_cuts is not None
+        self.full_df = slice_to_month(self.source_df, self.max_month) if capped else self.source_df
+        years = [y for y in self.ytd_cube.years if (self._time_cap(y) or 0) >= 0]
+        self.year_pair = tuple(year_pair) if year_pair else default_year_pair(years)
+        if self.year_pair is None: self.p24 = None; self.p25 = None; self.clear_plot("No Data"); return
+        self._apply_year_pair(); self.selected_idx = None; self.refresh_view()
+    @render_offthread
+    def set_year_pair(self, base, comp):
+        # 연도 쌍 변경: 재피벗 없이 큐브에서 조회
+        if self.ytd_cube is None: return
+        self.year_pair = (base, comp); self._apply_year_pair(); self.selected_idx = None; self.refresh_view()
+    def _time_cap(self, year):
+        # 최대 월까지의 마지막 시점 (최대 월이 없으면 None, 해당 연도 데이터가 없으면 -1)
+        if self.max_month is None or self.month_cuts is None: return None
+        return int(self.month_cuts.at[year, min(int(self.max_month), 12)]) if year in self.month_cuts.index else -1
+    def _apply_year_pair(self):
+        base, comp = self.year_pair; max_time = ytd_cutoff(self.ytd_cube, comp, self.time_col, self._time_cap(comp)); self.max_time = max_time
+        self.p24 = self._ytd(base, max_time); self.p25 = self._ytd(comp, max_time); self._process_others_and_total()
+    def _ytd(self, year, max_time):
+        cap = self._time_cap(year)
+        return self.ytd_cube.ytd(year, max_time if cap is None else min(max_time, cap))
+    @render_offthread
+    def update_data_flagship(self, df, category, target_years=None):
+        self.p25 = flagship_table(df, category, target_years); self.p24 = None
+        if self.p25.empty: self.clear_plot("No Data"); return
+        self.selected_idx = None; self.refresh_view()
+    @render_offthread
+    def update_data_omdia(self, df, category, target_years=None):
+        self.p25 = omdia_table(df, category, target_years); self.p24 = None
+        if self.p25.empty: self.clear_plot("No Data"); return
+        self.selected_idx = None; self.refresh_view()
+    @render_offthread
+    def update_data_ti_ytd(self, df, measure_filter, target_years):
+        vol = ti_ytd_table(df, measure_filter or None, target_years)
+        if vol is None: self.clear_plot("No Data"); return
+        self.ti_vol, self.ti_diff, self.ti_yoy = growth_tables(vol); self.p25 = self.ti_vol; self.selected_idx = None; self.refresh_view_ti()
+    @render_offthread
+    def refresh_view_ti(self):
+        if self.current_mode == "pct": data = self.ti_yoy; fmt_type = "pct"; vmin, vmax = -50, 50
+        elif self.current_mode == "diff": data = self.ti_diff; fmt_type = "diff"; mx = data.abs().max().max(); vmin, vmax = -mx, mx
+        else: data = self.ti_vol; fmt_type = "vol"; vmin, vmax = 0, data.max().max()
+        self.render_heatmap(data, self.ti_vol, vmin, vmax, fmt_type, annotate=False)
+    def _process_others_and_total(self):
+        # 기준 연도(p24) 볼륨 기준으로 지역별 소형 브랜드를 Others로 접기 (같은 맵을 p25와 드릴다운에 적용)
+        self.p24, self.p25, self.fold_map = yoy_tables(self.p24, self.p25, threshold=config.OTHERS_THRESHOLD, top_n=config.OTHERS_TOP_N)
+    @render_offthread
+    def refresh_view(self):
+        if hasattr(self, 'ti_vol') and self.ti_vol is not None: self.refresh_view_ti(); return
+        data = None; fmt_type = "vol"; vmin, vmax = 0, 1
+        if self.p24 is None: data = self.p25; fmt_type = "vol"; vmin, vmax = 0, data.max().max()
+        else:
+            if self.current_mode == "pct":
+                data = yoy_change(self.p24, self.p25); fmt_type = "pct"; vmin, vmax = -50, 50
+            elif self.current_mode == "diff": data = self.p25 - self.p24; fmt_type = "diff"; max_val = data.abs().max().max(); vmin, vmax = -max_val, max_val if max_val > 0 else 1
+            elif self.current_mode == "raw": data = self.p25; fmt_type = "vol"; vmin, vmax = 0, data.max().max()
+        self.render_heatmap(data, self.p25, vmin, vmax, fmt_type)
+    def render_heatmap(self, data_df, vol_df, vmin, vmax, fmt_type, annotate=True):
+        self.safe_remove_cbar(); self.fig.clear(); self.ax = self.fig.add_subplot(111); self.ax.set_facecolor('none')
+        self.fig.subplots_adjust(left=0.15, right=0.95, top=0.85, bottom=0.05)
+        if annotate: self.annot = self.ax.annotate("", xy=(0,0), xytext=(10,10), textcoords="offset points", bbox=dict(boxstyle="round", fc="w", alpha=0.9), arrowprops=dict(arrowstyle="->")); self.annot.set_visible(False)
+        self.draw_heatmap(data_df, vol_df, vmin, vmax, fmt_type); self.canvas.draw()
+    def map_colors(self, data_df, vmin, vmax, fmt_type):
+        colors = ["#ffffff", "#2563EB"] if fmt_type in ("vol", "weeks") else ["#f44336", "#ffffff", "#90caf9"]
+        custom_cmap = LinearSegmentedColormap.from_list("custom_cmap", colors); norm = plt.Normalize(vmin, vmax)
+        mapped_data = custom_cmap(norm(data_df.values))
+        if self.selected_idx: sel_r, sel_c = self.selected_idx; mapped_data[..., 3] = 0.3; mapped_data[sel_r, sel_c, 3] = 1.0
+        return mapped_data, custom_cmap, norm
+    def set_label_context(self, data_df, vol_df, vmax, fmt_type):
+        self._label_ctx = (data_df.values.astype(float), vol_df.reindex(index=data_df.index, columns=data_df.columns).values.astype(float), vmax, fmt_type)
+    def cell_label(self, i, j):
+        vals, vols, vmax, fmt_type = self._label_ctx; val = vals[i, j]; vol = vols[i, j]
+        is_dark = abs(val) > 40 if fmt_type == "pct" else (abs(val) > (vmax * 0.6) if fmt_type == "diff" else val > (vmax * 0.5))
+        text_color = "white" if is_dark else "black"
+        text_alpha = 1.0 if not self.selected_idx or (i, j) == self.selected_idx else 0.3
+        if fmt_type == "pct":
+            if vol == 0 and val == 0: txt = "-"
+            elif val == 100.0 and vol > 0: txt = "New"
+            else: txt = f"{val:+.1f}%"
+        elif fmt_type == "weeks": txt = "-" if np.isnan(val) else f"{val:.1f}w"
+        else:
+            # [MODIFIED] Divide by 1M for Mu display
+            display_val = val / 1000000.0
+            txt = f"{display_val:,.2f}"
+        return txt, text_color, text_alpha
+    def draw_heatmap(self, data_df, vol_df, vmin, vmax, fmt_type):
+        mapped_data, custom_cmap, norm = self.map_colors(data_df, vmin, vmax, fmt_type)
+        im = self.ax.imshow(mapped_data, aspect='auto', interpolation='nearest'); self.ax.xaxis.tick_top()
+        self.ax.set_xticks(range(len(data_df.columns))); self.ax.set_yticks(range(len(data_df.index)))
+        xt = self.ax.set_xticklabels(data_df.columns, fontsize=11, rotation=45, ha='left')
+        yt = self.ax.set_yticklabels(data_df.index, fontsize=12)
+        for label in xt + yt:
+            if label.get_text() == "Total": label.set_fontweight('bold')
+        sm = plt.cm.ScalarMappable(cmap=custom_cmap, norm=norm); sm.set_array([]); self.cbar = self.fig.colorbar(sm, ax=self.ax, fraction=0.046, pad=0.04)
+        cbar_label = {"vol": 'Volume (Mu)', "pct": 'Growth Rate (%)', "weeks": 'Weeks of Cover'}.get(fmt_type, 'Volume Diff (Mu)')
+        self.cbar.set_label(cbar_label, rotation=270, labelpad=15)
+        # 같은 크기의 행렬이면 확대/스크롤 상태 유지
+        shape = data_df.shape
+        if self._view is not None and self._view[0] == shape: self.ax.set_xlim(self._view[1]); self.ax.set_ylim(self._view[2])
+        else: self._view = None
+        self.set_label_context(data_df, vol_df, vmax, fmt_type)
+        self._label_artists = []; self._render_labels()
+    def _visible_cells(self):
+        # 현재 뷰포트에 보이는 행/열 범위와 셀 하나의 픽셀 크기
+        n_rows, n_cols = self._label_ctx[0].shape
+        x0, x1 = sorted(self.ax.get_xlim()); y0, y1 = sorted(self.ax.get_ylim())
+        bbox = self.ax.bbox; cell_w = bbox.width / max(x1 - x0, 1e-9); cell_h = bbox.height / max(y1 - y0, 1e-9)
+        r0 = max(int(np.floor(y0 + 0.5)), 0); r1 = min(int(np.ceil(y1 - 0.5)), n_rows - 1)
+        c0 = max(int(np.floor(x0 + 0.5)), 0); c1 = min(int(np.ceil(x1 - 0.5)), n_cols - 1)
+        return r0, r1, c0, c1, cell_w, cell_h
+    def _render_labels(self):
+        # 셀이 읽을 수 있을 만큼 클 때만, 보이는 영역의 셀에만 텍스트를 그림
+        for t in self._label_artists:
+            try: t.remove()
+            except: pass
+        self._label_artists = []
+        if self._label_ctx is None: return
+        if self._label_ctx[0].size == 0: return
+        r0, r1, c0, c1, cell_w, cell_h = self._visible_cells()
+        if cell_w < self.LABEL_MIN_W or cell_h < self.LABEL_MIN_H: return
+        if (r1 - r0 + 1) * (c1 - c0 + 1) > self.LABEL_MAX_CELLS: return
+        font_size = 11 if cell_h >= 18 else 9
+        for i in range(r0, r1 + 1):
+            for j in range(c0, c1 + 1):
+                txt, text_color, text_alpha = self.cell_label(i, j)
+                self._label_artists.append(self.ax.text(j, i, txt, ha="center", va="center", color=text_color, fontsize=font_size, alpha=text_alpha, clip_on=True))
+    def on_scroll(self, event):
+        # 휠: 세로 스크롤, Shift+휠: 가로 스크롤, Ctrl+휠: 커서 기준 확대/축소
+        if event.inaxes != self.ax or self._label_ctx is None: return
+        n_rows, n_cols = self._label_ctx[0].shape
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()  # imshow: y축은 위가 작은 값 (y0 > y1)
+        step = 1 if event.button == 'down' else -1; key = event.key or ""
+        if "control" in key or "ctrl" in key:
+            scale = 1.25 if step > 0 else 0.8
+            x0 = event.xdata + (x0 - event.xdata) * scale; x1 = event.xdata + (x1 - event.xdata) * scale
+            y0 = event.ydata + (y0 - event.ydata) * scale; y1 = event.ydata + (y1 - event.ydata) * scale
+        elif "shift" in key: x0 += step; x1 += step
+        else: y0 += step; y1 += step
+        x0, x1 = self._clamp_span(x0, x1, n_cols); y1, y0 = self._clamp_span(y1, y0, n_rows)
+        self.ax.set_xlim(x0, x1); self.ax.set_ylim(y0, y1); self._view = ((n_rows, n_cols), (x0, x1), (y0, y1))
+        self._render_labels(); self.canvas.draw_idle()
+    @staticmethod
+    def _clamp_span(lo, hi, n):
+        lo_lim, hi_lim = -0.5, n - 0.5; span = max(min(hi - lo, hi_lim - lo_lim), 1.0)
+        if lo < lo_lim: lo = lo_lim; hi = lo + span
+        if hi > hi_lim: hi = hi_lim; lo = hi - span
+        return lo, hi
+    def on_resize(self, event):
+        if self._label_ctx is not None: self._render_labels()
+class ComparisonTableWidget(QWidget):
+    cellClicked = pyqtSignal(str, int) # model, period (quarter code)
+    def __init__(self):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        self.table = QTableWidget()
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.cellClicked.connect(self.on_cell_clicked)
+        self.table.setStyleSheet("""
+            QTableWidget { background-color: transparent; gridline-color: #d0d0d0; font-family: 'Malgun Gothic'; font-size: 10pt; }
+            QHeaderView::section { background-color: #f0f0f0; padding: 4px; border: 1px solid #d0d0d0; font-weight: bold; }
+        """)
+        layout.addWidget(self.table)
+        self.df = None
+        self.full_data = None
+
+    def update_data(self, df):
+        self.full_data = df
+        if df.empty:
+            self.table.clear(); self.table.setRowCount(0); self.table.setColumnCount(0); return
+        
+        # Calculate Average (Period = 분기 코드 → 열은 정수 정렬, 헤더만 라벨로 표시)
+        pivot = df.pivot_table(index='Model', columns='Period', values='Value', aggfunc='mean', fill_value=0).sort_index(axis=1)
+        
+        self.df = pivot
+        
+        self.table.clear()
+        self.table.setRowCount(len(pivot.index))
+        self.table.setColumnCount(len(pivot.columns))
+        
+        self.table.setVerticalHeaderLabels(pivot.index.astype(str))
+        self.table.setHorizontalHeaderLabels(period_labels(pivot.columns, "Quarter", BYMODEL_PERIOD_FMT))
+        
+        for i in range(len(pivot.index)):
+            for j in range(len(pivot.columns)):
+                val = pivot.iloc[i, j]
+                txt = f"{val:,.2f}" if val != 0 else "-"
+                item = QTableWidgetItem(txt)
+                item.setTextAlignment(Qt.AlignCenter)
+                self.table.setItem(i, j, item)
+        self.table.resizeColumnsToContents()
+
+    def on_cell_clicked(self, row, col):
+        if self.df is None: return
+        model = self.df.index[row]
+        period = int(self.df.columns[col])
+        self.cellClicked.emit(model, period)
+
+    def copy_data(self):
+        if self.df is not None:
+            out = self.df.copy(); out.columns = period_labels(out.columns, "Quarter", BYMODEL_PERIOD_FMT); out.to_clipboard()
+            QMessageBox.information(self, "Info", "Copied Average Data")
 
 # [NEW] Detail Chart Widget (Sidebar)
 class DetailChartWidget(BaseChartWidget):
-    def __init__(self):
-        super().__init__()
-        self.fig.subplots_adjust(left=0.15, right=0.9, top=0.9, bottom=0.2)
-        self.clear_plot()
-
-    def clear_plot(self, message="Select a cell"):
-        super().clear_plot(message)
-
-    def update_chart(self, full_df, model, quarter):
-        self.ax.clear()
-        target = full_df[(full_df['Model'] == model) & (full_df['Date'] == quarter)]
-        
-        if target.empty:
-            self.ax.text(0.5, 0.5, "No Detail Data", ha='center', va='center')
-            self.canvas.draw()
-            return
-            
-        # Bar Chart
-        firms = target['Firm'].tolist()
-        values = target['Value'].tolist()
-        colors = [config.THEMES['Omdia']['dark'], config.THEMES['TechInsights']['dark'], '#F39C12'] # Colors for Omdia, TI, GfK
-        
-        bars = self.ax.bar(firms, values, color=colors[:len(firms)], width=0.5)
-        
-        self.ax.set_title(f"{model} - {quarter}", fontsize=11, fontweight='bold')
-        self.ax.set_ylabel("Volume (Mu)")
-        self.ax.grid(axis='y', linestyle='--', alpha=0.5)
-        
-        # Annotate
-        for bar in bars:
-            height = bar.get_height()
-            self.ax.text(bar.get_x() + bar.get_width()/2., height,
-                         f'{height:.2f}', ha='center', va='bottom')
-            
-        self.canvas.draw()
+    def __init__(self):
+        super().__init__()
+        self.fig.subplots_adjust(left=0.15, right=0.9, top=0.9, bottom=0.2)
+        self.clear_plot()
+
+    def clear_plot(self, message="Select a cell"):
+        super().clear_plot(message)
+
+    def update_chart(self, full_df, model, period):
+        self.ax.clear(); quarter = period_label(period, "Quarter", BYMODEL_PERIOD_FMT)
+        target = indexed_for(full_df).select(Model=model, Period=period)
+        
+        if target.empty:
+            self.ax.text(0.5, 0.5, "No Detail Data", ha='center', va='center')
+            self.canvas.draw()
+            return
+            
+        # Bar Chart
+        firms = target['Firm'].tolist()
+        values = target['Value'].tolist()
+        colors = [config.THEMES['Omdia']['dark'], config.THEMES['TechInsights']['dark'], '#F39C12'] # Colors for Omdia, TI, GfK
+        
+        bars = self.ax.bar(firms, values, color=colors[:len(firms)], width=0.5)
+        
+        self.ax.set_title(f"{model} - {quarter}", fontsize=11, fontweight='bold')
+        self.ax.set_ylabel("Volume (Mu)")
+        self.ax.grid(axis='y', linestyle='--', alpha=0.5)
+        
+        # Annotate
+        for bar in bars:
+            height = bar.get_height()
+            self.ax.text(bar.get_x() + bar.get_width()/2., height,
+                         f'{height:.2f}', ha='center', va='bottom')
+            
+        self.canvas.draw()
 
 class LaunchTableWidget(QWidget):
-    def __init__(self):
-        super().__init__()
-        layout = QVBoxLayout(self); layout.setContentsMargins(0, 0, 0, 0)
-        self.table = QTableWidget(); self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.table.setStyleSheet("QTableWidget { background-color: transparent; gridline-color: #d0d0d0; font-family: 'Malgun Gothic'; font-size: 10pt; } QHeaderView::section { background-color: #f0f0f0; padding: 4px; border: 1px solid #d0d0d0; font-weight: bold; }")
-        layout.addWidget(self.table); self.current_df = None
-    def copy_current_data(self):
-        if self.current_df is not None and not self.current_df.empty: (self.current_df / 1000000).to_clipboard(); QMessageBox.information(self, "Info", "Copied!")
-        else: QMessageBox.warning(self, "Warning", "No data.")
-    def update_table(self, df, brand, category, models=None, mode="Release", target_years=None):
-        if df is None or brand is None: self.table.clear(); return
-        target = df[(df['Brand']==brand) & (df['Category']==category)]
-        if models: target = target[target['Model'].isin(models)]
-        if target.empty: self.table.clear(); self.table.setRowCount(0); self.table.setColumnCount(0); return
-        if mode == "Release":
-            pivot = target.pivot_table(index="Model", columns="QuartersSinceLaunch", values="Sales", aggfunc="sum")
-            cols = sorted([c for c in pivot.columns if c >= 0]); pivot = pivot[cols]; pivot.columns = [f"Q+{int(c)}" for c in pivot.columns]
-        else:
-            if target_years: target = target[target['Year'].astype(str).isin(target_years)]
-            target = target.copy(); target['YQ'] = target['Year'].astype(str) + " " + target['Quarter'].astype(str) + "Q"
-            pivot = target.pivot_table(index="Model", columns="YQ", values="Sales", aggfunc="sum")
-            sorted_cols = sorted(pivot.columns, key=lambda x: (int(x.split()[0]), int(x.split()[1][0]))); pivot = pivot[sorted_cols]
-        self.current_df = pivot; self.table.clear(); self.table.setRowCount(len(pivot.index)); self.table.setColumnCount(len(pivot.columns))
-        self.table.setVerticalHeaderLabels(pivot.index.astype(str)); self.table.setHorizontalHeaderLabels(pivot.columns.astype(str))
-        for i in range(len(pivot.index)):
-            for j in range(len(pivot.columns)):
-                val = pivot.iloc[i, j]; txt = f"{val/1000000:.2f}" if pd.notna(val) and val != 0 else "-"
-                item = QTableWidgetItem(txt); item.setTextAlignment(Qt.AlignCenter); self.table.setItem(i, j, item)
-        self.table.resizeColumnsToContents()
+    def __init__(self):
+        super().__init__()
+        layout = QVBoxLayout(self); layout.setContentsMargins(0, 0, 0, 0)
+        self.table = QTableWidget(); self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setStyleSheet("QTableWidget { background-color: transparent; gridline-color: #d0d0d0; font-family: 'Malgun Gothic'; font-size: 10pt; } QHeaderView::section { background-color: #f0f0f0; padding: 4px; border: 1px solid #d0d0d0; font-weight: bold; }")
+        layout.addWidget(self.table); self.current_df = None
+    def copy_current_data(self):
+        if self.current_df is not None and not self.current_df.empty: (self.current_df / 1000000).to_clipboard(); QMessageBox.information(self, "Info", "Copied!")
+        else: QMessageBox.warning(self, "Warning", "No data.")
+    def update_table(self, df, brand, category, models=None, mode="Release", target_years=None):
+        if df is None or brand is None: self.table.clear(); return
+        # 코호트 행렬(모델 × 분기)에서 선택만 하고, 열 라벨은 표시할 때 생성
+        pivot = cohorts_for(df).matrix(brand, category, "since" if mode == "Release" else "calendar", "Quarter", models=models or None)
+        if mode != "Release" and target_years: pivot = pivot.loc[:, np.isin(period_year(pivot.columns, "Quarter"), [int(y) for y in target_years])]
+        pivot = pivot.dropna(how='all').dropna(axis=1, how='all')
+        if pivot.empty: self.table.clear(); self.table.setRowCount(0); self.table.setColumnCount(0); return
+        pivot.columns = [f"Q+{int(c)}" if mode == "Release" else period_label(c, "Quarter") for c in pivot.columns]
+        self.current_df = pivot; self.table.clear(); self.table.setRowCount(len(pivot.index)); self.table.setColumnCount(len(pivot.columns))
+        self.table.setVerticalHeaderLabels(pivot.index.astype(str)); self.table.setHorizontalHeaderLabels(pivot.columns.astype(str))
+        for i in range(len(pivot.index)):
+            for j in range(len(pivot.columns)):
+                val = pivot.iloc[i, j]; txt = f"{val/1000000:.2f}" if pd.notna(val) and val != 0 else "-"
+                item = QTableWidgetItem(txt); item.setTextAlignment(Qt.AlignCenter); self.table.setItem(i, j, item)
+        self.table.resizeColumnsToContents()
 
 class LaunchTrendWidget(BaseChartWidget):
-    def __init__(self):
-        super().__init__(); self.fig.subplots_adjust(right=0.75, left=0.08, top=0.9, bottom=0.15); self.full_df = None; self.current_brand = None; self.current_category = None; self.current_pivot = None; self.clear_plot()
-    def clear_plot(self): super().clear_plot("Select Brand")
-    def copy_current_data(self):
-        if self.current_pivot is not None and not self.current_pivot.empty: df_mu = self.current_pivot / 1000000.0; df_mu.to_clipboard(); QMessageBox.information(self, "Info", "Copied!")
-        else: QMessageBox.warning(self, "Warning", "No data.")
-    def update_chart(self, full_df, brand, category, visible_models=None, x_limit=None, is_cumulative=False, time_unit="Month"):
-        self.full_df = full_df; self.current_brand = brand; self.current_category = category
-        if brand is None or brand == "Total": self.clear_plot(); return
-        self.ax.clear(); self.lines_dict = {}
-        self.annot = self.ax.annotate("", xy=(0,0), xytext=(15,15), textcoords="offset points", bbox=dict(boxstyle="round4,pad=0.5", fc=config.COLOR_23, ec="none", alpha=0.9), arrowprops=dict(arrowstyle="->", color=config.COLOR_23)); self.annot.set_visible(False)
-        self.highlight_dot, = self.ax.plot([], [], 'o', markersize=8, color='white', markeredgecolor='black', visible=False)
-        target_df = full_df[(full_df['Brand'] == brand) & (full_df['Category'] == category)]
-        if visible_models is not None: target_df = target_df[target_df['Model'].isin(visible_models)]
-        idx_col = 'QuartersSinceLaunch' if time_unit == "Quarter" else 'MonthsSinceLaunch'
-        if idx_col not in target_df.columns: self.ax.text(0.5, 0.5, "Time column missing", ha='center', va='center'); self.canvas.draw(); return
-        pivot = target_df.pivot_table(index=idx_col, columns='Model', values='Sales', aggfunc='sum')
-        if pivot.empty: self.ax.text(0.5, 0.5, "No Data / Unchecked All", ha='center', va='center'); self.current_pivot = None; self.canvas.draw(); return
-        if x_limit is not None: pivot = pivot[pivot.index <= x_limit]
-        if is_cumulative: pivot = pivot.cumsum()
-        self.current_pivot = pivot; max_idx = pivot.index.max(); max_idx = 0 if pd.isna(max_idx) else max_idx
-        new_index = range(int(max_idx) + 1); pivot = pivot.reindex(new_index)
-        all_models_in_cat = full_df[(full_df['Brand'] == brand) & (full_df['Category'] == category)]['Model'].unique(); all_models_in_cat.sort()
-        colors = config.generate_gradient_colors(len(all_models_in_cat)); color_map = {m: c for m, c in zip(all_models_in_cat, colors)}
-        for model in pivot.columns:
-            valid_data = pivot[model].dropna(); color = color_map.get(model, 'black')
-            line, = self.ax.plot(valid_data.index, valid_data.values / 1000000.0, label=model, color=color, linewidth=2.5, marker='o', markersize=6); self.lines_dict[line] = model
-        self.ax.set_title("Model Launch Trend", fontsize=12, fontweight='bold', pad=10)
-        xlabel = "Quarters Since Launch (Q+N)" if time_unit == "Quarter" else "Months Since Launch (T+N)"
-        self.ax.set_xlabel(xlabel, fontsize=10); self.ax.set_ylabel("Sales Volume (Mn Units)", fontsize=10); self.ax.legend(frameon=False, bbox_to_anchor=(1.02, 1), loc='upper left')
-        self.ax.grid(True, linestyle='--', alpha=0.5); self.fig.subplots_adjust(right=0.75, left=0.08, top=0.9, bottom=0.15); self.canvas.draw()
-    def on_hover(self, event):
-        if event.inaxes != self.ax or not self.annot: return
-        found = False
-        for line, model_name in self.lines_dict.items():
-            cont, ind = line.contains(event)
-            if cont:
-                x_data, y_data = line.get_data(); idx = ind["ind"][0]; pos_x = x_data[idx]; pos_y = y_data[idx]
-                self.annot.xy = (pos_x, pos_y); text = f"{model_name}\n+{int(pos_x)}\n{pos_y:.2f} Mu"
-                self.annot.set_text(text); self.annot.set_visible(True); self.highlight_dot.set_data([pos_x], [pos_y]); self.highlight_dot.set_color(line.get_color()); self.highlight_dot.set_visible(True); self.canvas.draw_idle(); found = True; break 
-        if not found and self.annot.get_visible(): self.annot.set_visible(False); self.highlight_dot.set_visible(False); self.canvas.draw_idle()
+    MARKER_POINT_BUDGET = 400; hover_snap = True
+    def __init__(self):
+        super().__init__(); self.fig.subplots_adjust(right=0.75, left=0.08, top=0.9, bottom=0.15); self.full_df = None; self.current_brand = None; self.current_category = None; self.current_pivot = None
+        self.series = {}; self._full_xlim = None; self._color_cache = {}; self._cache_df = None
+        self.connect_event('scroll_event', self.on_scroll); self.connect_event('resize_event', lambda e: self._apply_viewport())
+        self.clear_plot()
+    def clear_plot(self): self.series = {}; super().clear_plot("Select Brand")
+    def copy_current_data(self):
+        if self.current_pivot is not None and not self.current_pivot.empty: df_mu = self.current_pivot / 1000000.0; df_mu.to_clipboard(); QMessageBox.information(self, "Info", "Copied!")
+        else: QMessageBox.warning(self, "Warning", "No data.")
+    def _color_map(self, brand, category, all_models):
+        key = (brand, category)
+        if key not in self._color_cache:
+            models = sorted(all_models); colors = config.generate_gradient_colors(len(models)); self._color_cache[key] = dict(zip(models, colors))
+        return self._color_cache[key]
+    @render_offthread
+    def update_chart(self, full_df, brand, category, visible_models=None, x_limit=None, is_cumulative=False, time_unit="Month"):
+        self.full_df = full_df; self.current_brand = brand; self.current_category = category
+        if brand is None or brand == "Total": self.clear_plot(); return
+        if full_df is not self._cache_df: self._cache_df = full_df; self._color_cache = {}
+        # 로드 시 만들어 둔 코호트 행렬(모델 × 출시 후 기간, 누적 포함)에서 행/열만 선택
+        cohorts = cohorts_for(full_df)
+        if time_unit not in cohorts.units: self.series = {}; self.show_message("Time column missing"); return
+        pivot = cohorts.matrix(brand, category, "since", time_unit, is_cumulative, visible_models).T.dropna(how='all')
+        if pivot.empty: self.current_pivot = None; self.series = {}; self.show_message("No Data / Unchecked All"); return
+        if x_limit is not None: pivot = pivot[pivot.index <= x_limit]
+        self.current_pivot = pivot; color_map = self._color_map(brand, category, cohorts.models(brand, category))
+        series = {}
+        for model in pivot.columns:
+            valid_data = pivot[model].dropna(); series[model] = (valid_data.index.values.astype(float), valid_data.values / 1000000.0, color_map.get(model, 'black'))
+        xlabel = "Quarters Since Launch (Q+N)" if time_unit == "Quarter" else "Months Since Launch (T+N)"
+        self.render_launch(series, xlabel)
+    def render_launch(self, series, xlabel):
+        self.ax.clear(); self.lines_dict = {}; self.series = {}; self.hover_index.clear()
+        self.annot = self.ax.annotate("", xy=(0,0), xytext=(15,15), textcoords="offset points", bbox=dict(boxstyle="round4,pad=0.5", fc=config.COLOR_23, ec="none", alpha=0.9), arrowprops=dict(arrowstyle="->", color=config.COLOR_23)); self.annot.set_visible(False)
+        self.highlight_dot, = self.ax.plot([], [], 'o', markersize=8, color='white', markeredgecolor='black', visible=False)
+        for model, (x, y, color) in series.items():
+            line, = self.ax.plot(x, y, label=model, color=color, linewidth=2.5, marker='o', markersize=6); self.lines_dict[line] = model; self.series[line] = (x, y)
+        self.ax.set_title("Model Launch Trend", fontsize=12, fontweight='bold', pad=10)
+        self.ax.set_xlabel(xlabel, fontsize=10); self.ax.set_ylabel("Sales Volume (Mn Units)", fontsize=10); self.ax.legend(frameon=False, bbox_to_anchor=(1.02, 1), loc='upper left')
+        self.ax.grid(True, linestyle='--', alpha=0.5); self.fig.subplots_adjust(right=0.75, left=0.08, top=0.9, bottom=0.15)
+        self.hover_index.build(self.lines_dict.keys(), self.series); self._full_xlim = self.ax.get_xlim(); self._apply_viewport(); self.canvas.draw()
+    def _apply_viewport(self):
+        # 뷰포트와 겹치는 시리즈만 그리고, 픽셀 폭에 맞춰 피크를 보존하며 decimation
+        if not self.series: return
+        x0, x1 = sorted(self.ax.get_xlim()); n_buckets = max(int(self.ax.bbox.width / 2), 10)
+        shown = {}; total = 0
+        for line, (x, y) in self.series.items():
+            if x[-1] < x0 or x[0] > x1: continue
+            a = max(int(np.searchsorted(x, x0, 'left')) - 1, 0); b = min(int(np.searchsorted(x, x1, 'right')) + 1, len(x))
+            xs, ys = decimate_minmax(x[a:b], y[a:b], n_buckets); shown[line] = (xs, ys); total += len(xs)
+        marker = 'o' if total <= self.MARKER_POINT_BUDGET else ''
+        for line in self.series:
+            if line in shown: line.set_data(*shown[line]); line.set_marker(marker); line.set_visible(True)
+            else: line.set_visible(False)
+    def on_scroll(self, event):
+        # 휠: 커서 기준 x축 확대/축소, Shift+휠: 좌우 이동
+        if event.inaxes != self.ax or not self.series or self._full_xlim is None: return
+        x0, x1 = self.ax.get_xlim(); lo, hi = self._full_xlim; step = 1 if event.button == 'down' else -1
+        if "shift" in (event.key or ""): shift = (x1 - x0) * 0.1 * step; x0 += shift; x1 += shift
+        else: scale = 1.25 if step > 0 else 0.8; x0 = event.xdata + (x0 - event.xdata) * scale; x1 = event.xdata + (x1 - event.xdata) * scale
+        span = min(max(x1 - x0, 2.0), hi - lo)
+        if x0 < lo: x0 = lo; x1 = lo + span
+        if x1 > hi: x1 = hi; x0 = hi - span
+        self.ax.set_xlim(x0, x1); self._apply_viewport()
+        self.ax.relim(visible_only=True); self.ax.autoscale_view(scalex=False); self.canvas.draw_idle()
+    def on_hover(self, event):
+        if event.inaxes != self.ax or not self.annot: return
+        hit = self.find_hover_point(event)
+        if hit:
+            line, pos_x, pos_y = hit; model_name = self.lines_dict.get(line, "")
+            self.annot.xy = (pos_x, pos_y); text = f"{model_name}\n+{int(pos_x)}\n{pos_y:.2f} Mu"
+            self.annot.set_text(text); self.annot.set_visible(True); self.highlight_dot.set_data([pos_x], [pos_y]); self.highlight_dot.set_color(line.get_color()); self.highlight_dot.set_visible(True); self.canvas.draw_idle()
+        elif self.annot.get_visible(): self.annot.set_visible(False); self.highlight_dot.set_visible(False); self.canvas.draw_idle()
+
+# [NEW] Sell-in vs Sell-through Reconciliation Heatmap
+class ReconHeatmapWidget(HeatmapWidget):
+    METRIC_FMT = {"gap": "diff", "inventory": "diff", "woc": "weeks"}
+    def __init__(self):
+        super().__init__(time_col="Month"); self.recon = None; self.recon_metric = "gap"; self.target = None
+    def set_metric(self, metric):
+        self.recon_metric = metric
+        if self.recon is not None: self.refresh_view()
+    @render_offthread
+    def update_recon(self, recon, year, month):
+        self.recon = recon; self.target = (year, month); self.selected_idx = None; self.refresh_view()
+    @render_offthread
+    def refresh_view(self):
+        if self.recon is None: return
+        data = self.recon.frame(self.recon_metric, *self.target); self.p25 = data if not data.empty else None; self.p24 = None
+        if data.empty: self.clear_plot("No overlapping sell-in / sell-through data"); return
+        fmt_type = self.METRIC_FMT[self.recon_metric]
+        if fmt_type == "weeks": vmin, vmax = 0, max(float(np.nanmax(data.values)) if np.isfinite(data.values).any() else 1.0, 1.0)
+        else: max_val = float(np.abs(data.values).max()); vmin, vmax = -max_val, max_val if max_val > 0 else 1
+        self.render_heatmap(data, data, vmin, vmax, fmt_type)
+    def cell_tooltip(self, row_idx, col_idx):
+        val = self.p25.iloc[row_idx, col_idx]
+        if self.recon_metric == "woc": return "-" if pd.isna(val) else f"{val:.1f} weeks of cover"
+        return f"{val/1000000:+.2f} Mu"
+    def copy_data(self):
+        if self.p25 is None: QMessageBox.warning(self, "Warning", "No data to copy."); return
+        (self.p25 if self.recon_metric == "woc" else self.p25 / 1000000.0).to_clipboard(); QMessageBox.information(self, "Info", "Copied!")
 
 class LineChartWidget(BaseChartWidget):
-    def __init__(self, time_col="Week"): super().__init__(); self.time_col = time_col; self.current_data = None; self.clear_plot()
-    def clear_plot(self): super().clear_plot("Select a cell in Heatmap")
-    def copy_current_data(self):
-        if self.current_data is not None and not self.current_data.empty: df_mu = self.current_data / 1000000.0; df_mu.to_clipboard(); QMessageBox.information(self, "Info", "Copied!")
-        else: QMessageBox.warning(self, "Warning", "No data.")
-    def update_chart(self, full_df, brand, region, pivot_24, is_cumulative=False):
-        self.ax.clear(); target_df = full_df.copy()
-        if region != "Total": target_df = target_df[target_df['Region'] == region]
-        if brand == "Total": pass 
-        elif brand == "Others":
-            if "Brand_Group" not in target_df.columns: target_df["Brand_Group"] = target_df["Brand"].apply(lambda x: HeatmapWidget.group_brand_static(x))
-            grp_sums = target_df[target_df['Year'] == 2024].groupby("Brand_Group")['Sales'].sum()
-            others_candidates = grp_sums[grp_sums < 1000000].index.tolist(); others_candidates.append("Others")
-            target_df = target_df[target_df['Brand_Group'].isin(others_candidates)]
-        else:
-            if "Brand_Group" not in target_df.columns: target_df["Brand_Group"] = target_df["Brand"].apply(lambda x: HeatmapWidget.group_brand_static(x))
-            target_df = target_df[target_df['Brand_Group'] == brand]
-        target_df = target_df[target_df['Year'].isin([2023, 2024, 2025])]
-        if self.time_col == "Week" and "Week" in target_df.columns: target_df.loc[target_df["Week"] == 53, "Week"] = 52
-        weekly_trend = target_df.pivot_table(index=self.time_col, columns="Year", values="Sales", aggfunc="sum")
-        if is_cumulative: weekly_trend = weekly_trend.cumsum()
-        self.current_data = weekly_trend; years = [2023, 2024, 2025]; colors = {2023: config.COLOR_23, 2024: config.COLOR_24, 2025: config.COLOR_25}; self.lines_dict = {}
-        for y in years:
-            if y in weekly_trend.columns:
-                data = weekly_trend[y].dropna()
-                if not data.empty: mu_values = data.values / 1000000.0; line, = self.ax.plot(data.index, mu_values, label=str(y), color=colors[y], linewidth=2.5); self.lines_dict[y] = line
-        trend_type = "Weekly" if self.time_col == "Week" else "Monthly"; title_suffix = "(Cumulative)" if is_cumulative else f"({trend_type} Trend)"
-        self.ax.set_title(f"{brand} in {region} {title_suffix}", fontsize=12, fontweight='bold', pad=10)
-        self.ax.legend(frameon=False); self.ax.grid(True, linestyle='--', alpha=0.5); self.ax.set_ylabel("(Mu)", fontsize=10, rotation=0, labelpad=20, y=1.02); self.ax.tick_params(axis='both', labelsize=10)
-        self.highlight_dot, = self.ax.plot([], [], 'o', markersize=8, color='white', markeredgecolor='black', visible=False)
-        self.annot = self.ax.annotate("", xy=(0,0), xytext=(15,15), textcoords="offset points", bbox=dict(boxstyle="round4,pad=0.5", fc=config.COLOR_23, ec="none", alpha=0.9), arrowprops=dict(arrowstyle="->", color=config.COLOR_23)); self.annot.set_visible(False); self.canvas.draw()
-    def on_hover(self, event):
-        if event.inaxes != self.ax or not self.annot: return
-        found = False
-        for year, line in self.lines_dict.items():
-            cont, ind = line.contains(event)
-            if cont:
-                x_data, y_data = line.get_data(); idx = ind["ind"][0]; pos_x = x_data[idx]; pos_y = y_data[idx]
-                self.annot.xy = (pos_x, pos_y); time_prefix = "Week" if self.time_col == "Week" else "Month"
-                text = f"{time_prefix} {int(pos_x)}\n{pos_y:.2f} Mu"; self.annot.set_text(text); self.annot.set_visible(True); self.highlight_dot.set_data([pos_x], [pos_y]); self.highlight_dot.set_color(line.get_color()); self.highlight_dot.set_visible(True); self.canvas.draw_idle(); found = True; break 
-        if not found and self.annot.get_visible(): self.annot.set_visible(False); self.highlight_dot.set_visible(False); self.canvas.draw_idle()
+    hover_snap = True
+    def __init__(self, time_col="Week"): super().__init__(); self.time_col = time_col; self.current_data = None; self.clear_plot()
+    def clear_plot(self): super().clear_plot("Select a cell in Heatmap")
+    def copy_current_data(self):
+        if self.current_data is not None and not self.current_data.empty: df_mu = self.current_data / 1000000.0; df_mu.to_clipboard(); QMessageBox.information(self, "Info", "Copied!")
+        else: QMessageBox.warning(self, "Warning", "No data.")
+    @render_offthread
+    def update_chart(self, full_df, brand, region, pivot_24, is_cumulative=False, year_pair=None, fold_map=None):
+        all_years = sorted(int(y) for y in pd.unique(full_df['Year'].dropna())); year_pair = year_pair or default_year_pair(all_years)
+        years = display_years(all_years, year_pair) if year_pair else []
+        weekly_trend = trend_table(full_df, brand, region, years, self.time_col, year_pair[0] if year_pair else None, fold_map, config.OTHERS_THRESHOLD, config.OTHERS_TOP_N)
+        if is_cumulative: weekly_trend = weekly_trend.cumsum()
+        self.current_data = weekly_trend; colors = year_colors(years)
+        series = {}
+        for y in years:
+            if y in weekly_trend.columns:
+                data = weekly_trend[y].dropna()
+                if not data.empty: series[y] = (data.index.values.astype(float), data.values / 1000000.0, colors[y])
+        trend_type = "Weekly" if self.time_col == "Week" else "Monthly"; title_suffix = "(Cumulative)" if is_cumulative else f"({trend_type} Trend)"
+        self.render_lines(series, f"{brand} in {region} {title_suffix}")
+    def render_lines(self, series, title):
+        self.ax.clear(); self.hover_index.clear(); self.lines_dict = {}
+        for y, (x, mu_values, color) in series.items(): line, = self.ax.plot(x, mu_values, label=str(y), color=color, linewidth=2.5); self.lines_dict[y] = line
+        self.ax.set_title(title, fontsize=12, fontweight='bold', pad=10)
+        self.ax.legend(frameon=False); self.ax.grid(True, linestyle='--', alpha=0.5); self.ax.set_ylabel("(Mu)", fontsize=10, rotation=0, labelpad=20, y=1.02); self.ax.tick_params(axis='both', labelsize=10)
+        self.highlight_dot, = self.ax.plot([], [], 'o', markersize=8, color='white', markeredgecolor='black', visible=False)
+        self.annot = self.ax.annotate("", xy=(0,0), xytext=(15,15), textcoords="offset points", bbox=dict(boxstyle="round4,pad=0.5", fc=config.COLOR_23, ec="none", alpha=0.9), arrowprops=dict(arrowstyle="->", color=config.COLOR_23)); self.annot.set_visible(False)
+        self.hover_index.build(self.lines_dict.values()); self.canvas.draw()
+    def on_hover(self, event):
+        if event.inaxes != self.ax or not self.annot: return
+        hit = self.find_hover_point(event)
+        if hit:
+            line, pos_x, pos_y = hit
+            self.annot.xy = (pos_x, pos_y); time_prefix = "Week" if self.time_col == "Week" else "Month"
+            text = f"{time_prefix} {int(pos_x)}\n{pos_y:.2f} Mu"; self.annot.set_text(text); self.annot.set_visible(True); self.highlight_dot.set_data([pos_x], [pos_y]); self.highlight_dot.set_color(line.get_color()); self.highlight_dot.set_visible(True); self.canvas.draw_idle()
+        elif self.annot.get_visible(): self.annot.set_visible(False); self.highlight_dot.set_visible(False); self.canvas.draw_idle()
 
 class TrendWidget(BaseChartWidget):
-    def __init__(self, time_col="Week"):
-        super().__init__(); self.time_col = time_col; self.fig.subplots_adjust(left=0.15, right=0.95, top=0.75, bottom=0.15); self.full_df = None; self.current_brand = None; self.current_region = None; self.is_vol_mode = False; self.current_data = None; self.pivot_vol = None; self.clear_plot()
-    def clear_plot(self): super().clear_plot("Select Total Row/Col")
-    def set_mode(self, is_checked):
-        self.is_vol_mode = is_checked; 
-        if self.full_df is not None and self.current_brand and self.current_region: self.update_chart(self.full_df, self.current_brand, self.current_region)
-    def copy_current_data(self):
-        if self.pivot_vol is not None and not self.pivot_vol.empty:
-            df_export = self.pivot_vol.T 
-            df_export = df_export / 1000000.0
-            df_export.to_clipboard()
-            QMessageBox.information(self, "Info", "Copied! (Year as Columns, Mu Unit)")
-        else: QMessageBox.warning(self, "Warning", "No data.")
-    def update_chart(self, full_df, brand, region):
-        self.full_df = full_df; self.current_brand = brand; self.current_region = region
-        if brand != "Total" and region != "Total": self.clear_plot(); self.ax.text(0.5, 0.5, "Select Total Row/Col for Trend", ha='center', va='center'); self.canvas.draw(); return
-        self.fig.clear(); self.ax = self.fig.add_subplot(111); self.ax.set_facecolor('none'); self.fig.subplots_adjust(left=0.15, right=0.95, top=0.75, bottom=0.15)
-        if 2025 in full_df['Year'].unique(): max_time = full_df[full_df['Year'] == 2025][self.time_col].max()
-        else: max_time = 52 if self.time_col == "Week" else 12
-        df = full_df[full_df['Year'].isin([2023, 2024, 2025])].copy(); df = df[df[self.time_col] <= max_time] 
-        if "Brand_Group" not in df.columns: df["Brand_Group"] = df["Brand"].apply(lambda x: HeatmapWidget.group_brand_static(x))
-        category_col = ""; title_prefix = ""; time_label = "W" if self.time_col == "Week" else "M"
-        if brand == "Total" and region == "Total": category_col = "Brand_Group"; title_prefix = f"Global Market Breakdown (YTD {time_label}{int(max_time)})"
-        elif brand != "Total": df = df[df['Brand_Group'] == brand]; category_col = "Region"; title_prefix = f"{brand}'s Regional Split (YTD {time_label}{int(max_time)})"
-        elif region != "Total": df = df[df['Region'] == region]; category_col = "Brand_Group"; title_prefix = f"{region}'s Market Breakdown (YTD {time_label}{int(max_time)})"
-        pivot = df.pivot_table(index="Year", columns=category_col, values="Sales", aggfunc="sum", fill_value=0)
-        col_sum = pivot.sum(axis=0).sort_values(ascending=False); pivot = pivot[col_sum.index]
-        years = [2023, 2024, 2025]; pivot = pivot.reindex(years)
-        self.pivot_vol = pivot 
-        if not self.is_vol_mode: pivot_pct = pivot.div(pivot.sum(axis=1), axis=0) * 100; plot_data = pivot_pct; ylabel = "Share (%)"
-        else: plot_data = pivot / 1000000.0; ylabel = "Volume (Mu)"
-        self.current_data = plot_data; categories = plot_data.columns; colors = config.generate_gradient_colors(len(categories)); bottom = np.zeros(len(years))
-        for i, cat in enumerate(categories):
-            vals = plot_data[cat].fillna(0).values; self.ax.bar(years, vals, bottom=bottom, label=cat, color=colors[i], width=0.6, edgecolor='white', linewidth=0.5)
-            for j, val in enumerate(vals):
-                threshold = 3 if not self.is_vol_mode else 0.5
-                if val >= threshold:
-                    y_pos = bottom[j] + val / 2; x_pos = years[j]; txt = f"{int(round(val))}%" if not self.is_vol_mode else f"{val:.1f}"
-                    txt_color = 'white' if i < len(categories) * 0.5 else 'black'; self.ax.text(x_pos, y_pos, txt, ha='center', va='center', color=txt_color, fontsize=9, fontweight='bold')
-            bottom += vals
-        self.ax.set_xticks(years); self.ax.set_title(title_prefix, fontsize=12, fontweight='bold', pad=10); self.ax.set_ylabel(ylabel, fontsize=10)
-        self.ax.legend(loc='lower center', bbox_to_anchor=(0.5, 1.18), ncol=min(len(categories), 4), frameon=False, fontsize=9)
-        self.ax.tick_params(axis='both', labelsize=10); self.ax.grid(axis='y', linestyle='--', alpha=0.3); self.canvas.draw()
+    def __init__(self, time_col="Week"):
+        super().__init__(); self.time_col = time_col; self.fig.subplots_adjust(left=0.15, right=0.95, top=0.75, bottom=0.15); self.full_df = None; self.current_brand = None; self.current_region = None; self.is_vol_mode = False; self.current_data = None; self.pivot_vol = None; self.year_pair = None; self.clear_plot()
+    def clear_plot(self): super().clear_plot("Select Total Row/Col")
+    def set_mode(self, is_checked):
+        self.is_vol_mode = is_checked; 
+        if self.full_df is not None and self.current_brand and self.current_region: self.update_chart(self.full_df, self.current_brand, self.current_region)
+    def copy_current_data(self):
+        if self.pivot_vol is not None and not self.pivot_vol.empty:
+            df_export = self.pivot_vol.T 
+            df_export = df_export / 1000000.0
+            df_export.to_clipboard()
+            QMessageBox.information(self, "Info", "Copied! (Year as Columns, Mu Unit)")
+        else: QMessageBox.warning(self, "Warning", "No data.")
+    @render_offthread
+    def update_chart(self, full_df, brand, region, year_pair=None):
+        self.full_df = full_df; self.current_brand = brand; self.current_region = region
+        if year_pair is not None: self.year_pair = tuple(year_pair)
+        if brand != "Total" and region != "Total": BaseChartWidget.clear_plot(self, "Select Total Row/Col for Trend"); return
+        if "Brand_Group" not in full_df.columns: full_df = full_df.assign(Brand_Group=full_df["Brand"].map({b: group_brand(b) for b in full_df["Brand"].unique()}))
+        cube = cube_for(full_df, self.time_col); pair = self.year_pair or default_year_pair(cube.years)
+        if pair is None: BaseChartWidget.clear_plot(self, "No Data"); return
+        # 연도 × 카테고리 YTD는 누적합 큐브에서 바로 조회
+        pivot, years, max_time = ytd_breakdown(cube, pair, brand, region); time_label = "W" if self.time_col == "Week" else "M"
+        if brand == "Total" and region == "Total": title_prefix = f"Global Market Breakdown (YTD {time_label}{int(max_time)})"
+        elif brand != "Total": title_prefix = f"{brand}'s Regional Split (YTD {time_label}{int(max_time)})"
+        else: title_prefix = f"{region}'s Market Breakdown (YTD {time_label}{int(max_time)})"
+        self.pivot_vol = pivot 
+        if not self.is_vol_mode: pivot_pct = pivot.div(pivot.sum(axis=1), axis=0) * 100; plot_data = pivot_pct; ylabel = "Share (%)"
+        else: plot_data = pivot / 1000000.0; ylabel = "Volume (Mu)"
+        self.current_data = plot_data; self.render_bars(plot_data, years, title_prefix, ylabel)
+    def render_bars(self, plot_data, years, title_prefix, ylabel):
+        self.fig.clear(); self.ax = self.fig.add_subplot(111); self.ax.set_facecolor('none'); self.fig.subplots_adjust(left=0.15, right=0.95, top=0.75, bottom=0.15)
+        categories = plot_data.columns; colors = config.generate_gradient_colors(len(categories)); bottom = np.zeros(len(years))
+        for i, cat in enumerate(categories):
+            vals = plot_data[cat].fillna(0).values; self.ax.bar(years, vals, bottom=bottom, label=cat, color=colors[i], width=0.6, edgecolor='white', linewidth=0.5)
+            for j, val in enumerate(vals):
+                threshold = 3 if not self.is_vol_mode else 0.5
+                if val >= threshold:
+                    y_pos = bottom[j] + val / 2; x_pos = years[j]; txt = f"{int(round(val))}%" if not self.is_vol_mode else f"{val:.1f}"
+                    txt_color = 'white' if i < len(categories) * 0.5 else 'black'; self.ax.text(x_pos, y_pos, txt, ha='center', va='center', color=txt_color, fontsize=9, fontweight='bold')
+            bottom += vals
+        self.ax.set_xticks(years); self.ax.set_title(title_prefix, fontsize=12, fontweight='bold', pad=10); self.ax.set_ylabel(ylabel, fontsize=10)
+        self.ax.legend(loc='lower center', bbox_to_anchor=(0.5, 1.18), ncol=min(len(categories), 4), frameon=False, fontsize=9)
+        self.ax.tick_params(axis='both', labelsize=10); self.ax.grid(axis='y', linestyle='--', alpha=0.3); self.canvas.draw()
 
 class AdvancedPivotWidget(QWidget):
-    def __init__(self):
-        super().__init__()
-        self.df = None
-        main_layout = QHBoxLayout(self)
-        field_layout = QVBoxLayout()
-        field_layout.addWidget(QLabel("Available Fields:", font=QFont("나눔스퀘어 네오 ExtraBold", 10)))
-        self.list_fields = QListWidget(); self.list_fields.setDragEnabled(True)
-        field_layout.addWidget(self.list_fields); main_layout.addLayout(field_layout, 1)
-        zone_layout = QVBoxLayout()
-        zone_layout.addWidget(QLabel("Rows (Drag here):", font=QFont("나눔스퀘어 네오 ExtraBold", 10)))
-        self.list_rows = QListWidget(); self.list_rows.setAcceptDrops(True); self.list_rows.setDragEnabled(True)
-        zone_layout.addWidget(self.list_rows)
-        zone_layout.addWidget(QLabel("Columns (Drag here):", font=QFont("나눔스퀘어 네오 ExtraBold", 10)))
-        self.list_cols = QListWidget(); self.list_cols.setAcceptDrops(True); self.list_cols.setDragEnabled(True)
-        zone_layout.addWidget(self.list_cols)
-        zone_layout.addWidget(QLabel("Values (Drag here):", font=QFont("나눔스퀘어 네오 ExtraBold", 10)))
-        self.list_vals = QListWidget(); self.list_vals.setAcceptDrops(True); self.list_vals.setDragEnabled(True)
-        zone_layout.addWidget(self.list_vals)
-        agg_layout = QHBoxLayout(); agg_layout.addWidget(QLabel("Agg:"))
-        self.group_agg = QButtonGroup(self); self.rb_sum = QRadioButton("Sum"); self.rb_mean = QRadioButton("Mean"); self.rb_sum.setChecked(True)
-        self.group_agg.addButton(self.rb_sum); self.group_agg.addButton(self.rb_mean)
-        agg_layout.addWidget(self.rb_sum); agg_layout.addWidget(self.rb_mean); zone_layout.addLayout(agg_layout)
-        self.btn_run = QPushButton("Update Pivot"); self.btn_run.setFont(QFont("나눔스퀘어 네오 ExtraBold", 10)); self.btn_run.clicked.connect(self.run_pivot)
-        zone_layout.addWidget(self.btn_run)
-        self.btn_clear = QPushButton("Clear Fields"); self.btn_clear.clicked.connect(self.reset_fields)
-        zone_layout.addWidget(self.btn_clear); main_layout.addLayout(zone_layout, 1)
-        self.table = QTableWidget(); self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.table.setStyleSheet("""QTableWidget { background-color: transparent; gridline-color: #d0d0d0; font-family: 'Malgun Gothic'; font-size: 10pt; } QHeaderView::section { background-color: #f0f0f0; padding: 4px; border: 1px solid #d0d0d0; font-weight: bold; }""")
-        main_layout.addWidget(self.table, 3)
-    def set_data(self, df): self.df = df; self.reset_fields()
-    def reset_fields(self):
-        self.list_fields.clear(); self.list_rows.clear(); self.list_cols.clear(); self.list_vals.clear(); self.table.clear(); self.table.setRowCount(0); self.table.setColumnCount(0)
-        if self.df is not None:
-            for col in self.df.columns: self.list_fields.addItem(col)
-    def run_pivot(self):
-        if self.df is None: return
-        rows = [self.list_rows.item(i).text() for i in range(self.list_rows.count())]
-        cols = [self.list_cols.item(i).text() for i in range(self.list_cols.count())]
-        vals = [self.list_vals.item(i).text() for i in range(self.list_vals.count())]
-        agg = 'mean' if self.rb_mean.isChecked() else 'sum'
-        if not rows and not cols: QMessageBox.warning(self, "Warning", "Please select at least one Row or Column."); return
-        if not vals: QMessageBox.warning(self, "Warning", "Please select at least one Value."); return
-        try:
-            pivot_df = self.df.copy()
-            for v in vals: pivot_df[v] = pd.to_numeric(pivot_df[v], errors='coerce').fillna(0)
-            pivoted = pivot_df.pivot_table(index=rows if rows else None, columns=cols if cols else None, values=vals, aggfunc=agg, fill_value=0)
-            display_df = pivoted.reset_index()
-            self.table.clear(); self.table.setRowCount(len(display_df.index)); self.table.setColumnCount(len(display_df.columns))
-            flat_cols = []
-            for c in display_df.columns: flat_cols.append(" - ".join(map(str, c)) if isinstance(c, tuple) else str(c))
-            self.table.setHorizontalHeaderLabels(flat_cols)
-            for i in range(len(display_df.index)):
-                for j in range(len(display_df.columns)):
-                    v = display_df.iloc[i, j]
-                    try: fv = float(v); txt = f"{fv:,.2f}" if fv != 0 else "-"
-                    except: txt = str(v)
-                    item = QTableWidgetItem(txt); item.setTextAlignment(Qt.AlignCenter); self.table.setItem(i, j, item)
-            self.table.resizeColumnsToContents()
-        except Exception as e: QMessageBox.critical(self, "Pivot Error", f"Failed to create pivot table.\n{e}")
+    def __init__(self):
+        super().__init__()
+        self.df = None
+        main_layout = QHBoxLayout(self)
+        field_layout = QVBoxLayout()
+        field_layout.addWidget(QLabel("Available Fields:", font=QFont("나눔스퀘어 네오 ExtraBold", 10)))
+        self.list_fields = QListWidget(); self.list_fields.setDragEnabled(True)
+        field_layout.addWidget(self.list_fields); main_layout.addLayout(field_layout, 1)
+        zone_layout = QVBoxLayout()
+        zone_layout.addWidget(QLabel("Rows (Drag here):", font=QFont("나눔스퀘어 네오 ExtraBold", 10)))
+        self.list_rows = QListWidget(); self.list_rows.setAcceptDrops(True); self.list_rows.setDragEnabled(True)
+        zone_layout.addWidget(self.list_rows)
+        zone_layout.addWidget(QLabel("Columns (Drag here):", font=QFont("나눔스퀘어 네오 ExtraBold", 10)))
+        self.list_cols = QListWidget(); self.list_cols.setAcceptDrops(True); self.list_cols.setDragEnabled(True)
+        zone_layout.addWidget(self.list_cols)
+        zone_layout.addWidget(QLabel("Values (Drag here):", font=QFont("나눔스퀘어 네오 ExtraBold", 10)))
+        self.list_vals = QListWidget(); self.list_vals.setAcceptDrops(True); self.list_vals.setDragEnabled(True)
+        zone_layout.addWidget(self.list_vals)
+        agg_layout = QHBoxLayout(); agg_layout.addWidget(QLabel("Agg:"))
+        self.group_agg = QButtonGroup(self); self.rb_sum = QRadioButton("Sum"); self.rb_mean = QRadioButton("Mean"); self.rb_sum.setChecked(True)
+        self.group_agg.addButton(self.rb_sum); self.group_agg.addButton(self.rb_mean)
+        agg_layout.addWidget(self.rb_sum); agg_layout.addWidget(self.rb_mean); zone_layout.addLayout(agg_layout)
+        self.btn_run = QPushButton("Update Pivot"); self.btn_run.setFont(QFont("나눔스퀘어 네오 ExtraBold", 10)); self.btn_run.clicked.connect(self.run_pivot)
+        zone_layout.addWidget(self.btn_run)
+        self.btn_clear = QPushButton("Clear Fields"); self.btn_clear.clicked.connect(self.reset_fields)
+        zone_layout.addWidget(self.btn_clear); main_layout.addLayout(zone_layout, 1)
+        self.table = QTableWidget(); self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setStyleSheet("""QTableWidget { background-color: transparent; gridline-color: #d0d0d0; font-family: 'Malgun Gothic'; font-size: 10pt; } QHeaderView::section { background-color: #f0f0f0; padding: 4px; border: 1px solid #d0d0d0; font-weight: bold; }""")
+        main_layout.addWidget(self.table, 3)
+    def set_data(self, df): self.df = df; self.reset_fields()
+    def reset_fields(self):
+        self.list_fields.clear(); self.list_rows.clear(); self.list_cols.clear(); self.list_vals.clear(); self.table.clear(); self.table.setRowCount(0); self.table.setColumnCount(0)
+        if self.df is not None:
+            for col in self.df.columns: self.list_fields.addItem(col)
+    def run_pivot(self):
+        if self.df is None: return
+        rows = [self.list_rows.item(i).text() for i in range(self.list_rows.count())]
+        cols = [self.list_cols.item(i).text() for i in range(self.list_cols.count())]
+        vals = [self.list_vals.item(i).text() for i in range(self.list_vals.count())]
+        agg = 'mean' if self.rb_mean.isChecked() else 'sum'
+        if not rows and not cols: QMessageBox.warning(self, "Warning", "Please select at least one Row or Column."); return
+        if not vals: QMessageBox.warning(self, "Warning", "Please select at least one Value."); return
+        try:
+            pivot_df = self.df.copy()
+            for v in vals: pivot_df[v] = pd.to_numeric(pivot_df[v], errors='coerce').fillna(0)
+            pivoted = pivot_df.pivot_table(index=rows if rows else None, columns=cols if cols else None, values=vals, aggfunc=agg, fill_value=0)
+            display_df = pivoted.reset_index()
+            self.table.clear(); self.table.setRowCount(len(display_df.index)); self.table.setColumnCount(len(display_df.columns))
+            flat_cols = []
+            for c in display_df.columns: flat_cols.append(" - ".join(map(str, c)) if isinstance(c, tuple) else str(c))
+            self.table.setHorizontalHeaderLabels(flat_cols)
+            for i in range(len(display_df.index)):
+                for j in range(len(display_df.columns)):
+                    v = display_df.iloc[i, j]
+                    try: fv = float(v); txt = f"{fv:,.2f}" if fv != 0 else "-"
+                    except: txt = str(v)
+                    item = QTableWidgetItem(txt); item.setTextAlignment(Qt.AlignCenter); self.table.setItem(i, j, item)
+            self.table.resizeColumnsToContents()
+        except Exception as e: QMessageBox.critical(self, "Pivot Error", f"Failed to create pivot table.\n{e}")
 
 class PivotWidget(QWidget):
-    def __init__(self):
-        super().__init__()
-        layout = QVBoxLayout(self)
-        layout.addWidget(QLabel("Please use the 'Custom Pivot' tab for advanced features."))
+    def __init__(self):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("Please use the 'Custom Pivot' tab for advanced features."))
 
 class HistoryChartWidget(BaseChartWidget):
-    def __init__(self):
-        super().__init__()
-        self.fig.subplots_adjust(right=0.9, left=0.15, top=0.9, bottom=0.2)
-        self.clear_plot()
-
-    def clear_plot(self, message="Select a cell to see History"):
-        super().clear_plot(message)
-
-    def update_chart(self, history_df, model, quarter):
-        pass
-
-
+    def __init__(self):
+        super().__init__()
+        self.fig.subplots_adjust(right=0.9, left=0.15, top=0.9, bottom=0.2)
+        self.clear_plot()
 
+    def clear_plot(self, message="Select a cell to see History"):
+        super().clear_plot(message)
 
+    def update_chart(self, history_df, model, quarter):
+        pass
 
+# --- Chart Backend Selection ---
+def chart_classes(backend=None):
+    backend = backend or getattr(config, "CHART_BACKEND", "matplotlib")
+    classes = {"HeatmapWidget": HeatmapWidget, "LineChartWidget": LineChartWidget, "TrendWidget": TrendWidget, "LaunchTrendWidget": LaunchTrendWidget}
+    if backend == "pyqtgraph":
+        try:
+            import charts_pg
+            classes.update(charts_pg.WIDGETS)
+        except ImportError as e: warnings.warn(f"pyqtgraph backend unavailable ({e}). Falling back to matplotlib.", RuntimeWarning, stacklevel=2)
+    return classes
@@ -0,0 +1,144 @@
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtCore import QPointF, QRectF
+import config
+from charts import HeatmapWidget, LineChartWidget, TrendWidget, LaunchTrendWidget
+
+# --- pyqtgraph Backend ---
+# Qt scene-graph 기반 렌더링. 데이터 계산/복사(copy_current_data)/시그널(cell_clicked)은 matplotlib 위젯을 그대로 상속하고,
+# render_* 훅만 교체. 리포트 내보내기(export_figure)는 숨겨둔 matplotlib Figure로 다시 그려서 저장.
+pg.setConfigOptions(antialias=True, imageAxisOrder='row-major', foreground='k')
+
+class PgSurfaceMixin:
+    MPL_BASE = None; HOVER_RADIUS_PX = 12; ASYNC_RENDER = False  # Qt 아이템은 메인 스레드에서만 생성
+    def surface(self):
+        if getattr(self, 'plot', None) is None:
+            self.canvas.hide()
+            self.plot = pg.PlotWidget(); self.plot.setBackground(None); self.plot.setMenuEnabled(False); self.plot.hideButtons()
+            self.layout.addWidget(self.plot); self.vb = self.plot.getPlotItem().getViewBox(); self.legend = self.plot.addLegend(offset=(-10, 10))
+            self.pg_series = []; self._last_render = None; self.tip = None; self.dot = None
+            self.plot.scene().sigMouseMoved.connect(self.on_pg_hover)
+        return self.plot
+    def reset_surface(self):
+        plot = self.surface(); plot.clear(); plot.setTitle(None); self.legend.clear(); self.pg_series = []
+        plot.showAxis('left'); plot.showAxis('bottom'); plot.showGrid(x=True, y=True, alpha=0.3)
+        self.tip = pg.TextItem("", anchor=(0, 1), fill=pg.mkBrush(config.COLOR_23), color='k'); self.tip.setZValue(100); self.tip.hide(); plot.addItem(self.tip, ignoreBounds=True)
+        self.dot = pg.ScatterPlotItem(size=10, brush=pg.mkBrush('w'), pen=pg.mkPen('k')); self.dot.setZValue(99); plot.addItem(self.dot, ignoreBounds=True)
+        return plot
+    def show_message(self, message):
+        plot = self.reset_surface(); plot.hideAxis('left'); plot.hideAxis('bottom'); plot.showGrid(x=False, y=False)
+        txt = pg.TextItem(message, anchor=(0.5, 0.5), color='k'); txt.setPos(0.5, 0.5); plot.addItem(txt); self.vb.setRange(xRange=(0, 1), yRange=(0, 1), padding=0)
+    def export_figure(self, path, dpi=150):
+        if self._last_render is not None: name, args = self._last_render; getattr(self.MPL_BASE, name)(self, *args)
+        super().export_figure(path, dpi)
+    def hover_text(self, key, x, y): return f"{x:g}\n{y:.2f}"
+    def on_pg_hover(self, pos):
+        # 시리즈별 x 정렬 배열에서 searchsorted로 가장 가까운 점을 찾고, 화면 거리로 최종 선택
+        if not self.pg_series or self.tip is None: return
+        if not self.vb.sceneBoundingRect().contains(pos): self.tip.hide(); self.dot.setData([], []); return
+        mx = self.vb.mapSceneToView(pos).x(); best = None; best_d = np.inf
+        for key, xs, ys, color in self.pg_series:
+            if not len(xs): continue
+            j = int(np.searchsorted(xs, mx))
+            if j == len(xs) or (j > 0 and mx - xs[j-1] <= xs[j] - mx): j -= 1
+            p = self.vb.mapViewToScene(QPointF(xs[j], ys[j])); d = np.hypot(p.x() - pos.x(), p.y() - pos.y())
+            if d < best_d: best_d = d; best = (key, xs[j], ys[j], color)
+        if best is None or (best_d > self.HOVER_RADIUS_PX and not self.hover_snap): self.tip.hide(); self.dot.setData([], []); return
+        key, x, y, color = best
+        self.tip.setText(self.hover_text(key, x, y)); self.tip.setPos(x, y); self.tip.show(); self.dot.setData([x], [y], brush=pg.mkBrush(color))
+    def add_series(self, key, x, y, color, name, symbol=None):
+        order = np.argsort(x, kind='stable'); x = np.asarray(x, dtype=float)[order]; y = np.asarray(y, dtype=float)[order]
+        item = self.plot.plot(x, y, pen=pg.mkPen(color, width=2.5), name=name, symbol=symbol, symbolSize=6, symbolBrush=color, symbolPen=color)
+        item.setDownsampling(auto=True, method='peak'); item.setClipToView(True)
+        self.pg_series.append((key, x, y, color)); return item
+
+class PgLineChartWidget(PgSurfaceMixin, LineChartWidget):
+    MPL_BASE = LineChartWidget
+    def render_lines(self, series, title):
+        self._last_render = ("render_lines", (series, title)); plot = self.reset_surface()
+        plot.setTitle(title, bold=True); plot.setLabel('left', "(Mu)")
+        for y, (x, mu_values, color) in series.items(): self.add_series(y, x, mu_values, color, str(y))
+        self.vb.enableAutoRange()
+    def hover_text(self, key, x, y):
+        time_prefix = "Week" if self.time_col == "Week" else "Month"
+        return f"{time_prefix} {int(x)}\n{y:.2f} Mu"
+
+class PgLaunchTrendWidget(PgSurfaceMixin, LaunchTrendWidget):
+    MPL_BASE = LaunchTrendWidget
+    def render_launch(self, series, xlabel):
+        self._last_render = ("render_launch", (series, xlabel)); plot = self.reset_surface()
+        plot.setTitle("Model Launch Trend", bold=True); plot.setLabel('bottom', xlabel); plot.setLabel('left', "Sales Volume (Mn Units)")
+        # 점 개수가 예산을 넘으면 마커 생략
+        symbol = 'o' if sum(len(x) for x, _, _ in series.values()) <= self.MARKER_POINT_BUDGET else None
+        for model, (x, y, color) in series.items(): self.add_series(model, x, y, color, model, symbol=symbol)
+        self.vb.setMouseEnabled(x=True, y=False); self.vb.enableAutoRange()
+    def hover_text(self, key, x, y): return f"{key}\n+{int(x)}\n{y:.2f} Mu"
+
+class PgTrendWidget(PgSurfaceMixin, TrendWidget):
+    MPL_BASE = TrendWidget
+    def render_bars(self, plot_data, years, title_prefix, ylabel):
+        self._last_render = ("render_bars", (plot_data, years, title_prefix, ylabel)); plot = self.reset_surface()
+        plot.setTitle(title_prefix, bold=True); plot.setLabel('left', ylabel); plot.showGrid(x=False, y=True, alpha=0.3)
+        categories = plot_data.columns; colors = config.generate_gradient_colors(len(categories)); bottom = np.zeros(len(years))
+        threshold = 3 if not self.is_vol_mode else 0.5
+        for i, cat in enumerate(categories):
+            vals = plot_data[cat].fillna(0).values
+            bar = pg.BarGraphItem(x=years, height=vals, y0=bottom.copy(), width=0.6, brush=pg.mkBrush(colors[i]), pen=pg.mkPen('w', width=0.5))
+            plot.addItem(bar); self.legend.addItem(bar, str(cat))
+            txt_color = 'w' if i < len(categories) * 0.5 else 'k'
+            for j, val in enumerate(vals):
+                if val >= threshold:
+                    t = pg.TextItem(f"{int(round(val))}%" if not self.is_vol_mode else f"{val:.1f}", anchor=(0.5, 0.5), color=txt_color); t.setPos(years[j], bottom[j] + val / 2); plot.addItem(t)
+            bottom += vals
+        plot.getAxis('bottom').setTicks([[(y, str(y)) for y in years]]); self.vb.enableAutoRange()
+
+class PgHeatmapWidget(PgSurfaceMixin, HeatmapWidget):
+    MPL_BASE = HeatmapWidget
+    def surface(self):
+        first = getattr(self, 'plot', None) is None; plot = super().surface()
+        if first:
+            self._pg_labels = []; self._pg_shape = None
+            plot.scene().sigMouseClicked.connect(self.on_pg_click); self.vb.sigRangeChanged.connect(lambda *_: self._render_pg_labels())
+        return plot
+    def render_heatmap(self, data_df, vol_df, vmin, vmax, fmt_type, annotate=True):
+        self._last_render = ("render_heatmap", (data_df, vol_df, vmin, vmax, fmt_type, annotate))
+        keep = self._pg_shape == data_df.shape if getattr(self, 'plot', None) is not None else False; view = self.vb.viewRange() if keep else None
+        plot = self.reset_surface(); self._pg_labels = []; plot.showGrid(x=False, y=False)
+        mapped_data, _, _ = self.map_colors(data_df, vmin, vmax, fmt_type)
+        n_rows, n_cols = data_df.shape; img = pg.ImageItem((mapped_data * 255).astype(np.uint8)); img.setRect(QRectF(-0.5, -0.5, n_cols, n_rows)); plot.addItem(img)
+        self.vb.invertY(True); plot.showAxis('top'); plot.hideAxis('bottom')
+        plot.getAxis('top').setTicks([[(j, str(c)) for j, c in enumerate(data_df.columns)]]); plot.getAxis('left').setTicks([[(i, str(r)) for i, r in enumerate(data_df.index)]])
+        cbar_label = 'Volume (Mu)' if fmt_type == "vol" else ('Growth Rate (%)' if fmt_type == "pct" else 'Volume Diff (Mu)'); plot.setTitle(cbar_label)
+        self.set_label_context(data_df, vol_df, vmax, fmt_type); self._pg_shape = data_df.shape
+        if view: self.vb.setRange(xRange=view[0], yRange=view[1], padding=0)
+        else: self.vb.setRange(xRange=(-0.5, n_cols - 0.5), yRange=(-0.5, n_rows - 0.5), padding=0)
+        self._render_pg_labels()
+    def show_message(self, message): self.vb_reset_heatmap(); super().show_message(message)
+    def vb_reset_heatmap(self):
+        self.surface(); self.vb.invertY(False); self.plot.hideAxis('top'); self.plot.getAxis('left').setTicks(None); self._pg_shape = None
+    def _render_pg_labels(self):
+        # 뷰포트 안, 읽을 수 있는 크기의 셀에만 TextItem 생성
+        for t in self._pg_labels: self.plot.removeItem(t)
+        self._pg_labels = []
+        if self._label_ctx is None or self._pg_shape is None: return
+        n_rows, n_cols = self._label_ctx[0].shape; (x0, x1), (y0, y1) = self.vb.viewRange()
+        cell_w = self.vb.width() / max(x1 - x0, 1e-9); cell_h = self.vb.height() / max(y1 - y0, 1e-9)
+        if cell_w < self.LABEL_MIN_W or cell_h < self.LABEL_MIN_H: return
+        r0 = max(int(np.floor(y0 + 0.5)), 0); r1 = min(int(np.ceil(y1 - 0.5)), n_rows - 1); c0 = max(int(np.floor(x0 + 0.5)), 0); c1 = min(int(np.ceil(x1 - 0.5)), n_cols - 1)
+        if (r1 - r0 + 1) * (c1 - c0 + 1) > self.LABEL_MAX_CELLS: return
+        for i in range(r0, r1 + 1):
+            for j in range(c0, c1 + 1):
+                txt, color, alpha = self.cell_label(i, j)
+                t = pg.TextItem(txt, anchor=(0.5, 0.5), color=color); t.setPos(j, i); t.setOpacity(alpha); self.plot.addItem(t, ignoreBounds=True); self._pg_labels.append(t)
+    def on_pg_click(self, ev):
+        if self.p25 is None or not self.vb.sceneBoundingRect().contains(ev.scenePos()): self.reset_state(); return
+        p = self.vb.mapSceneToView(ev.scenePos()); self.select_cell(int(round(p.y())), int(round(p.x())))
+    def on_pg_hover(self, pos):
+        if self.tip is None: return
+        if self.p25 is None or self._pg_shape is None or not self.vb.sceneBoundingRect().contains(pos): self.tip.hide(); return
+        p = self.vb.mapSceneToView(pos); row_idx = int(round(p.y())); col_idx = int(round(p.x()))
+        if 0 <= row_idx < len(self.p25.index) and 0 <= col_idx < len(self.p25.columns):
+            self.tip.setText(self.cell_tooltip(row_idx, col_idx)); self.tip.setPos(col_idx, row_idx); self.tip.show()
+        else: self.tip.hide()
+
+WIDGETS = {"HeatmapWidget": PgHeatmapWidget, "LineChartWidget": PgLineChartWidget, "TrendWidget": PgTrendWidget, "LaunchTrendWidget": PgLaunchTrendWidget}
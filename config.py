@@ -1,26 +1,23 @@
 import os
 import sys
-import matplotlib.pyplot as plt
-import matplotlib.colors as mcolors
-from matplotlib import rcParams
 
 # --- 시스템 설정 ---
 CACHE_DIR = "cache"
 
 def resource_path(relative_path):
-    try:
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
+    try:
+        base_path = sys._MEIPASS
+    except Exception:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
 
 # --- 디자인 색상 ---
 THEMES = {
-    "Counterpoint": {"dark": "#39A2DB", "light": "#E8F0F2", "border": "#D0D0D0"},
-    "Omdia":        {"dark": "#39A2DB", "light": "#E8F0F2", "border": "#D0D0D0"}, 
-    "TechInsights": {"dark": "#39A2DB", "light": "#E8F0F2", "border": "#D0D0D0"},
-    "Pivot":        {"dark": "#27AE60", "light": "#E9F7EF", "border": "#D5F5E3"},
-    "ByModel":      {"dark": "#8E44AD", "light": "#F4ECF7", "border": "#D2B4DE"}
+    "Counterpoint": {"dark": "#39A2DB", "light": "#E8F0F2", "border": "#D0D0D0"},
+    "Omdia":        {"dark": "#39A2DB", "light": "#E8F0F2", "border": "#D0D0D0"}, 
+    "TechInsights": {"dark": "#39A2DB", "light": "#E8F0F2", "border": "#D0D0D0"},
+    "Pivot":        {"dark": "#27AE60", "light": "#E9F7EF", "border": "#D5F5E3"},
+    "ByModel":      {"dark": "#8E44AD", "light": "#F4ECF7", "border": "#D2B4DE"}
 }
 
 CURRENT_THEME = THEMES["Counterpoint"]
@@ -41,7 +38,7 @@ COLOR_25 = "#40A6DD"
 # --- 엑셀 설정 ---
 WEEKLY_SHEETS = ["Basefile_US", "Basefile_China", "Basefile_Japan", "Basefile_Europe", "Basefile_India"]
 WEEKLY_MAP = {"Basefile_US": "US", "Basefile_China": "China", "Basefile_Japan": "Japan", 
-              "Basefile_Europe": "Europe", "Basefile_India": "India"}
+              "Basefile_Europe": "Europe", "Basefile_India": "India"}
 WEEKLY_START = "B9"
 
 MONTHLY_SHEETS = ["China", "USA", "India", "Europe", "Others"]
@@ -55,8 +52,11 @@ REGION_BRAND_SHEET = "Basefile"
 REGION_BRAND_START = "B9"
 
 OMDIA_SHEET = "Raw"
+OMDIA_COLUMNS = ["Vendor", "Model", "Form factor", "Year", "Quarter", "Unit (Million)", "Unit (Thousand)"]
 TI_SHEET = "11. FlatFile"
+TI_COLUMNS = ["Vendor", "Measure", "Year", "Month", "Value (M)"]
 TI_SHIPMENT_SHEET = "6. SP Shipments Flat File"
+TI_SHIPMENT_COLUMNS = ["Metric Name", "Brand", "Brand and Model Name", "Year", "Quarter", "Metric Value"]
 GFK_SHEET = "Global Sell-in Summary"
 
 # [NEW] Sell in Sell Thru Settings
@@ -65,24 +65,69 @@ SELLIN_SHEETS = ["Global SP"]
 
 # 각 시트가 어떤 지역(Region)으로 매핑될지 정의합니다. (매핑 정보는 유지)
 SELLIN_SHEET_MAP = {
-    "Global SP": "Total", 
-    "China SP": "China", 
-    "India SP": "India",
-    "USA SP": "US",
-    "Europe SP": "W.Europe"
+    "Global SP": "Total", 
+    "China SP": "China", 
+    "India SP": "India",
+    "USA SP": "US",
+    "Europe SP": "W.Europe"
 }
 
-SELLIN_DATE_ROW = 30      # 날짜 행
-SELLIN_START_ROW = 31     # 데이터 시작 행
-SELLIN_VENDOR_COL = "B"   # 브랜드 열
+# Sell-through(Weekly) 시트 → Sell-in 지역명 (Reconciliation 정렬용)
+SELLTHRU_REGION_MAP = {
+    "Basefile_China": "China",
+    "Basefile_India": "India",
+    "Basefile_US": "US",
+    "Basefile_Europe": "W.Europe"
+}
+
+SELLIN_DATE_ROW = 30      # 날짜 행
+SELLIN_START_ROW = 31     # 데이터 시작 행
+SELLIN_VENDOR_COL = "B"   # 브랜드 열
 SELLIN_DATA_START_COL = 3 # 데이터 시작 열 (C열)
 
+# --- 차트 백엔드 설정 ---
+# "matplotlib": 기본 (Agg), "pyqtgraph": 대용량 데이터 인터랙션용 (설치되어 있어야 함)
+# 클립보드/리포트 내보내기는 백엔드와 관계없이 matplotlib 사용
+CHART_BACKEND = "matplotlib"
+
+# --- Others 접기 설정 ---
+# 기준 연도 볼륨이 임계값 미만인 브랜드(지역별)를 Others로 합침. TOP_N을 지정하면 지역별 상위 N개 외 나머지도 합침
+OTHERS_THRESHOLD = 1000000
+OTHERS_TOP_N = None
+
+# --- 작업 스케줄러 설정 ---
+# 워커 수와 자원별 동시 실행 한도 (excel: Excel/COM 세션, cpu: 비교·피벗 등 계산 작업)
+JOB_WORKERS = 4
+JOB_LIMITS = {"excel": 2, "cpu": 2}
+# 엑셀 읽기를 별도 프로세스에서 실행하고 결과를 공유 메모리로 전달 (False: 워커 스레드에서 직접 읽기)
+ISOLATED_READERS = True
+# 한 워크북의 시트를 나눠 읽을 프로세스 수 (None: JOB_LIMITS["excel"], 1: 한 Excel 세션에서 순차 읽기). 동시에 열리는 세션은 모든 작업을 합쳐 JOB_LIMITS["excel"] 이하
+SHEET_WORKERS = None
+# 대용량 플랫 파일(Omdia Raw, TI Flat File)을 나눠 읽는 행 수. 원시 행은 청크 하나만 메모리에 있고,
+# 결과는 선택한 열만 정규화해 모으므로 최대 메모리 ≈ 청크 + 선택 열 결과의 두 배 (마지막에 합칠 때)
+STREAM_CHUNK_ROWS = 50000
+
+# --- 파일 감시 설정 ---
+# 페이지가 읽은 원본 파일이 저장되면 자동으로 다시 로드 (바뀐 시트만 다시 읽음). 크기/수정 시각이 DEBOUNCE 동안 그대로면 쓰기 완료로 판단
+# DROP_DIR를 지정하면 그 폴더에 새로 들어온 주간 파일을 Weekly 페이지가 바로 캐시하고 직전 버전과 비교
+WATCH_FILES = True
+WATCH_DEBOUNCE_MS = 2000
+WATCH_DROP_DIR = None
+WATCH_DROP_PATTERN = "*.xls*"
+
+# --- 배치(CLI) 설정 ---
+# batch.py 결과 폴더와 기본 출력 형식 (xlsx / csv / parquet), 동시에 처리할 파일 작업 수 (None: JOB_LIMITS["excel"])
+BATCH_OUT_DIR = "reports"
+BATCH_FORMATS = ["xlsx"]
+BATCH_WORKERS = None
+
 # --- 폰트 설정 ---
-rcParams['font.family'] = 'Malgun Gothic'
-rcParams['axes.unicode_minus'] = False
+# 차트 모듈(charts)이 import 시 matplotlib rcParams에 적용 (config는 Qt/matplotlib 없이 import 가능해야 함)
+PLOT_FONT = 'Malgun Gothic'
 
 def generate_gradient_colors(n):
-    if n < 1: return []
-    cmap = plt.get_cmap("tab20")
-    return [mcolors.to_hex(cmap(i % 20)) for i in range(n)]
-이거야.
+    if n < 1: return []
+    import matplotlib.pyplot as plt
+    import matplotlib.colors as mcolors
+    cmap = plt.get_cmap("tab20")
+    return [mcolors.to_hex(cmap(i % 20)) for i in range(n)]
@@ -1,555 +1,775 @@
 import pandas as pd
 import numpy as np
-import xlwings as xw
-from PyQt5.QtCore import QThread, pyqtSignal
 import os
 import pickle
+import json
+import logging
+import hashlib
+import zipfile
+import xml.etree.ElementTree as ET
 import config
+import progress
+import isolation
+from analytics import cohorts_for, indexed_for, period_code, week_month_in_year
 import re
+import functools
 import traceback
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+log = logging.getLogger(__name__)
+
+# xlwings는 import만으로 COM/matplotlib까지 끌어오므로 실제로 엑셀을 열 때 로드 (노트북/프로세스 풀에서 코어 import가 가벼움)
+def _xw():
+    import xlwings
+    return xlwings
 
 # --- Caching Helper ---
 def load_or_cache(source, cache_key, read_func, progress_callback=None):
-    if not os.path.exists(config.CACHE_DIR):
-        os.makedirs(config.CACHE_DIR)
-
-    if isinstance(source, str):
-        file_name = os.path.basename(source)
-        mtime = os.path.getmtime(source)
-        cache_file = os.path.join(config.CACHE_DIR, f"cache_{cache_key}_{file_name}_{mtime}.pkl")
-
-        if os.path.exists(cache_file):
-            if progress_callback: progress_callback(50)
-            try:
-                with open(cache_file, 'rb') as f:
-                    data = pickle.load(f)
-                if progress_callback: progress_callback(100)
-                print(f"[DEBUG] Cache loaded for {cache_key}")
-                return data
-            except Exception: pass
-
-    if progress_callback: progress_callback(10)
-    print(f"[DEBUG] Reading fresh data for {cache_key}...")
-    data = read_func(source)
-    if progress_callback: progress_callback(90)
-
-    if isinstance(source, str):
-        try:
-            for f in os.listdir(config.CACHE_DIR):
-                if f.startswith(f"cache_{cache_key}_{file_name}"):
-                    os.remove(os.path.join(config.CACHE_DIR, f))
-            with open(cache_file, 'wb') as f:
-                pickle.dump(data, f)
-        except Exception: pass
-
-    if progress_callback: progress_callback(100)
-    return data
+    if not os.path.exists(config.CACHE_DIR):
+        os.makedirs(config.CACHE_DIR)
+
+    if isinstance(source, str):
+        file_name = os.path.basename(source)
+        mtime = os.path.getmtime(source)
+        cache_file = os.path.join(config.CACHE_DIR, f"cache_{cache_key}_{file_name}_{mtime}.pkl")
+
+        if os.path.exists(cache_file):
+            if progress_callback: progress_callback(50)
+            try:
+                with open(cache_file, 'rb') as f:
+                    data = pickle.load(f)
+                if progress_callback: progress_callback(100)
+                print(f"[DEBUG] Cache loaded for {cache_key}")
+                return data
+            except Exception: pass
+
+    if progress_callback: progress_callback(10)
+    # 파일이 바뀌었으면 이전 캐시와 시트 해시를 비교해 바뀐 시트만 다시 읽음 (불가하면 전체 읽기)
+    hashes = sheet_hashes(source) if isinstance(source, str) and cache_key in SHEET_SOURCES else None
+    data = reload_changed(source, cache_key, hashes) if hashes is not None else None
+    if data is None:
+        print(f"[DEBUG] Reading fresh data for {cache_key}...")
+        data = read_func(source)
+    if progress_callback: progress_callback(90)
+
+    if isinstance(source, str):
+        try:
+            for f in os.listdir(config.CACHE_DIR):
+                if f.startswith(f"cache_{cache_key}_{file_name}"):
+                    os.remove(os.path.join(config.CACHE_DIR, f))
+            with open(cache_file, 'wb') as f:
+                pickle.dump(data, f)
+            if hashes is not None:
+                with open(cache_file[:-4] + ".sheets", 'w', encoding='utf-8') as f:
+                    json.dump({"path": os.path.abspath(source), "sheets": hashes}, f)
+        except Exception: pass
+
+    if progress_callback: progress_callback(100)
+    return data
 
 # --- Helpers ---
+def extract_version(filepath):
+    if not filepath: return (-1, -1, -1)
+    filename = os.path.basename(filepath).lower()
+    year = 0
+    y4_match = re.search(r'(20[2-3]\d)', filename)
+    if y4_match: year = int(y4_match.group(1))
+    else:
+        y2_match = re.search(r"(?:['qQ_]|^)(2[0-9])(?:[^\d]|$)", filename)
+        if y2_match: year = 2000 + int(y2_match.group(1))
+    sub_unit = 0; day = 0
+    week_match = re.search(r'(\d{1,2})\s*weeks?', filename)
+    if not week_match: week_match = re.search(r'w(\d{1,2})', filename)
+    if week_match: sub_unit = int(week_match.group(1))
+    else:
+        months_map = {'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6, 'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12}
+        for m_str, m_int in months_map.items():
+            if m_str in filename: sub_unit = m_int; break
+        if sub_unit == 0:
+            q_match = re.search(r'([1-4])q|q([1-4])', filename)
+            if q_match: sub_unit = int(q_match.group(1) or q_match.group(2)) * 3 
+    if sub_unit == 0 and year > 0:
+        y2_str = str(year)[2:]
+        mmdd_match = re.search(r'(\d{3,4})[\s_\'\-]*' + y2_str, filename)
+        if mmdd_match:
+            val = int(mmdd_match.group(1))
+            if 100 <= val <= 1231: sub_unit = val // 100; day = val % 100
+    if year == 0:
+        numbers = re.findall(r'\d+', filename)
+        if numbers: return tuple(map(int, numbers))
+        return (0, 0, 0)
+    return (year, sub_unit, day)
+
 def ensure_year(df):
-    if "Year" not in df and "Month" in df:
-        df["Year"] = pd.to_datetime(df["Month"], errors="coerce").dt.year
-    return df
+    if "Year" not in df and "Month" in df:
+        df["Year"] = pd.to_datetime(df["Month"], errors="coerce").dt.year
+    return df
 
 def compare_df(o, n, k, v):
-    m = pd.merge(o, n, how="outer", on=k, suffixes=("_old", "_new"), indicator=True)
-    return m[m["_merge"] == "left_only"], m[(m["_merge"] == "both") & (m[f"{v}_old"] != m[f"{v}_new"])]
+    m = pd.merge(o, n, how="outer", on=k, suffixes=("_old", "_new"), indicator=True)
+    return m[m["_merge"] == "left_only"], m[(m["_merge"] == "both") & (m[f"{v}_old"] != m[f"{v}_new"])]
 
 def monthly_delta(o, n, r):
-    if "Month" not in o or "Sales" not in o: return None
-    for d in (o, n): d["Month"] = pd.to_datetime(d["Month"], errors="coerce").dt.strftime("%Y-%m")
-    m = sorted(n["Month"].dropna().unique())
-    if not m: return None
-    l, p = m[-1], m[-2] if len(m) > 1 else None
-    s = lambda d, x: d[d["Month"] == x]["Sales"].sum() if x else 0
-    return {"Region": r, "Latest Month": l, "Prev Month": p or "",
-            "Latest Δ": int(s(n, l) - s(o, l)), "Prev Δ": int(s(n, p) - s(o, p)) if p else ""}
+    if "Month" not in o or "Sales" not in o: return None
+    for d in (o, n): d["Month"] = pd.to_datetime(d["Month"], errors="coerce").dt.strftime("%Y-%m")
+    m = sorted(n["Month"].dropna().unique())
+    if not m: return None
+    l, p = m[-1], m[-2] if len(m) > 1 else None
+    s = lambda d, x: d[d["Month"] == x]["Sales"].sum() if x else 0
+    return {"Region": r, "Latest Month": l, "Prev Month": p or "",
+            "Latest Δ": int(s(n, l) - s(o, l)), "Prev Δ": int(s(n, p) - s(o, p)) if p else ""}
 
 def normalize_brand(name):
-    if not isinstance(name, str): return str(name)
-    u_name = name.strip().upper()
-    if u_name in ['OPPO', 'REALME', 'ONEPLUS']:
-        return 'Oppo'
-    return name.strip()
+    if not isinstance(name, str): return str(name)
+    u_name = name.strip().upper()
+    if u_name in ['OPPO', 'REALME', 'ONEPLUS']:
+        return 'Oppo'
+    return name.strip()
+
+# --- Time Keys ---
+# 월/주/연도 키는 로드 시 한 번만 정수 컬럼으로 파싱하고 MonthNum 기준으로 정렬해 둠 (최대 월 필터 = searchsorted 슬라이스)
+MONTH_ABBR = {'jan':1, 'feb':2, 'mar':3, 'apr':4, 'may':5, 'jun':6, 'jul':7, 'aug':8, 'sep':9, 'oct':10, 'nov':11, 'dec':12}
+
+def _month_of(x):
+    if isinstance(x, datetime): return x.month
+    s = str(x).strip().lower()
+    try:
+        n = float(s); return int(n) if 1 <= n <= 12 else 0
+    except ValueError: pass
+    for k, v in MONTH_ABBR.items():
+        if k in s: return v
+    dt = pd.to_datetime(s, errors='coerce')
+    return 0 if pd.isna(dt) else dt.month
+
+def parse_month_series(s):
+    # 행 단위 apply 대신 고유값만 파싱하고 코드로 펼침
+    if pd.api.types.is_datetime64_any_dtype(s): return s.dt.month.fillna(0).astype(int)
+    codes, uniques = pd.factorize(s)
+    months = np.array([_month_of(u) for u in uniques] + [0], dtype=int)
+    return pd.Series(months[codes], index=s.index)
+
+def month_key(df):
+    date_col = next((c for c in df.columns if str(c).strip().lower() == "date"), None)
+    if date_col is not None:
+        codes, uniques = pd.factorize(df[date_col].astype(str).str.split('-').str[0].str.strip())
+        dt = pd.to_datetime(pd.Series(uniques), format='%y%m%d', errors='coerce'); mask = dt.isna()
+        if mask.any(): dt[mask] = [pd.to_datetime(u, errors='coerce') for u in uniques[mask.values]]
+        months = np.append(dt.dt.month.fillna(0).astype(int).values, 0)
+        return pd.Series(months[codes], index=df.index)
+    month_col = next((c for c in df.columns if str(c).strip().lower() == "month"), None)
+    if month_col is not None: return parse_month_series(df[month_col])
+    return pd.Series(0, index=df.index, dtype=int)
+
+def index_time_keys(df):
+    if df is None or df.empty: return df
+    df = ensure_year(df.copy())
+    for c in ("Year", "Week"):
+        if c in df.columns: df[c] = pd.to_numeric(df[c], errors='coerce').fillna(0).astype(int)
+    # 주간 데이터는 캘린더 엔진으로 월 배정 (주의 과반이 속한 달, 53주차 처리 포함)
+    df["MonthNum"] = week_month_in_year(df) if "Week" in df.columns else month_key(df).values
+    return df.sort_values("MonthNum", kind="stable").reset_index(drop=True)
+
+def index_sheets(data): return {s: index_time_keys(df) for s, df in data.items()}
+
+def slice_to_month(df, max_month):
+    # 복사 없이 1..max_month 구간만 반환
+    if df is None or df.empty or "MonthNum" not in df.columns: return df
+    m = df["MonthNum"].values
+    return df.iloc[np.searchsorted(m, 1, 'left'):np.searchsorted(m, max_month, 'right')]
+
+# --- Bulk Sheet Fetch ---
+# COM 왕복을 줄이기 위해 시트의 사용 범위를 한 번에 2차원 값으로 가져오고, 헤더/브랜드 열/Total Market 경계/데이터 블록은 메모리에서 찾음
+# 좌표는 엑셀과 같은 1-based (행, 열), 사용 범위 밖은 빈 셀(None). 확장 규칙은 xlwings expand/end와 동일
+def _empty(v): return v is None or v == ""
+
+def a1_to_rc(addr):
+    m = re.fullmatch(r"\$?([A-Za-z]+)\$?(\d+)", addr.strip()); col = 0
+    for ch in m.group(1).upper(): col = col * 26 + ord(ch) - 64
+    return int(m.group(2)), col
+
+def col_index(letters): return a1_to_rc(f"{letters}1")[1]
+
+class SheetGrid:
+    def __init__(self, values, row0=1, col0=1): self.values = values or []; self.row0 = row0; self.col0 = col0
+    @classmethod
+    def fetch(cls, ws):
+        rng = ws.used_range
+        return cls(rng.options(ndim=2).value, rng.row, rng.column)
+    def cell(self, r, c):
+        i = r - self.row0; j = c - self.col0
+        if 0 <= i < len(self.values) and 0 <= j < len(self.values[i]): return self.values[i][j]
+        return None
+    def block(self, r1, c1, r2, c2):
+        # 항상 2차원 리스트 (단일 행/열도 xlwings처럼 1차원으로 줄이지 않음)
+        width = c2 - c1 + 1; lead = min(max(self.col0 - c1, 0), width); j1 = max(c1 - self.col0, 0); out = []
+        for r in range(r1, r2 + 1):
+            i = r - self.row0
+            seg = self.values[i][j1:j1 + width - lead] if 0 <= i < len(self.values) else []
+            out.append([None] * lead + list(seg) + [None] * (width - lead - len(seg)))
+        return out
+    def row(self, r, c1, c2): return self.block(r, c1, r, c2)[0]
+    def col(self, c, r1, r2): return [v[0] for v in self.block(r1, c, r2, c)]
+    def end_down(self, r, c):
+        # expand('down'): 시작 행 + 바로 아래부터 이어지는 비어있지 않은 셀까지
+        n = 1
+        while not _empty(self.cell(r + n, c)): n += 1
+        return r + n - 1
+    def end_right(self, r, c):
+        n = 1
+        while not _empty(self.cell(r, c + n)): n += 1
+        return c + n - 1
+    def last_row(self, c):
+        # ws.range(f"{col}{last_cell.row}").end('up'): 열의 마지막 비어있지 않은 행 (없으면 1)
+        for i in range(len(self.values) - 1, -1, -1):
+            if not _empty(self.cell(self.row0 + i, c)): return self.row0 + i
+        return 1
+    def table(self, r, c): return self.block(r, c, self.end_down(r, c), self.end_right(r, c))
+    def frame(self, r, c, columns=None, where=None):
+        # range(...).expand('table').options(pd.DataFrame, header=1, index=False).value 와 같은 결과 (+ 열 선택/행 조건 푸시다운)
+        rows = self.table(r, c)
+        return scan_table(rows[0], rows[1:], columns, where)
+
+# --- Projection / Predicate Pushdown ---
+# 필요한 열(columns)과 행 조건(where)을 표를 만들면서 바로 적용 → 버려질 행/열은 DataFrame이나 캐시에 만들어지지 않음
+# 조건은 프로세스 간 전달되도록 값/튜플로만 표기: 값 → 같음, ("ge"|"le", n) → 숫자 비교, ("in", [...]) → 포함,
+# ("ieq", s) → 대소문자 무시 같음, ("brand", b) → normalize_brand 후 같음. 시트에 없는 열의 조건은 무시
+def _num(v):
+    try: return float(v)
+    except (TypeError, ValueError): return None
+
+def _predicate(spec):
+    if not isinstance(spec, tuple): return lambda v: v == spec
+    op, x = spec
+    if op == "ge": return lambda v: (n := _num(v)) is not None and n >= x
+    if op == "le": return lambda v: (n := _num(v)) is not None and n <= x
+    if op == "in": xs = set(x); return lambda v: v in xs
+    if op == "ieq": x = str(x).lower(); return lambda v: str(v).lower() == x
+    if op == "brand": return lambda v: normalize_brand(v) == x
+    raise ValueError(f"Unknown predicate: {op}")
+
+def scan_table(header, rows, columns=None, where=None):
+    pos = {}
+    for i, h in enumerate(header): pos.setdefault(str(h).strip(), i)
+    keep = list(range(len(header))) if columns is None else [pos[c] for c in columns if c in pos]
+    tests = [(pos[c], _predicate(spec)) for c, spec in (where or {}).items() if c in pos]
+    out = [[row[i] for i in keep] for row in rows if all(t(row[i]) for i, t in tests)] if tests or columns is not None else list(rows)
+    return pd.DataFrame(out, columns=[header[i] for i in keep])
+
+# --- Chunked Streaming ---
+# 엑셀 행 한도에 가까운 플랫 파일용: 표 전체를 한 번에 리스트/DataFrame으로 만들지 않고 config.STREAM_CHUNK_ROWS 행씩 읽어
+# 열 선택/조건/정규화를 청크마다 적용 → 원시 행은 청크 하나만 유지되고, 정규화된 선택 열 결과는 마지막에 한 번 합침(잠시 두 배).
+# 결과 자체가 데이터 전체이므로 columns로 필요한 열만 고르는 것이 메모리를 줄이는 방법. 표 범위는 expand('table')과 같음
+class SheetStream:
+    def __init__(self, ws, r=1, c=1, chunk_rows=None):
+        self.ws = ws; self.r = r; self.c = c; self.chunk_rows = chunk_rows or config.STREAM_CHUNK_ROWS
+        last = ws.used_range.last_cell; self.last_row = last.row
+        head = ws.range((r, c), (r, max(last.column, c))).options(ndim=2).value[0]; n = 1
+        while n < len(head) and not _empty(head[n]): n += 1
+        self.header = head[:n]
+    def chunks(self):
+        # 첫 열이 처음 비는 행에서 종료 (expand('down'))
+        start = self.r + 1; c2 = self.c + len(self.header) - 1
+        while start <= self.last_row:
+            rows = self.ws.range((start, self.c), (min(start + self.chunk_rows - 1, self.last_row), c2)).options(ndim=2).value
+            end = next((i for i, row in enumerate(rows) if _empty(row[0])), None)
+            if end is not None:
+                if end: yield rows[:end]
+                return
+            yield rows; start += self.chunk_rows
+    def frame(self, columns=None, where=None, normalize=None):
+        # normalize(chunk_df)는 행 단위 정규화만 (그룹 연산은 합친 뒤에)
+        parts = [normalize(part) if normalize else part for part in (scan_table(self.header, rows, columns, where) for rows in self.chunks()) if not part.empty]
+        if not parts:
+            empty = scan_table(self.header, [], columns, where)
+            return normalize(empty) if normalize else empty
+        return pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
 
 # --- Readers (Existing) ---
-def _read_weekly_impl(path):
-    d = {}
-    with xw.App(visible=False) as app:
-        wb = app.books.open(path, read_only=True)
-        for s in config.WEEKLY_SHEETS:
-            try:
-                df = wb.sheets[s].range(config.WEEKLY_START).expand("table").options(pd.DataFrame, header=1, index=False).value
-                if s != "Basefile_Europe" and "Region" in df: df = df.drop(columns=["Region"])
-                if "Brand" in df.columns: df["Brand"] = df["Brand"].apply(normalize_brand)
-                d[s] = df
-            except: d[s] = pd.DataFrame()
-        wb.close()
-    return d
-
-def _read_monthly_impl(path):
-    data_dict = {}
-    with xw.App(visible=False) as app:
-        wb = app.books.open(path, read_only=True)
-        for sheet_name in config.MONTHLY_SHEETS:
-            try:
-                ws = wb.sheets[sheet_name]
-                dates = ws.range((config.MONTHLY_DATE_ROW, 4)).expand('right').value
-                brands_raw = ws.range(f"{config.MONTHLY_BRAND_COL}{config.MONTHLY_DATE_ROW+1}").expand('down').value
-                valid_brands = []
-                for b in brands_raw:
-                    if str(b).strip().lower() == "total market": break
-                    valid_brands.append(b)
-                if not valid_brands or not dates: continue
-                values = ws.range((config.MONTHLY_DATE_ROW+1, 4), (config.MONTHLY_DATE_ROW+len(valid_brands), 3+len(dates))).value
-                df = pd.DataFrame(values, columns=dates)
-                df.insert(0, "Brand", valid_brands)
-                df_melt = df.melt(id_vars=["Brand"], var_name="Date", value_name="Sales")
-                df_melt["Sales"] = pd.to_numeric(df_melt["Sales"], errors='coerce').fillna(0) * 1000000 
-                df_melt["Date"] = pd.to_datetime(df_melt["Date"], errors='coerce')
-                df_melt = df_melt.dropna(subset=["Date"])
-                df_melt["Year"] = df_melt["Date"].dt.year; df_melt["Month"] = df_melt["Date"].dt.month; df_melt["Region"] = sheet_name
-                if "Brand" in df_melt.columns: df_melt["Brand"] = df_melt["Brand"].apply(normalize_brand)
-                data_dict[sheet_name] = df_melt[["Year", "Month", "Brand", "Region", "Sales"]]
-            except: pass
-        wb.close()
-    return data_dict
+# --- Parallel Sheet Extraction ---
+# 한 워크북 안의 독립 시트들을 여러 프로세스(각자 Excel 세션)로 나눠 동시에 추출/정규화하고, 시트 순서대로 같은 dict로 조립
+# sheet_reader(wb, sheet)는 정규화된 DataFrame을 반환 (None이면 해당 시트 생략)
+def _read_sheet_group(path, sheets, sheet_reader):
+    # 동시에 열린 Excel 세션 수는 프로세스 간 공유 슬롯(config.JOB_LIMITS["excel"])으로 제한
+    with isolation.slot("excel"), _xw().App(visible=False) as app:
+        wb = app.books.open(path, read_only=True)
+        try: return {s: sheet_reader(wb, s) for s in sheets}
+        finally: wb.close()
+
+def read_sheets(path, sheets, sheet_reader):
+    sheets = list(sheets); workers = max(1, min(len(sheets), config.SHEET_WORKERS or config.JOB_LIMITS["excel"]))
+    if workers == 1: out = _read_sheet_group(path, sheets, sheet_reader)
+    else:
+        # 그룹마다 별도 프로세스 (load_task의 리더 프로세스 안에서도 daemon이 아니므로 다시 띄울 수 있음)
+        out = {}; groups = [sheets[i::workers] for i in range(workers)]
+        with ThreadPoolExecutor(workers) as ex:
+            futures = [ex.submit(isolation.run_isolated, _read_sheet_group, path, g, sheet_reader) for g in groups]
+            for i, f in enumerate(as_completed(futures), 1): out.update(f.result()); progress.report(10 + 80 * i // len(futures))
+    return {s: out[s] for s in sheets if out.get(s) is not None}
+
+def _read_weekly_sheet(wb, s):
+    try:
+        df = SheetGrid.fetch(wb.sheets[s]).frame(*a1_to_rc(config.WEEKLY_START))
+        if s != "Basefile_Europe" and "Region" in df: df = df.drop(columns=["Region"])
+        if "Brand" in df.columns: df["Brand"] = df["Brand"].apply(normalize_brand)
+        return df
+    except: return pd.DataFrame()
+
+def _read_weekly_impl(path): return read_sheets(path, config.WEEKLY_SHEETS, _read_weekly_sheet)
+
+def _read_monthly_sheet(wb, sheet_name):
+    try:
+        grid = SheetGrid.fetch(wb.sheets[sheet_name]); brand_col = col_index(config.MONTHLY_BRAND_COL)
+        dates = grid.row(config.MONTHLY_DATE_ROW, 4, grid.end_right(config.MONTHLY_DATE_ROW, 4))
+        brands_raw = grid.col(brand_col, config.MONTHLY_DATE_ROW+1, grid.end_down(config.MONTHLY_DATE_ROW+1, brand_col))
+        valid_brands = []
+        for b in brands_raw:
+            if str(b).strip().lower() == "total market": break
+            valid_brands.append(b)
+        if not valid_brands or not dates: return None
+        values = grid.block(config.MONTHLY_DATE_ROW+1, 4, config.MONTHLY_DATE_ROW+len(valid_brands), 3+len(dates))
+        df = pd.DataFrame(values, columns=dates)
+        df.insert(0, "Brand", valid_brands)
+        df_melt = df.melt(id_vars=["Brand"], var_name="Date", value_name="Sales")
+        df_melt["Sales"] = pd.to_numeric(df_melt["Sales"], errors='coerce').fillna(0) * 1000000 
+        df_melt["Date"] = pd.to_datetime(df_melt["Date"], errors='coerce')
+        df_melt = df_melt.dropna(subset=["Date"])
+        df_melt["Year"] = df_melt["Date"].dt.year; df_melt["Month"] = df_melt["Date"].dt.month; df_melt["Region"] = sheet_name
+        if "Brand" in df_melt.columns: df_melt["Brand"] = df_melt["Brand"].apply(normalize_brand)
+        return df_melt[["Year", "Month", "Brand", "Region", "Sales"]]
+    except: return None
+
+def _read_monthly_impl(path): return read_sheets(path, config.MONTHLY_SHEETS, _read_monthly_sheet)
 
 def _read_flagship_impl(path):
-    with xw.App(visible=False) as app:
-        wb = app.books.open(path, read_only=True)
-        try:
-            ws = wb.sheets[config.FLAGSHIP_SHEET]
-            data_range = ws.range((config.FLAGSHIP_HEADER_ROW, 3)).expand('table')
-            df = data_range.options(pd.DataFrame, header=1, index=False).value
-            df.columns = [str(c).strip() for c in df.columns]
-            col_map = {}
-            for c in df.columns:
-                upper_c = c.upper()
-                if "VENDOR" in upper_c or "BRAND" in upper_c: col_map[c] = "Brand"
-                elif "MODEL" in upper_c: col_map[c] = "Model"
-                elif "CATEGORY" in upper_c: col_map[c] = "Category"
-            df.rename(columns=col_map, inplace=True)
-            if 'Brand' in df.columns: df['Brand'] = df['Brand'].apply(normalize_brand)
-            date_cols = [c for c in df.columns if c not in ['Brand', 'Model', 'Category']]
-            df_melt = df.melt(id_vars=['Brand', 'Model', 'Category'], value_vars=date_cols, var_name="Date", value_name="Sales")
-            df_melt['Date'] = pd.to_datetime(df_melt['Date'], errors='coerce')
-            df_melt = df_melt.dropna(subset=['Date'])
-            df_melt['Sales'] = pd.to_numeric(df_melt['Sales'], errors='coerce').fillna(0) * 1000000
-            launch_dates = df_melt[df_melt['Sales'] > 0].groupby(['Brand', 'Model'])['Date'].min().reset_index()
-            launch_dates.rename(columns={'Date': 'LaunchDate'}, inplace=True)
-            df_final = pd.merge(df_melt, launch_dates, on=['Brand', 'Model'], how='left')
-            df_final['MonthsSinceLaunch'] = (df_final['Date'].dt.year - df_final['LaunchDate'].dt.year) * 12 + (df_final['Date'].dt.month - df_final['LaunchDate'].dt.month)
-            return df_final[df_final['MonthsSinceLaunch'] >= 0]
-        finally: wb.close()
+    with _xw().App(visible=False) as app:
+        wb = app.books.open(path, read_only=True)
+        try:
+            df = SheetGrid.fetch(wb.sheets[config.FLAGSHIP_SHEET]).frame(config.FLAGSHIP_HEADER_ROW, 3)
+            df.columns = [str(c).strip() for c in df.columns]
+            col_map = {}
+            for c in df.columns:
+                upper_c = c.upper()
+                if "VENDOR" in upper_c or "BRAND" in upper_c: col_map[c] = "Brand"
+                elif "MODEL" in upper_c: col_map[c] = "Model"
+                elif "CATEGORY" in upper_c: col_map[c] = "Category"
+            df.rename(columns=col_map, inplace=True)
+            if 'Brand' in df.columns: df['Brand'] = df['Brand'].apply(normalize_brand)
+            date_cols = [c for c in df.columns if c not in ['Brand', 'Model', 'Category']]
+            df_melt = df.melt(id_vars=['Brand', 'Model', 'Category'], value_vars=date_cols, var_name="Date", value_name="Sales")
+            df_melt['Date'] = pd.to_datetime(df_melt['Date'], errors='coerce')
+            df_melt = df_melt.dropna(subset=['Date'])
+            df_melt['Sales'] = pd.to_numeric(df_melt['Sales'], errors='coerce').fillna(0) * 1000000
+            # 출시월 = 판매량 > 0 인 첫 달 (merge 대신 groupby transform)
+            df_final = df_melt.assign(LaunchDate=df_melt['Date'].where(df_melt['Sales'] > 0).groupby([df_melt['Brand'], df_melt['Model']]).transform('min'))
+            df_final['MonthsSinceLaunch'] = (df_final['Date'].dt.year - df_final['LaunchDate'].dt.year) * 12 + (df_final['Date'].dt.month - df_final['LaunchDate'].dt.month)
+            return df_final[df_final['MonthsSinceLaunch'] >= 0]
+        finally: wb.close()
 
 def _read_region_brand_impl(path):
-    with xw.App(visible=False) as app:
-        wb = app.books.open(path, read_only=True)
-        try:
-            ws = wb.sheets[config.REGION_BRAND_SHEET]
-            data_range = ws.range(config.REGION_BRAND_START).expand('table')
-            df = data_range.options(pd.DataFrame, header=1, index=False).value
-            df.columns = [str(c).strip() for c in df.columns]
-            for c in df.columns:
-                if "Sell Through" in c: df.rename(columns={c: "Sales"}, inplace=True); break
-            df["Sales"] = pd.to_numeric(df["Sales"], errors='coerce').fillna(0) * 1000000
-            if "Month" in df.columns:
-                df["Date_Obj"] = pd.to_datetime(df["Month"], format='%b %Y', errors='coerce')
-                df["Year"] = df["Date_Obj"].dt.year; df["Month"] = df["Date_Obj"].dt.month
-            return df
-        finally: wb.close()
-
-def _read_omdia_impl(path):
-    with xw.App(visible=False) as app:
-        wb = app.books.open(path, read_only=True)
-        try:
-            ws = wb.sheets[config.OMDIA_SHEET]
-            df = ws.range("A1").expand("table").options(pd.DataFrame, header=1, index=False).value
-            df.columns = [str(c).strip() for c in df.columns]
-            if 'Unit (Million)' not in df.columns and 'Unit (Thousand)' in df.columns:
-                df['Unit (Million)'] = pd.to_numeric(df['Unit (Thousand)'], errors='coerce') / 1000.0
-            
-            df['Brand'] = df['Vendor'].apply(normalize_brand)
-            df['Category'] = df.get('Form factor', 'Smartphone').apply(lambda x: 'Foldable' if 'foldable' in str(x).lower() else 'Smartphone')
-            col_unit = 'Unit (Million)' if 'Unit (Million)' in df.columns else 'Unit (Thousand)'
-            multiplier = 1000000 if 'Unit (Million)' in df.columns else 1000
-            df['Sales'] = pd.to_numeric(df[col_unit], errors='coerce').fillna(0) * multiplier
-            df['Year'] = pd.to_numeric(df['Year'], errors='coerce').fillna(0).astype(int)
-            df['Quarter'] = df['Quarter'].astype(str).str.extract(r'(\d)').astype(float).fillna(0).astype(int)
-            
-            launch_data = df[df['Sales'] > 0].groupby(['Brand', 'Model'])[['Year', 'Quarter']].min().reset_index()
-            launch_data.rename(columns={'Year': 'LaunchYear', 'Quarter': 'LaunchQuarter'}, inplace=True)
-            df_final = pd.merge(df, launch_data, on=['Brand', 'Model'], how='left')
-            df_final['QuartersSinceLaunch'] = (df_final['Year'] - df_final['LaunchYear']) * 4 + (df_final['Quarter'] - df_final['LaunchQuarter'])
-            return df_final[df_final['QuartersSinceLaunch'] >= 0]
-        finally: wb.close()
+    with _xw().App(visible=False) as app:
+        wb = app.books.open(path, read_only=True)
+        try:
+            df = SheetGrid.fetch(wb.sheets[config.REGION_BRAND_SHEET]).frame(*a1_to_rc(config.REGION_BRAND_START))
+            df.columns = [str(c).strip() for c in df.columns]
+            for c in df.columns:
+                if "Sell Through" in c: df.rename(columns={c: "Sales"}, inplace=True); break
+            df["Sales"] = pd.to_numeric(df["Sales"], errors='coerce').fillna(0) * 1000000
+            if "Month" in df.columns:
+                df["Date_Obj"] = pd.to_datetime(df["Month"], format='%b %Y', errors='coerce')
+                df["Year"] = df["Date_Obj"].dt.year; df["Month"] = df["Date_Obj"].dt.month
+            return df
+        finally: wb.close()
+
+def _normalize_omdia(df):
+    # 청크 단위 정규화: 단위 환산, 브랜드 매핑, 폼팩터 → Category, 분기 숫자화
+    df.columns = [str(c).strip() for c in df.columns]
+    if 'Unit (Million)' not in df.columns and 'Unit (Thousand)' in df.columns:
+        df['Unit (Million)'] = pd.to_numeric(df['Unit (Thousand)'], errors='coerce') / 1000.0
+    
+    df['Brand'] = df['Vendor'].apply(normalize_brand)
+    df['Category'] = df.get('Form factor', 'Smartphone').apply(lambda x: 'Foldable' if 'foldable' in str(x).lower() else 'Smartphone')
+    col_unit = 'Unit (Million)' if 'Unit (Million)' in df.columns else 'Unit (Thousand)'
+    multiplier = 1000000 if 'Unit (Million)' in df.columns else 1000
+    df['Sales'] = pd.to_numeric(df[col_unit], errors='coerce').fillna(0) * multiplier
+    df['Year'] = pd.to_numeric(df['Year'], errors='coerce').fillna(0).astype(int)
+    df['Quarter'] = df['Quarter'].astype(str).str.extract(r'(\d)', expand=False).astype(float).fillna(0).astype(int)
+    return df
+
+def _read_omdia_impl(path, where=None):
+    with _xw().App(visible=False) as app:
+        wb = app.books.open(path, read_only=True)
+        try:
+            df = SheetStream(wb.sheets[config.OMDIA_SHEET]).frame(config.OMDIA_COLUMNS, where, _normalize_omdia)
+            
+            # 출시 분기 = 판매량 > 0 인 첫 (연도, 분기). 연도/분기를 따로 min 하지 않도록 기간 코드로 계산
+            code = df['Year'] * 4 + (df['Quarter'] - 1)
+            launch = code.where(df['Sales'] > 0).groupby([df['Brand'], df['Model']]).transform('min')
+            df_final = df.assign(LaunchYear=launch // 4, LaunchQuarter=launch % 4 + 1)
+            df_final['QuartersSinceLaunch'] = code - launch
+            return df_final[df_final['QuartersSinceLaunch'] >= 0]
+        finally: wb.close()
+
+TI_MONTHS = {'January':1,'February':2,'March':3,'April':4,'May':5,'June':6,'July':7,'August':8,'September':9,'October':10,'November':11,'December':12}
+
+def _normalize_ti(df):
+    df.columns = [str(c).strip() for c in df.columns]
+    df['Sales'] = pd.to_numeric(df['Value (M)'], errors='coerce').fillna(0) * 1000000
+    df['Month'] = df['Month'].map(TI_MONTHS).fillna(0).astype(int)
+    df['Year'] = pd.to_numeric(df['Year'], errors='coerce').fillna(0).astype(int)
+    df['Brand'] = df['Vendor'].apply(normalize_brand)
+    return df
 
 def _read_ti_impl(source):
-    wb = None; app = None; close_after = False
-    try:
-        if isinstance(source, str):
-            app = xw.App(visible=False); wb = app.books.open(source, read_only=True); close_after = True
-        else: wb = source
-        ws = wb.sheets[config.TI_SHEET]
-        df = ws.range("A1").expand("table").options(pd.DataFrame, header=1, index=False).value
-        df.columns = [str(c).strip() for c in df.columns]
-        df['Sales'] = pd.to_numeric(df['Value (M)'], errors='coerce').fillna(0) * 1000000
-        month_map = {'January':1,'February':2,'March':3,'April':4,'May':5,'June':6,'July':7,'August':8,'September':9,'October':10,'November':11,'December':12}
-        df['Month'] = df['Month'].map(month_map).fillna(0).astype(int)
-        df['Year'] = pd.to_numeric(df['Year'], errors='coerce').fillna(0).astype(int)
-        df['Brand'] = df['Vendor'].apply(normalize_brand)
-        return df
-    finally:
-        if close_after and wb: wb.close()
-        if close_after and app: app.quit()
+    wb = None; app = None; close_after = False
+    try:
+        if isinstance(source, str):
+            app = _xw().App(visible=False); wb = app.books.open(source, read_only=True); close_after = True
+        else: wb = source
+        # YTD 집계에 쓰는 열만 청크 단위로 읽음
+        return SheetStream(wb.sheets[config.TI_SHEET]).frame(config.TI_COLUMNS, normalize=_normalize_ti)
+    finally:
+        if close_after and wb: wb.close()
+        if close_after and app: app.quit()
 
 def _read_generic_impl(source):
-    wb = None; app = None; close_after = False
-    try:
-        if isinstance(source, str):
-            app = xw.App(visible=False); wb = app.books.open(source, read_only=True); close_after = True
-        else: wb = source
-        ws = wb.sheets.active
-        df = ws.range("A1").expand("table").options(pd.DataFrame, header=1, index=False).value
-        return df
-    except Exception as e:
-        raise Exception(f"Excel Read Error: {e}")
-    finally:
-        if close_after and wb: wb.close()
-        if close_after and app: app.quit()
+    wb = None; app = None; close_after = False
+    try:
+        if isinstance(source, str):
+            app = _xw().App(visible=False); wb = app.books.open(source, read_only=True); close_after = True
+        else: wb = source
+        df = SheetGrid.fetch(wb.sheets.active).frame(1, 1)
+        return df
+    except Exception as e:
+        raise Exception(f"Excel Read Error: {e}")
+    finally:
+        if close_after and wb: wb.close()
+        if close_after and app: app.quit()
+
+def _normalize_ti_shipment(df):
+    df.columns = [str(c).strip() for c in df.columns]
+    df['Year'] = pd.to_numeric(df['Year'], errors='coerce').fillna(0).astype(int)
+    df['Model'] = df['Brand and Model Name'].astype(str).str.replace('Apple ', '').str.strip()
+    quarter = pd.to_numeric(df['Quarter'].astype(str).str.extract(r'(\d)')[0], errors='coerce')
+    df['Period'] = period_code(df['Year'], quarter, "Quarter")
+    df = df.dropna(subset=['Period']).astype({'Period': int})
+    df['Value'] = pd.to_numeric(df['Metric Value'], errors='coerce').fillna(0)
+    df['Firm'] = 'TI'
+    return df[['Model', 'Period', 'Value', 'Firm']]
 
 def _read_ti_shipment_impl(source):
-    wb = None; app = None; close_after = False
-    try:
-        if isinstance(source, str): app = xw.App(visible=False); wb = app.books.open(source, read_only=True); close_after = True
-        else: wb = source
-        ws = wb.sheets[config.TI_SHIPMENT_SHEET]
-        df = ws.range("A1").expand("table").options(pd.DataFrame, header=1, index=False).value
-        df.columns = [str(c).strip() for c in df.columns]
-        if 'Metric Name' in df.columns:
-            df = df[df['Metric Name'].astype(str).str.lower() == 'shipments']
-        df = df[df['Brand'] == 'Apple']
-        df['Year'] = pd.to_numeric(df['Year'], errors='coerce').fillna(0).astype(int)
-        df = df[df['Year'] >= 2020]
-        df['Model'] = df['Brand and Model Name'].astype(str).str.replace('Apple ', '').str.strip()
-        df['Date'] = df['Year'].astype(str) + " Q" + df['Quarter'].astype(str)
-        df['Value'] = pd.to_numeric(df['Metric Value'], errors='coerce').fillna(0)
-        df['Firm'] = 'TI'
-        return df[['Model', 'Date', 'Value', 'Firm']]
-    except Exception as e: raise Exception(f"TI Shipment Read Error: {e}")
-    finally:
-        if close_after and wb: wb.close()
-        if close_after and app: app.quit()
+    wb = None; app = None; close_after = False
+    try:
+        if isinstance(source, str): app = _xw().App(visible=False); wb = app.books.open(source, read_only=True); close_after = True
+        else: wb = source
+        # Apple 2020년 이후 출하량 행과 필요한 열만 청크 단위로 읽음
+        return SheetStream(wb.sheets[config.TI_SHIPMENT_SHEET]).frame(config.TI_SHIPMENT_COLUMNS, {"Metric Name": ("ieq", "shipments"), "Brand": "Apple", "Year": ("ge", 2020)}, _normalize_ti_shipment)
+    except Exception as e: raise Exception(f"TI Shipment Read Error: {e}")
+    finally:
+        if close_after and wb: wb.close()
+        if close_after and app: app.quit()
 
 def _read_gfk_impl(source):
-    wb = None; app = None; close_after = False
-    try:
-        if isinstance(source, str): app = xw.App(visible=False); wb = app.books.open(source, read_only=True); close_after = True
-        else: wb = source
-        ws = wb.sheets[config.GFK_SHEET]
-        years_row = ws.range((2, 1)).expand('right').value
-        quarters_row = ws.range((3, 1)).expand('right').value
-        col_map = {}
-        current_year = None
-        for i, y in enumerate(years_row):
-            if y is not None: current_year = str(int(y)) if isinstance(y, (int, float)) else str(y).strip()
-            if "Total" in str(current_year) or "Total" in str(y): continue
-            q_raw = quarters_row[i]
-            if q_raw and "Q" in str(q_raw):
-                q_num = str(q_raw).replace("Q", "").strip()
-                date_str = f"{current_year} Q{q_num}"
-                try:
-                    if int(current_year) >= 2020: col_map[i] = date_str
-                except: pass
-        data_start_row = 4
-        last_row = ws.range(f'B{ws.cells.last_cell.row}').end('up').row
-        models = ws.range((data_start_row, 2), (last_row, 2)).value
-        valid_indices = sorted(col_map.keys())
-        if not valid_indices: return pd.DataFrame()
-        min_col = min(valid_indices); max_col = max(valid_indices)
-        val_block = ws.range((data_start_row, min_col+1), (last_row, max_col+1)).value
-        records = []
-        for r_idx, model_name in enumerate(models):
-            if not model_name: continue
-            m_str = str(model_name).strip()
-            if "iPhone" not in m_str: continue 
-            row_vals = val_block[r_idx]
-            for c_idx in valid_indices:
-                offset = c_idx - min_col
-                if offset < len(row_vals):
-                    val = row_vals[offset]
-                    date = col_map[c_idx]
-                    try: v_float = float(val)
-                    except: v_float = 0.0
-                    records.append({"Model": m_str, "Date": date, "Value": v_float, "Firm": "GfK"})
-        return pd.DataFrame(records)
-    except Exception as e: raise Exception(f"GfK Read Error: {e}")
-    finally:
-        if close_after and wb: wb.close()
-        if close_after and app: app.quit()
+    wb = None; app = None; close_after = False
+    try:
+        if isinstance(source, str): app = _xw().App(visible=False); wb = app.books.open(source, read_only=True); close_after = True
+        else: wb = source
+        grid = SheetGrid.fetch(wb.sheets[config.GFK_SHEET])
+        # 연도 행은 병합 셀로 중간이 비어 있으므로 분기 행의 범위까지 함께 읽음
+        width = max(grid.end_right(2, 1), grid.end_right(3, 1))
+        years_row = grid.row(2, 1, width)
+        quarters_row = grid.row(3, 1, width)
+        col_map = {}
+        current_year = None
+        for i, y in enumerate(years_row):
+            if y is not None: current_year = str(int(y)) if isinstance(y, (int, float)) else str(y).strip()
+            if "Total" in str(current_year) or "Total" in str(y): continue
+            q_raw = quarters_row[i]
+            if q_raw and "Q" in str(q_raw):
+                q_num = str(q_raw).replace("Q", "").strip()
+                try:
+                    if int(current_year) >= 2020: col_map[i] = period_code(int(current_year), int(q_num), "Quarter")
+                except: pass
+        data_start_row = 4
+        last_row = grid.last_row(2)
+        models = grid.col(2, data_start_row, last_row)
+        valid_indices = sorted(col_map.keys())
+        if not valid_indices: return pd.DataFrame()
+        min_col = min(valid_indices); max_col = max(valid_indices)
+        val_block = grid.block(data_start_row, min_col+1, last_row, max_col+1)
+        records = []
+        for r_idx, model_name in enumerate(models):
+            if not model_name: continue
+            m_str = str(model_name).strip()
+            if "iPhone" not in m_str: continue 
+            row_vals = val_block[r_idx]
+            for c_idx in valid_indices:
+                offset = c_idx - min_col
+                if offset < len(row_vals):
+                    val = row_vals[offset]
+                    period = col_map[c_idx]
+                    try: v_float = float(val)
+                    except: v_float = 0.0
+                    records.append({"Model": m_str, "Period": period, "Value": v_float, "Firm": "GfK"})
+        return pd.DataFrame(records)
+    except Exception as e: raise Exception(f"GfK Read Error: {e}")
+    finally:
+        if close_after and wb: wb.close()
+        if close_after and app: app.quit()
+
+def _read_sellin_sheet(wb, sheet_name):
+    print(f"[DEBUG] Target Sheet: '{sheet_name}'")
+    try:
+        ws = wb.sheets[sheet_name]
+        print(f"[DEBUG] -> Sheet '{sheet_name}' Found.")
+        grid = SheetGrid.fetch(ws)
+    except:
+        print(f"[DEBUG] -> Sheet '{sheet_name}' NOT found. Skipping.")
+        return None
+
+    region_name = config.SELLIN_SHEET_MAP.get(sheet_name, sheet_name)
+
+    # 1. Read Vendors
+    print(f"[DEBUG] -> Reading Vendors from Column {config.SELLIN_VENDOR_COL}, starting Row {config.SELLIN_START_ROW}...")
+    vendor_range_vals = grid.col(col_index(config.SELLIN_VENDOR_COL), config.SELLIN_START_ROW, 500)
+    
+    valid_vendors = []
+    row_count = 0
+    
+    for v in vendor_range_vals:
+        if v is None:
+            valid_vendors.append(None) 
+            row_count += 1
+            continue
+        v_str = str(v).strip()
+        if v_str.lower() == "total market":
+            print(f"[DEBUG] -> Found 'Total Market' at relative row {row_count}. Stopping vendor read.")
+            break
+        valid_vendors.append(v_str)
+        row_count += 1
+    
+    clean_vendors = [v for v in valid_vendors if v is not None]
+    print(f"[DEBUG] -> Recognized {len(clean_vendors)} Vendors: {clean_vendors[:5]} ...")
+    
+    if not clean_vendors: 
+        print("[DEBUG] -> No valid vendors found. Skipping.")
+        return None
+
+    # 2. Read Date Headers
+    print(f"[DEBUG] -> Reading Dates from Row {config.SELLIN_DATE_ROW}...")
+    date_vals = grid.row(config.SELLIN_DATE_ROW, 3, 200)
+    
+    valid_dates = []
+    for d in date_vals:
+        if d is None: break 
+        valid_dates.append(d)
+    
+    col_count = len(valid_dates)
+    print(f"[DEBUG] -> Found {col_count} Date Columns.")
+
+    if col_count == 0:
+        print("[DEBUG] -> No date columns found. Skipping.")
+        return None
+
+    # 3. Read Data Values
+    start_row = config.SELLIN_START_ROW
+    end_row = start_row + row_count - 1
+    start_col = 3
+    end_col = start_col + col_count - 1
+    
+    print(f"[DEBUG] -> Reading Data Block: Rows {start_row}~{end_row}, Cols {start_col}~{end_col}")
+    values = grid.block(start_row, start_col, end_row, end_col)
+    
+    # 4. Construct Data
+    temp_data = []
+    for i, vendor in enumerate(valid_vendors):
+        if vendor is None: continue 
+        if i < len(values):
+            row_data = values[i]
+            if len(row_data) < col_count:
+                row_data += [None] * (col_count - len(row_data))
+            elif len(row_data) > col_count:
+                row_data = row_data[:col_count]
+                
+            record = {"Brand": vendor}
+            for j, date_val in enumerate(valid_dates):
+                record[date_val] = row_data[j]
+            temp_data.append(record)
+    
+    if not temp_data: return None
+
+    df = pd.DataFrame(temp_data)
+    
+    # Melt
+    df_melt = df.melt(id_vars=["Brand"], var_name="Date", value_name="Sales")
+    
+    # Conversions
+    df_melt["Date_Obj"] = pd.to_datetime(df_melt["Date"], errors='coerce')
+    df_melt = df_melt.dropna(subset=["Date_Obj"])
+    
+    df_melt["Year"] = df_melt["Date_Obj"].dt.year
+    df_melt["Month"] = df_melt["Date_Obj"].dt.month
+    
+    # [FIXED] Add Region Column
+    df_melt["Region"] = region_name
+    
+    # [MODIFIED] Multiply by 1M to store as Units, so display logic (which divides by 1M) works correct
+    df_melt["Sales"] = pd.to_numeric(df_melt["Sales"], errors='coerce').fillna(0) * 1000000
+    
+    print(f"[DEBUG] -> Sheet '{sheet_name}' Processed. {len(df_melt)} rows created.")
+    return df_melt
 
 def _read_sellin_new_impl(path):
-    print(f"\n[DEBUG] === Starting Sell-in Read from: {os.path.basename(path)} ===")
-    data_list = []
-    app = xw.App(visible=False)
-    try:
-        wb = app.books.open(path, read_only=True)
-        
-        for sheet_name in config.SELLIN_SHEETS:
-            print(f"[DEBUG] Target Sheet: '{sheet_name}'")
-            try:
-                ws = wb.sheets[sheet_name]
-                print(f"[DEBUG] -> Sheet '{sheet_name}' Found.")
-            except:
-                print(f"[DEBUG] -> Sheet '{sheet_name}' NOT found. Skipping.")
-                continue
-
-            region_name = config.SELLIN_SHEET_MAP.get(sheet_name, sheet_name)
-
-            # 1. Read Vendors
-            print(f"[DEBUG] -> Reading Vendors from Column {config.SELLIN_VENDOR_COL}, starting Row {config.SELLIN_START_ROW}...")
-            vendor_range_vals = ws.range(f"{config.SELLIN_VENDOR_COL}{config.SELLIN_START_ROW}:{config.SELLIN_VENDOR_COL}500").value
-            
-            valid_vendors = []
-            row_count = 0
-            
-            for v in vendor_range_vals:
-                if v is None:
-                    valid_vendors.append(None) 
-                    row_count += 1
-                    continue
-                v_str = str(v).strip()
-                if v_str.lower() == "total market":
-                    print(f"[DEBUG] -> Found 'Total Market' at relative row {row_count}. Stopping vendor read.")
-                    break
-                valid_vendors.append(v_str)
-                row_count += 1
-            
-            clean_vendors = [v for v in valid_vendors if v is not None]
-            print(f"[DEBUG] -> Recognized {len(clean_vendors)} Vendors: {clean_vendors[:5]} ...")
-            
-            if not clean_vendors: 
-                print("[DEBUG] -> No valid vendors found. Skipping.")
-                continue
-
-            # 2. Read Date Headers
-            print(f"[DEBUG] -> Reading Dates from Row {config.SELLIN_DATE_ROW}...")
-            date_vals = ws.range((config.SELLIN_DATE_ROW, 3), (config.SELLIN_DATE_ROW, 200)).value
-            
-            valid_dates = []
-            for d in date_vals:
-                if d is None: break 
-                valid_dates.append(d)
-            
-            col_count = len(valid_dates)
-            print(f"[DEBUG] -> Found {col_count} Date Columns.")
-
-            if col_count == 0:
-                print("[DEBUG] -> No date columns found. Skipping.")
-                continue
-
-            # 3. Read Data Values
-            start_row = config.SELLIN_START_ROW
-            end_row = start_row + row_count - 1
-            start_col = 3
-            end_col = start_col + col_count - 1
-            
-            print(f"[DEBUG] -> Reading Data Block: Rows {start_row}~{end_row}, Cols {start_col}~{end_col}")
-            values = ws.range((start_row, start_col), (end_row, end_col)).value
-            if row_count == 1: values = [values]
-            
-            # 4. Construct Data
-            temp_data = []
-            for i, vendor in enumerate(valid_vendors):
-                if vendor is None: continue 
-                if i < len(values):
-                    row_data = values[i]
-                    if len(row_data) < col_count:
-                        row_data += [None] * (col_count - len(row_data))
-                    elif len(row_data) > col_count:
-                        row_data = row_data[:col_count]
-                        
-                    record = {"Brand": vendor}
-                    for j, date_val in enumerate(valid_dates):
-                        record[date_val] = row_data[j]
-                    temp_data.append(record)
-            
-            if not temp_data: continue
-
-            df = pd.DataFrame(temp_data)
-            
-            # Melt
-            df_melt = df.melt(id_vars=["Brand"], var_name="Date", value_name="Sales")
-            
-            # Conversions
-            df_melt["Date_Obj"] = pd.to_datetime(df_melt["Date"], errors='coerce')
-            df_melt = df_melt.dropna(subset=["Date_Obj"])
-            
-            df_melt["Year"] = df_melt["Date_Obj"].dt.year
-            df_melt["Month"] = df_melt["Date_Obj"].dt.month
-            
-            # [FIXED] Add Region Column
-            df_melt["Region"] = region_name
-            
-            # [MODIFIED] Multiply by 1M to store as Units, so display logic (which divides by 1M) works correct
-            df_melt["Sales"] = pd.to_numeric(df_melt["Sales"], errors='coerce').fillna(0) * 1000000
-            
-            print(f"[DEBUG] -> Sheet '{sheet_name}' Processed. {len(df_melt)} rows created.")
-            data_list.append(df_melt)
-            
-    except Exception as e:
-        import traceback
-        print(f"[ERROR] Exception in _read_sellin_impl:\n{traceback.format_exc()}")
-        raise Exception(f"Sell-in Read Error: {e}")
-    finally:
-        try: wb.close()
-        except: pass
-        app.quit()
-        
-    if data_list:
-        final_df = pd.concat(data_list, ignore_index=True)
-        print(f"[DEBUG] === Sell-in Read Complete. Total Rows: {len(final_df)} ===\n")
-        return final_df
-    else:
-        print("[DEBUG] === Sell-in Read Failed: No data collected ===\n")
-        return pd.DataFrame()
-
-
-# --- Threads ---
-class CompareThread(QThread):
-    result = pyqtSignal(pd.DataFrame, list, dict); error = pyqtSignal(str); progress = pyqtSignal(int)
-    def __init__(self, o, n): super().__init__(); self.o=o; self.n=n
-    def run(self):
-        try:
-            self.progress.emit(10); nd = load_or_cache(self.n, "weekly", _read_weekly_impl, lambda x: self.progress.emit(10+int(x*0.4)))
-            od = None
-            if self.o: self.progress.emit(50); od = load_or_cache(self.o, "weekly", _read_weekly_impl, lambda x: self.progress.emit(50+int(x*0.4)))
-            self.progress.emit(90); rows=[]; sumy=[]
-            if od:
-                for s in config.WEEKLY_SHEETS:
-                    if s in od and s in nd:
-                        r=config.WEEKLY_MAP[s]; o_df=ensure_year(od[s]); n_df=ensure_year(nd[s])
-                        k=["Brand","Model","Month","Week"]; o_df["Sales"]=pd.to_numeric(o_df["Sales"], errors="coerce"); n_df["Sales"]=pd.to_numeric(n_df["Sales"], errors="coerce")
-                        if s=="Basefile_Europe": k=["Region"]+k
-                        elif "Region" in o_df.columns: o_df=o_df.drop(columns=["Region"]); n_df=n_df.drop(columns=["Region"])
-                        rem, chg = compare_df(o_df, n_df, k, "Sales")
-                        for _,x in rem.iterrows(): rows.append({"Sheet":s,"Brand":x.get("Brand",""),"Model":x.get("Model",""),"Region":r,"Type":"Deleted","Sales_old":x.get("Sales_old",""),"Sales_new":""})
-                        for _,x in chg.iterrows(): rows.append({"Sheet":s,"Brand":x.get("Brand",""),"Model":x.get("Model",""),"Region":r,"Type":"Changed","Sales_old":x.get("Sales_old",""),"Sales_new":x.get("Sales_new","")})
-                        d=monthly_delta(o_df, n_df, r); 
-                        if d: sumy.append(d)
-            self.progress.emit(100); self.result.emit(pd.DataFrame(rows), sumy, nd)
-        except Exception as e: self.error.emit(str(e))
-
-class MonthlyCompareThread(QThread):
-    result = pyqtSignal(pd.DataFrame, list, dict); error = pyqtSignal(str); progress = pyqtSignal(int)
-    def __init__(self, o, n): super().__init__(); self.o=o; self.n=n
-    def run(self):
-        try:
-            self.progress.emit(10); nd = load_or_cache(self.n, "monthly", _read_monthly_impl, lambda x: self.progress.emit(10+int(x*0.4)))
-            od = None
-            if self.o: self.progress.emit(50); od = load_or_cache(self.o, "monthly", _read_monthly_impl, lambda x: self.progress.emit(50+int(x*0.4)))
-            self.progress.emit(90); rows=[]; sumy=[]
-            if od:
-                for s in config.MONTHLY_SHEETS:
-                    if s in od and s in nd:
-                        r=s; o_df=ensure_year(od[s]); n_df=ensure_year(nd[s]); k=["Brand","Month","Year","Region"]
-                        o_df["Sales"]=pd.to_numeric(o_df["Sales"], errors="coerce"); n_df["Sales"]=pd.to_numeric(n_df["Sales"], errors="coerce")
-                        rem, chg = compare_df(o_df, n_df, k, "Sales")
-                        for _,x in rem.iterrows(): rows.append({"Sheet":s,"Brand":x.get("Brand",""),"Model":"","Region":r,"Type":"Deleted","Sales_old":x.get("Sales_old",""),"Sales_new":""})
-                        for _,x in chg.iterrows(): rows.append({"Sheet":s,"Brand":x.get("Brand",""),"Model":"","Region":r,"Type":"Changed","Sales_old":x.get("Sales_old",""),"Sales_new":x.get("Sales_new","")})
-                        d=monthly_delta(o_df, n_df, r); 
-                        if d: sumy.append(d)
-            self.progress.emit(100); self.result.emit(pd.DataFrame(rows), sumy, nd)
-        except Exception as e: self.error.emit(str(e))
-
-class FlagshipThread(QThread):
-    result = pyqtSignal(pd.DataFrame); error = pyqtSignal(str); progress = pyqtSignal(int)
-    def __init__(self, p): super().__init__(); self.path=p
-    def run(self):
-        try: self.progress.emit(10); data = load_or_cache(self.path, "flagship", _read_flagship_impl, lambda x: self.progress.emit(x)); self.progress.emit(100); self.result.emit(data)
-        except Exception as e: self.error.emit(str(e))
-
-class RegionBrandThread(QThread):
-    result = pyqtSignal(dict); error = pyqtSignal(str); progress = pyqtSignal(int)
-    def __init__(self, p): super().__init__(); self.path=p
-    def run(self):
-        try: self.progress.emit(10); df = load_or_cache(self.path, "region", _read_region_brand_impl, lambda x: self.progress.emit(x)); self.progress.emit(100); self.result.emit({'AllData': df})
-        except Exception as e: self.error.emit(str(e))
-
-class OmdiaThread(QThread):
-    result = pyqtSignal(pd.DataFrame); error = pyqtSignal(str); progress = pyqtSignal(int)
-    def __init__(self, p): super().__init__(); self.path=p
-    def run(self):
-        try: self.progress.emit(10); df = load_or_cache(self.path, "omdia", _read_omdia_impl, lambda x: self.progress.emit(x)); self.progress.emit(100); self.result.emit(df)
-        except Exception as e: self.error.emit(str(e))
-
-class TIThread(QThread):
-    result = pyqtSignal(pd.DataFrame); error = pyqtSignal(str); progress = pyqtSignal(int)
-    def __init__(self, source): super().__init__(); self.source = source 
-    def run(self):
-        try: self.progress.emit(10); df = load_or_cache(self.source, "ti", _read_ti_impl, lambda x: self.progress.emit(x)); self.progress.emit(100); self.result.emit(df)
-        except Exception as e: self.error.emit(str(e))
-
-class GenericThread(QThread):
-    result = pyqtSignal(pd.DataFrame); error = pyqtSignal(str); progress = pyqtSignal(int)
-    def __init__(self, source): super().__init__(); self.source = source 
-    def run(self):
-        try: self.progress.emit(10); df = load_or_cache(self.source, "generic", _read_generic_impl, lambda x: self.progress.emit(x)); self.progress.emit(100); self.result.emit(df)
-        except Exception as e: self.error.emit(str(e))
-
-class ByModelLoader(QThread):
-    result = pyqtSignal(pd.DataFrame, str); error = pyqtSignal(str) 
-    def __init__(self, path, firm):
-        super().__init__()
-        self.path = path
-        self.firm = firm
-        
-    def run(self):
-        try:
-            df = pd.DataFrame()
-            if self.firm == 'Omdia':
-                raw_df = load_or_cache(self.path, "omdia", _read_omdia_impl)
-                raw_df = raw_df[(raw_df['Brand'] == 'Apple') & (raw_df['Year'] >= 2020)]
-                raw_df['Value'] = raw_df['Sales'] / 1000000.0
-                raw_df['Date'] = raw_df['Year'].astype(str) + " Q" + raw_df['Quarter'].astype(str)
-                raw_df['Firm'] = 'Omdia'
-                df = raw_df[['Model', 'Date', 'Value', 'Firm']]
-                
-            elif self.firm == 'TI':
-                df = _read_ti_shipment_impl(self.path)
-                
-            elif self.firm == 'GfK':
-                df = _read_gfk_impl(self.path)
-            
-            self.result.emit(df, self.firm)
-            
-        except Exception as e:
-            self.error.emit(f"{self.firm} Load Error: {str(e)}")
-
-# [NEW] Sell In Thread
-class SellInThread(QThread):
-    result = pyqtSignal(pd.DataFrame); error = pyqtSignal(str); progress = pyqtSignal(int)
-    def __init__(self, path): super().__init__(); self.path = path
-    def run(self):
-        try: 
-            self.progress.emit(10)
-            # [수정됨] 캐시 키를 "sellin_final_v1"으로 변경하여 강제 리로드 유도
-            df = load_or_cache(self.path, "sellin_final_v1", _read_sellin_new_impl, lambda x: self.progress.emit(x))
-            self.progress.emit(100)
-            self.result.emit(df)
-        except Exception as e: self.error.emit(str(e))
-
-class WeeklySimpleThread(QThread):
-    result = pyqtSignal(dict); error = pyqtSignal(str); progress = pyqtSignal(int)
-    def __init__(self, path): super().__init__(); self.path = path
-    def run(self):
-        try:
-            self.progress.emit(10)
-            # 기존 _read_weekly_impl 함수 재사용 (Weekly 탭과 동일한 로직으로 읽음)
-            # 캐시 키는 'weekly_simple'로 지정하여 충돌 방지
-            data = load_or_cache(self.path, "weekly_simple", _read_weekly_impl, lambda x: self.progress.emit(x))
-            self.progress.emit(100)
-            self.result.emit(data)
-        except Exception as e: self.error.emit(str(e))
+    print(f"\n[DEBUG] === Starting Sell-in Read from: {os.path.basename(path)} ===")
+    try:
+        data_list = list(read_sheets(path, config.SELLIN_SHEETS, _read_sellin_sheet).values())
+    except Exception as e:
+        import traceback
+        print(f"[ERROR] Exception in _read_sellin_impl:\n{traceback.format_exc()}")
+        raise Exception(f"Sell-in Read Error: {e}")
+        
+    if data_list:
+        final_df = pd.concat(data_list, ignore_index=True)
+        print(f"[DEBUG] === Sell-in Read Complete. Total Rows: {len(final_df)} ===\n")
+        return final_df
+    else:
+        print("[DEBUG] === Sell-in Read Failed: No data collected ===\n")
+        return pd.DataFrame()
+
+
+# --- Incremental Reload ---
+# 캐시 키 → (리더가 읽는 시트의 config 이름, 시트 단위 리더). 시트 단위 리더가 있으면 바뀐 시트만 다시 읽어 이전 결과에 합치고,
+# None이면 의존 시트가 바뀌었을 때 전체를 다시 읽음. 의존 시트가 하나도 안 바뀌었으면 (다른 시트만 저장된 경우) 이전 결과를 그대로 씀
+SHEET_SOURCES = {
+    "weekly": ("WEEKLY_SHEETS", _read_weekly_sheet), "weekly_simple": ("WEEKLY_SHEETS", _read_weekly_sheet),
+    "monthly": ("MONTHLY_SHEETS", _read_monthly_sheet), "flagship": ("FLAGSHIP_SHEET", None),
+    "region": ("REGION_BRAND_SHEET", None), "omdia": ("OMDIA_SHEET", None), "ti": ("TI_SHEET", None),
+    "sellin_final_v1": ("SELLIN_SHEETS", None),
+}
+
+def sheet_hashes(path):
+    # xlsx(zip) 안 시트 XML의 해시 {시트 이름: sha1}. 저장 때 내용이 바뀐 시트만 해시가 달라짐 (xls/xlsb 등 XML 패키지가 아니면 None)
+    tag = lambda e: e.tag.rsplit('}', 1)[-1]
+    try:
+        with zipfile.ZipFile(path) as z:
+            rels = {r.get("Id"): r.get("Target") for r in ET.fromstring(z.read("xl/_rels/workbook.xml.rels"))}
+            out = {}
+            for sh in ET.fromstring(z.read("xl/workbook.xml")).iter():
+                if tag(sh) != "sheet": continue
+                target = rels[next(v for k, v in sh.attrib.items() if k.endswith("}id"))]
+                h = hashlib.sha1()
+                with z.open(target.lstrip("/") if target.startswith("/") else f"xl/{target}") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""): h.update(chunk)
+                out[sh.get("name")] = h.hexdigest()
+            return out
+    except (zipfile.BadZipFile, KeyError, StopIteration, ET.ParseError, OSError): return None
+
+def reload_changed(path, cache_key, hashes):
+    # 같은 경로의 이전 캐시 + 시트 해시로 증분 갱신. 이전 캐시가 없거나 시트 단위로 합칠 수 없으면 None (→ 전체 읽기)
+    prefix = f"cache_{cache_key}_{os.path.basename(path)}_"
+    for f in os.listdir(config.CACHE_DIR):
+        if not (f.startswith(prefix) and f.endswith(".pkl")): continue
+        try:
+            with open(os.path.join(config.CACHE_DIR, f[:-4] + ".sheets"), encoding='utf-8') as fh: prev = json.load(fh)
+            if prev["path"] != os.path.abspath(path): continue
+            with open(os.path.join(config.CACHE_DIR, f), 'rb') as fh: data = pickle.load(fh)
+        except Exception: continue
+        name, reader = SHEET_SOURCES[cache_key]; sheets = getattr(config, name); sheets = [sheets] if isinstance(sheets, str) else list(sheets)
+        changed = [s for s in sheets if hashes.get(s) != prev["sheets"].get(s)]
+        if not changed: log.debug("No dependent sheet changed for %s, reusing cache", cache_key); return data
+        if reader is None or not isinstance(data, dict): return None
+        log.debug("Re-reading changed sheets for %s: %s", cache_key, changed)
+        fresh = read_sheets(path, changed, reader)
+        merged = {s: (fresh if s in changed else data).get(s) for s in sheets}
+        return {s: d for s, d in merged.items() if d is not None}
+    return None
+
+# --- Job Tasks ---
+# 페이지는 jobs.scheduler().submit(...)으로 아래 작업을 실행 (QThread 서브클래스 대신, 진행률은 progress.report로 보고)
+# 로드 작업은 resource="excel", 비교/집계 작업은 resource="cpu"로 제출
+def load_task(source, cache_key, read_func):
+    # 파일 경로 소스는 격리 프로세스에서 읽고 공유 메모리로 결과를 받음 (열린 워크북 객체는 프로세스 간 전달 불가 → 현재 스레드)
+    if config.ISOLATED_READERS and isinstance(source, str): return isolation.run_isolated(load_or_cache, source, cache_key, read_func, progress.report)
+    return load_or_cache(source, cache_key, read_func, progress.report)
+
+def compare_weekly(nd, od=None):
+    # 두 로드 작업(after=[new, old])의 결과를 받아 변경/삭제 행과 월별 증감 요약 생성
+    rows=[]; sumy=[]
+    if od:
+        for s in config.WEEKLY_SHEETS:
+            if s in od and s in nd:
+                # 얕은 복사본에서 정규화 → 같은 로드 결과를 여러 비교 작업(연속 버전 diff)이 동시에 공유해도 안전
+                r=config.WEEKLY_MAP[s]; o_df=ensure_year(od[s].copy(deep=False)); n_df=ensure_year(nd[s].copy(deep=False))
+                k=["Brand","Model","Month","Week"]; o_df["Sales"]=pd.to_numeric(o_df["Sales"], errors="coerce"); n_df["Sales"]=pd.to_numeric(n_df["Sales"], errors="coerce")
+                if s=="Basefile_Europe": k=["Region"]+k
+                elif "Region" in o_df.columns: o_df=o_df.drop(columns=["Region"]); n_df=n_df.drop(columns=["Region"])
+                rem, chg = compare_df(o_df, n_df, k, "Sales")
+                for _,x in rem.iterrows(): rows.append({"Sheet":s,"Brand":x.get("Brand",""),"Model":x.get("Model",""),"Region":r,"Type":"Deleted","Sales_old":x.get("Sales_old",""),"Sales_new":""})
+                for _,x in chg.iterrows(): rows.append({"Sheet":s,"Brand":x.get("Brand",""),"Model":x.get("Model",""),"Region":r,"Type":"Changed","Sales_old":x.get("Sales_old",""),"Sales_new":x.get("Sales_new","")})
+                d=monthly_delta(o_df, n_df, r); 
+                if d: sumy.append(d)
+    return pd.DataFrame(rows), sumy, index_sheets(nd)
+
+def compare_monthly(nd, od=None):
+    rows=[]; sumy=[]
+    if od:
+        for s in config.MONTHLY_SHEETS:
+            if s in od and s in nd:
+                r=s; o_df=ensure_year(od[s].copy(deep=False)); n_df=ensure_year(nd[s].copy(deep=False)); k=["Brand","Month","Year","Region"]
+                o_df["Sales"]=pd.to_numeric(o_df["Sales"], errors="coerce"); n_df["Sales"]=pd.to_numeric(n_df["Sales"], errors="coerce")
+                rem, chg = compare_df(o_df, n_df, k, "Sales")
+                for _,x in rem.iterrows(): rows.append({"Sheet":s,"Brand":x.get("Brand",""),"Model":"","Region":r,"Type":"Deleted","Sales_old":x.get("Sales_old",""),"Sales_new":""})
+                for _,x in chg.iterrows(): rows.append({"Sheet":s,"Brand":x.get("Brand",""),"Model":"","Region":r,"Type":"Changed","Sales_old":x.get("Sales_old",""),"Sales_new":x.get("Sales_new","")})
+                d=monthly_delta(o_df, n_df, r); 
+                if d: sumy.append(d)
+    return pd.DataFrame(rows), sumy, nd
+
+def revision_row(old, new, df, sumy):
+    # 연속 버전 한 쌍의 diff → 리비전 타임라인 한 행 (변경/삭제 건수, 순증감, 지역별 최신 월 증감)
+    row = {"From": os.path.basename(old), "To": os.path.basename(new), "Changed": 0, "Deleted": 0, "Net Δ": 0}
+    if not df.empty:
+        chg = df[df["Type"] == "Changed"]; rem = df[df["Type"] == "Deleted"]; num = lambda s: pd.to_numeric(s, errors="coerce").fillna(0)
+        row.update({"Changed": len(chg), "Deleted": len(rem), "Net Δ": int((num(chg["Sales_new"]) - num(chg["Sales_old"])).sum() - num(rem["Sales_old"]).sum())})
+    for d in sumy: row[f"{d['Region']} Δ"] = d["Latest Δ"]
+    return row
+
+def revision_timeline(paths, *diffs):
+    # paths: 버전 순 파일, diffs: 연속 쌍(paths[i] → paths[i+1])의 compare_weekly 결과 (스케줄러 after 순서대로 전달)
+    return pd.DataFrame([revision_row(o, n, r[0], r[1]) for o, n, r in zip(paths, paths[1:], diffs)]).fillna("")
+
+def load_flagship(path): data = load_task(path, "flagship", _read_flagship_impl); cohorts_for(data, "Month"); indexed_for(data); return data
+def load_region_brand(path): return {'AllData': load_task(path, "region", _read_region_brand_impl)}
+def load_omdia(path): df = load_task(path, "omdia", _read_omdia_impl); cohorts_for(df, "Quarter"); indexed_for(df); return df
+def load_ti(source): return load_task(source, "ti", _read_ti_impl)
+def load_generic(source): return load_task(source, "generic", _read_generic_impl)
+
+def load_bymodel(path, firm):
+    try:
+        df = pd.DataFrame()
+        if firm == 'Omdia':
+            # Apple 2020년 이후 행만 읽어 별도 캐시 (전체 Omdia 캐시와 분리)
+            raw_df = load_task(path, "omdia_apple2020", functools.partial(_read_omdia_impl, where={"Vendor": ("brand", "Apple"), "Year": ("ge", 2020)}))
+            raw_df['Value'] = raw_df['Sales'] / 1000000.0
+            raw_df['Period'] = period_code(raw_df['Year'], raw_df['Quarter'], "Quarter")
+            raw_df['Firm'] = 'Omdia'
+            df = raw_df[['Model', 'Period', 'Value', 'Firm']]
+            
+        elif firm == 'TI':
+            df = _read_ti_shipment_impl(path)
+            
+        elif firm == 'GfK':
+            df = _read_gfk_impl(path)
+        
+        return df, firm
+        
+    except Exception as e:
+        raise Exception(f"{firm} Load Error: {str(e)}")
+
+# [NEW] Sell In
+# [수정됨] 캐시 키를 "sellin_final_v1"으로 변경하여 강제 리로드 유도
+def load_sellin(path): return load_task(path, "sellin_final_v1", _read_sellin_new_impl)
+
+def load_weekly_simple(path):
+    # 기존 _read_weekly_impl 함수 재사용 (Weekly 탭과 동일한 로직으로 읽음)
+    # 캐시 키는 'weekly_simple'로 지정하여 충돌 방지
+    return index_sheets(load_task(path, "weekly_simple", _read_weekly_impl))
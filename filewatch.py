@@ -0,0 +1,81 @@
+import os
+import fnmatch
+import zipfile
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer
+import config
+
+# --- Source File Watching ---
+# 페이지가 읽은 원본 파일과 (선택) 공유 드롭 폴더를 감시하고, 쓰기가 끝난 뒤에 한 번만 콜백 호출
+# 변경 알림 → 대기 목록 → 타이머마다 크기/수정 시각 비교, 한 간격 동안 그대로이고 (xlsx면) zip이 완결되어 있으면 완료로 판단
+# 엑셀은 임시 파일에 쓴 뒤 이름을 바꿔 저장하므로 감시 경로가 빠짐 → 완료 시 다시 등록
+def _stat(path):
+    try: st = os.stat(path); return (st.st_size, st.st_mtime)
+    except OSError: return None
+
+def _complete(path):
+    if path.lower().endswith(('.xlsx', '.xlsm')): return zipfile.is_zipfile(path)
+    try:
+        with open(path, 'rb'): return True
+    except OSError: return False
+
+def _norm(path): return os.path.normcase(os.path.abspath(path))
+
+class SourceWatcher(QObject):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.fs = QFileSystemWatcher(self); self.fs.fileChanged.connect(self.on_file); self.fs.directoryChanged.connect(self.on_dir)
+        self.files = {}    # 키 → (경로, 콜백)
+        self.folders = {}  # 폴더 → [콜백, 이미 본 파일 set]
+        self.pending = {}  # 경로 → (마지막 stat, 콜백 목록)
+        self.timer = QTimer(self); self.timer.setInterval(config.WATCH_DEBOUNCE_MS); self.timer.timeout.connect(self.settle)
+
+    def watch(self, key, path, callback):
+        # 키(페이지, 이름)당 파일 하나: 같은 키로 다른 경로를 주면 이전 경로는 해제, 빈 경로면 해제만
+        old = self.files.pop(key, None)
+        if old and not any(p == old[0] for p, _ in self.files.values()) and old[0] in self.fs.files(): self.fs.removePath(old[0])
+        if not path or not os.path.exists(path): return
+        path = _norm(path); self.files[key] = (path, callback)
+        if path not in self.fs.files(): self.fs.addPath(path)
+
+    def watch_folder(self, folder, callback):
+        # 폴더에 새로 생긴 파일(WATCH_DROP_PATTERN)만 알림. 감시 시작 시점에 이미 있던 파일은 무시
+        if not folder or not os.path.isdir(folder): return
+        folder = _norm(folder); self.folders[folder] = [callback, set(self.listing(folder))]
+        if folder not in self.fs.directories(): self.fs.addPath(folder)
+
+    @staticmethod
+    def listing(folder):
+        return [os.path.join(folder, f) for f in os.listdir(folder) if not f.startswith("~$") and fnmatch.fnmatch(f.lower(), config.WATCH_DROP_PATTERN)]
+
+    def on_file(self, path):
+        callbacks = [cb for p, cb in self.files.values() if p == path]
+        if callbacks: self.defer(path, callbacks)
+
+    def on_dir(self, folder):
+        entry = self.folders.get(folder)
+        if entry is None or not os.path.isdir(folder): return
+        current = set(self.listing(folder))
+        for path in current - entry[1]: self.defer(path, [entry[0]])
+        entry[1] = current
+
+    def defer(self, path, callbacks):
+        # 알림이 올 때마다 stat을 갱신 → 마지막 알림 이후 한 간격 동안 변화가 없어야 완료
+        self.pending[path] = (_stat(path), callbacks)
+        if not self.timer.isActive(): self.timer.start()
+
+    def settle(self):
+        for path, (last, callbacks) in list(self.pending.items()):
+            now = _stat(path)
+            if now is None and last is None: del self.pending[path]; continue   # 이름 바꾸기 저장이 아니라 삭제된 파일
+            if now is None or now != last or not _complete(path): self.pending[path] = (now, callbacks); continue
+            del self.pending[path]
+            if path in (p for p, _ in self.files.values()) and path not in self.fs.files(): self.fs.addPath(path)
+            for cb in callbacks: cb(path)
+        if not self.pending: self.timer.stop()
+
+_watcher = None
+def watcher():
+    # 앱 전역 감시자 (최초 사용 시 생성)
+    global _watcher
+    if _watcher is None: _watcher = SourceWatcher()
+    return _watcher
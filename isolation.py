@@ -0,0 +1,172 @@
+import os
+import atexit
+import signal
+import weakref
+import threading
+import contextlib
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+import config
+import progress
+
+# --- Process-Isolated Readers ---
+# 엑셀/COM 읽기와 캐시 역직렬화를 별도 프로세스에서 실행 (Excel 크래시 격리, GUI 프로세스의 GIL 점유 없음)
+# 결과 프레임의 열 데이터는 프레임당 공유 메모리 블록 하나로 넘기고, GUI 프로세스는 복사 없이 numpy 배열로 그대로 매핑
+# 파이프로는 열 이름/dtype/오프셋 등 작은 메타데이터만 전달 (큰 프레임 피클링 없음)
+
+ALIGN = 64
+# 결과를 기다리는 동안 작업 취소를 확인하는 간격 (초)
+POLL_S = 0.2
+
+def _encode_column(s):
+    # (공유 메모리에 올릴 배열 또는 None, 복원 정보)
+    dtype = s.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufc": return s.to_numpy(), ("raw",)
+    if isinstance(dtype, np.dtype) and dtype.kind in "mM": return s.to_numpy().view("i8"), ("time", dtype.str)
+    if isinstance(dtype, pd.CategoricalDtype): return s.cat.codes.to_numpy(), ("category", dtype)
+    if dtype == object:
+        # 문자열 열: 코드 배열은 공유 메모리로, 고유값만 피클 (NaN 코드 -1은 고유값 끝의 NaN을 가리키도록)
+        try: codes, uniques = pd.factorize(s, use_na_sentinel=True)
+        except TypeError: return None, ("pickle", s.array)
+        na = s[codes < 0].iloc[0] if len(codes) and codes.min() < 0 else np.nan
+        table = np.empty(len(uniques) + 1, dtype=object); table[:-1] = uniques; table[-1] = na
+        return codes.astype(np.int32 if len(uniques) < 2**31 else np.int64), ("object", table)
+    return None, ("pickle", s.array)
+
+def _decode_column(arr, spec):
+    kind = spec[0]
+    if kind == "raw": return arr
+    if kind == "time": return arr.view(spec[1])
+    if kind == "category": return pd.Categorical.from_codes(arr, dtype=spec[1])
+    if kind == "object": return spec[1].take(arr)
+    return spec[1]
+
+def encode_frame(df, blocks):
+    cols = [_encode_column(df.iloc[:, i]) for i in range(df.shape[1])]
+    index = None if isinstance(df.index, pd.RangeIndex) else _encode_column(df.index.to_series())
+    parts = cols + ([index] if index is not None else [])
+    offsets = []; size = 0
+    for arr, _ in parts:
+        offsets.append(size if arr is not None else None)
+        if arr is not None: size += -(-arr.nbytes // ALIGN) * ALIGN
+    shm = None
+    if size:
+        shm = shared_memory.SharedMemory(create=True, size=size); blocks.append(shm)
+        for (arr, _), off in zip(parts, offsets):
+            if arr is not None: np.ndarray(arr.shape, arr.dtype, buffer=shm.buf, offset=off)[:] = arr
+    specs = [(None if arr is None else (arr.dtype.str, len(arr), off), spec) for (arr, spec), off in zip(parts, offsets)]
+    return {"__frame__": True, "shm": shm.name if shm else None, "columns": list(df.columns), "specs": specs,
+            "index": None if index is not None else (df.index.start, df.index.stop, df.index.step), "index_name": df.index.name, "attrs": dict(df.attrs)}
+
+def encode(obj, blocks):
+    if isinstance(obj, pd.DataFrame): return encode_frame(obj, blocks)
+    if isinstance(obj, dict): return {"__dict__": [(k, encode(v, blocks)) for k, v in obj.items()]}
+    if isinstance(obj, (list, tuple)): return {"__seq__": type(obj).__name__, "items": [encode(v, blocks) for v in obj]}
+    return obj
+
+# GUI 프로세스에서 매핑한 블록: 배열이 모두 사라진 뒤 닫음 (아직 참조 중이면 다음 기회에 다시 시도)
+_retired = []
+def _release_retired():
+    for shm in _retired[:]:
+        try: shm.close(); _retired.remove(shm)
+        except BufferError: pass
+
+def decode_frame(m):
+    arrays = []; block = None
+    if m["shm"] is not None:
+        shm = shared_memory.SharedMemory(name=m["shm"])
+        if os.name != "nt": shm.unlink()   # POSIX: 이름만 제거, 매핑은 유지 (Windows는 마지막 핸들이 닫힐 때 해제)
+        block = np.frombuffer(shm.buf, dtype=np.uint8); weakref.finalize(block, _retired.append, shm)
+    for layout, spec in m["specs"]:
+        if layout is None: arr = None
+        elif block is None: arr = np.empty(0, np.dtype(layout[0]))   # 빈 프레임
+        else: arr = np.ndarray((layout[1],), np.dtype(layout[0]), buffer=block, offset=layout[2])
+        arrays.append(_decode_column(arr, spec))
+    index = pd.RangeIndex(*m["index"], name=m["index_name"]) if m["index"] is not None else pd.Index(arrays.pop(), name=m["index_name"])
+    df = pd.DataFrame(dict(enumerate(arrays)), index=index, copy=False); df.columns = m["columns"]; df.attrs.update(m["attrs"])
+    return df
+
+def decode(obj):
+    if isinstance(obj, dict) and obj.get("__frame__"): return decode_frame(obj)
+    if isinstance(obj, dict) and "__dict__" in obj: return {k: decode(v) for k, v in obj["__dict__"]}
+    if isinstance(obj, dict) and "__seq__" in obj:
+        items = [decode(v) for v in obj["items"]]
+        return tuple(items) if obj["__seq__"] == "tuple" else items
+    return obj
+
+# --- Process Lifetime ---
+# 리더 프로세스는 daemon이 아님 → 그 안에서 시트 그룹 프로세스를 다시 띄울 수 있음 (load_task → read_sheets)
+# 대신 수명은 직접 관리: 작업이 취소되거나 실패하면 즉시 종료, 인터프리터 종료 시 남은 프로세스 종료
+# 자식은 SIGTERM을 받으면 자기 자식부터 종료 (Windows의 terminate는 강제 종료라 손자 프로세스는 읽기를 마친 뒤 스스로 끝남)
+_live = set(); _live_lock = threading.Lock()
+
+def _terminate_live():
+    with _live_lock: procs = list(_live)
+    for p in procs:
+        if p.is_alive(): p.terminate()
+    for p in procs: p.join(5)
+atexit.register(_terminate_live)
+
+def _on_sigterm(*_): _terminate_live(); os._exit(1)
+
+# --- Shared Session Slots ---
+# 자원별(config.JOB_LIMITS) 프로세스 간 세마포어. 최상위 프로세스에서 한 번 만들고 자식/손자 프로세스에 그대로 물려줌
+# → 여러 작업의 시트 그룹이 동시에 열 수 있는 Excel 세션 수가 스케줄러의 excel 한도를 넘지 않음
+_slots = None; _slots_lock = threading.Lock()
+
+def _shared_slots():
+    global _slots
+    with _slots_lock:
+        if _slots is None:
+            ctx = mp.get_context("spawn"); _slots = {r: ctx.BoundedSemaphore(n) for r, n in config.JOB_LIMITS.items()}
+    return _slots
+
+@contextlib.contextmanager
+def slot(resource):
+    sem = _shared_slots()[resource]
+    with sem: yield
+
+def _child_main(conn, slots, fn, args):
+    # 작업 프로세스: 진행률은 파이프로 보고, 결과는 공유 메모리에 올린 뒤 부모가 매핑을 마칠 때까지 핸들 유지
+    global _slots; _slots = slots; lock = threading.Lock()
+    if os.name != "nt": signal.signal(signal.SIGTERM, _on_sigterm)
+    def send_progress(pct):
+        with lock: conn.send(("progress", pct))
+    progress.set_report_hook(send_progress)
+    blocks = []; sent = False
+    try:
+        payload = encode(fn(*args), blocks)
+        with lock: conn.send(("done", payload))
+        sent = True; conn.recv()
+    except Exception as e:
+        if not sent:
+            for shm in blocks: shm.unlink()
+            try: conn.send(("error", str(e)))
+            except OSError: pass
+    finally:
+        for shm in blocks: shm.close()
+        conn.close()
+
+def run_isolated(fn, *args):
+    # 스케줄러 워커 스레드(또는 리더 프로세스의 스레드)에서 호출: 자식 프로세스를 띄우고 결과가 올 때까지 대기
+    # 실행 중인 작업이 취소되면 자식 프로세스를 바로 종료
+    ctx = mp.get_context("spawn"); conn, child_conn = ctx.Pipe()
+    proc = ctx.Process(target=_child_main, args=(child_conn, _shared_slots(), fn, args))
+    with _live_lock: _live.add(proc)
+    proc.start(); child_conn.close(); finished = False
+    try:
+        while True:
+            while not conn.poll(POLL_S):
+                if progress.cancelled(): raise RuntimeError("Cancelled")
+            try: msg = conn.recv()
+            except EOFError: proc.join(5); raise RuntimeError(f"Reader process exited unexpectedly (exit code {proc.exitcode})")
+            if msg[0] == "progress": progress.report(msg[1])
+            elif msg[0] == "error": finished = True; raise RuntimeError(msg[1])
+            else:
+                _release_retired(); result = decode(msg[1]); conn.send("ack"); finished = True; return result
+    finally:
+        conn.close(); proc.join(5 if finished else 0)
+        if proc.is_alive(): proc.terminate(); proc.join()
+        with _live_lock: _live.discard(proc)
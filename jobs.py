@@ -0,0 +1,146 @@
+import threading
+import itertools
+import traceback
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+import config
+import progress
+
+# --- Job Scheduler ---
+# 모든 백그라운드 작업(엑셀 로드, 비교/피벗 계산)을 하나의 워커 풀에서 실행
+# 우선순위 큐 + 자원별 동시 실행 제한(config.JOB_LIMITS) + 작업 의존성(after) + 단일 시그널 버스로 GUI 스레드에 결과 전달
+PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW = 0, 10, 20
+
+class Job:
+    def __init__(self, scheduler, jid, fn, args, kwargs, resource, priority, after, key, on_result, on_error, on_progress):
+        self.scheduler = scheduler; self.id = jid; self.fn = fn; self.args = args; self.kwargs = kwargs
+        self.resource = resource; self.priority = priority; self.after = list(after); self.key = key
+        self.on_result = on_result; self.on_error = on_error; self.on_progress = on_progress
+        self.state = "waiting"; self.cancelled = False; self.result = None; self.error = None; self.dependents = []
+        self.pending = sum(d.state != "done" for d in self.after)
+    def cancel(self): self.scheduler.cancel(self)
+    def report(self, pct):
+        if not self.cancelled: self.scheduler.bus.progress.emit(self.id, pct)
+    @property
+    def finished(self): return self.state in ("done", "failed", "cancelled")
+
+class JobBus(QObject):
+    # 워커 스레드에서 emit → 메인 스레드(버스 소유)로 큐잉되어 전달
+    done = pyqtSignal(int, object); failed = pyqtSignal(int, str); progress = pyqtSignal(int, int)
+
+class JobWorker(QThread):
+    def __init__(self, scheduler): super().__init__(); self.scheduler = scheduler
+    def run(self):
+        while True:
+            job = self.scheduler.next_job()
+            if job is None: return
+            self.scheduler.execute(job)
+
+class JobScheduler(QObject):
+    def __init__(self, workers=None, limits=None):
+        super().__init__()
+        self.limits = dict(config.JOB_LIMITS if limits is None else limits); self.running = {r: 0 for r in self.limits}
+        self.ready = []; self.jobs = {}; self.keys = {}; self.ids = itertools.count(1); self.seq = itertools.count()
+        self.cond = threading.Condition(); self.closed = False
+        self.bus = JobBus(); self.bus.done.connect(self.deliver); self.bus.failed.connect(self.deliver_error); self.bus.progress.connect(self.deliver_progress)
+        self.workers = [JobWorker(self) for _ in range(workers or config.JOB_WORKERS)]
+        for w in self.workers: w.start()
+
+    def submit(self, fn, *args, resource="cpu", priority=PRIORITY_NORMAL, after=(), key=None, on_result=None, on_error=None, on_progress=None, **kwargs):
+        # after 작업들이 모두 끝나면 fn(*args, *[after 결과], **kwargs) 실행. 같은 key로 다시 제출하면 이전 작업은 취소
+        if resource not in self.limits: raise ValueError(f"Unknown job resource: {resource}")
+        with self.cond:
+            if key is not None and key in self.keys: self._cancel(self.keys[key])
+            job = Job(self, next(self.ids), fn, args, kwargs, resource, priority, after, key, on_result, on_error, on_progress)
+            self.jobs[job.id] = job
+            if key is not None: self.keys[key] = job
+            dead = next((d for d in job.after if d.state in ("failed", "cancelled")), None)
+            if dead is not None: self._fail(job, dead.error or "Dependency cancelled", cancelled=dead.state == "cancelled")
+            else:
+                for d in job.after:
+                    if not d.finished: d.dependents.append(job)
+                if job.pending == 0: self._enqueue(job)
+        return job
+
+    def cancel(self, job):
+        with self.cond: self._cancel(job)
+
+    def shutdown(self, wait_ms=2000):
+        with self.cond:
+            self.closed = True
+            for _, _, job in self.ready: job.cancelled = True; job.state = "cancelled"
+            self.ready.clear(); self.cond.notify_all()
+        for w in self.workers: w.wait(wait_ms)
+
+    # --- 내부 (self.cond 잠금 상태에서 호출) ---
+    def _enqueue(self, job): job.state = "ready"; self.ready.append((job.priority, next(self.seq), job)); self.cond.notify_all()
+    def _cancel(self, job):
+        if job.finished: return
+        if job.state == "ready": self.ready = [e for e in self.ready if e[2] is not job]
+        job.cancelled = True; self.jobs.pop(job.id, None)
+        if job.state != "running": job.state = "cancelled"
+        if self.keys.get(job.key) is job: del self.keys[job.key]
+        for d in job.dependents: self._cancel(d)
+    def _fail(self, job, error, cancelled=False):
+        job.state = "cancelled" if cancelled else "failed"; job.error = error
+        if cancelled: self.jobs.pop(job.id, None)
+        elif not job.cancelled: self.bus.failed.emit(job.id, error)
+        for d in job.dependents:
+            if not d.finished: self._fail(d, error, cancelled)
+    def _resolve(self, job):
+        # 선행 작업 하나가 끝났을 때 후속 작업 상태 갱신
+        for d in job.dependents:
+            if d.finished: continue
+            if job.state == "failed": self._fail(d, job.error)
+            else:
+                d.pending -= 1
+                if d.pending == 0: self._enqueue(d)
+
+    def next_job(self):
+        # 자원 여유가 있는 작업 중 우선순위가 가장 높은(먼저 제출된) 작업
+        with self.cond:
+            while True:
+                if self.closed: return None
+                runnable = [e for e in self.ready if self.running[e[2].resource] < self.limits[e[2].resource]]
+                if runnable:
+                    entry = min(runnable, key=lambda e: e[:2]); self.ready.remove(entry); job = entry[2]
+                    self.running[job.resource] += 1; job.state = "running"; return job
+                self.cond.wait()
+
+    def execute(self, job):
+        progress.bind(job); error = None
+        try: result = job.fn(*job.args, *[d.result for d in job.after], **job.kwargs)
+        except Exception as e: result = None; error = str(e); traceback.print_exc()
+        finally: progress.bind(None)
+        with self.cond:
+            self.running[job.resource] -= 1; job.result = result
+            if job.cancelled: job.state = "cancelled"
+            elif error is not None: self._fail(job, error)
+            else: job.state = "done"; self.bus.done.emit(job.id, result)
+            self._resolve(job); self.cond.notify_all()
+
+    # --- 메인 스레드 전달 ---
+    def _take(self, jid):
+        job = self.jobs.pop(jid, None)
+        if job is None or job.cancelled: return None
+        if self.keys.get(job.key) is job: del self.keys[job.key]
+        return job
+    def deliver(self, jid, result):
+        job = self._take(jid)
+        if job is not None and job.on_result: job.on_result(result)
+    def deliver_error(self, jid, error):
+        job = self._take(jid)
+        if job is not None and job.on_error: job.on_error(error)
+    def deliver_progress(self, jid, pct):
+        job = self.jobs.get(jid)
+        if job is not None and not job.cancelled and job.on_progress: job.on_progress(pct)
+
+_scheduler = None
+def scheduler():
+    # 앱 전역 스케줄러 (최초 사용 시 생성, 앱 종료 시 워커 정리)
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = JobScheduler()
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication.instance()
+        if app: app.aboutToQuit.connect(_scheduler.shutdown)
+    return _scheduler
@@ -0,0 +1,22 @@
+import threading
+
+# --- Progress Reporting ---
+# 작업 함수(리더/비교)가 진행률을 보고하는 Qt 없는 경로. 스케줄러 워커는 실행 중인 작업을 bind하고, 격리 프로세스는 훅을 설정
+# 작업 밖(노트북, 배치 프로세스 풀)에서 호출하면 아무 일도 하지 않음
+_local = threading.local(); _report_hook = None
+
+def bind(job): _local.job = job
+
+def report(pct):
+    job = getattr(_local, 'job', None)
+    if job is not None: job.report(int(pct))
+    elif _report_hook is not None: _report_hook(int(pct))
+
+def cancelled():
+    # 실행 중인 작업이 취소되었는지 (오래 기다리는 작업 함수가 중간에 확인)
+    job = getattr(_local, 'job', None)
+    return job is not None and job.cancelled
+
+def set_report_hook(fn):
+    # 격리 프로세스 등 스케줄러 밖에서 실행되는 작업의 진행률 전달 경로
+    global _report_hook; _report_hook = fn
@@ -0,0 +1,39 @@
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAKES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fakes")
+if ROOT not in sys.path: sys.path.insert(0, ROOT)
+
+@pytest.fixture
+def fake_excel(monkeypatch, tmp_path):
+    # xlwings를 openpyxl 대체 모듈로 바꾸고 (격리 자식 프로세스 포함), 캐시는 임시 폴더에
+    monkeypatch.syspath_prepend(FAKES); monkeypatch.delitem(sys.modules, "xlwings", raising=False)
+    monkeypatch.chdir(tmp_path); monkeypatch.setenv("FAKE_XLWINGS_LOG", str(tmp_path / "sheet_reads.log"))
+    monkeypatch.setenv("FAKE_XLWINGS_SESSIONS", str(tmp_path / "sessions.log"))
+    return tmp_path
+
+def sheet_reads(tmp_path):
+    # fake_excel 이후 엑셀에서 읽은 시트 이름 (읽은 순서 무관, 호출하면 기록을 비움)
+    log = tmp_path / "sheet_reads.log"
+    if not log.exists(): return []
+    names = sorted(log.read_text(encoding="utf-8").split()); log.unlink(); return names
+
+def max_sessions(tmp_path):
+    # fake_excel 이후 동시에 열려 있던 Excel 세션의 최대 수 (모든 프로세스 합계)
+    log = tmp_path / "sessions.log"; n = peak = 0
+    for event in (log.read_text(encoding="utf-8").split() if log.exists() else []):
+        n += 1 if event == "+" else -1; peak = max(peak, n)
+    return peak
+
+def write_weekly(path, values):
+    # config.WEEKLY_SHEETS 형식의 주간 파일: B9 헤더(Brand, Model, Month, Week, Sales, Region), 시트마다 행 하나 (Sales = values[시트])
+    import datetime, openpyxl, config
+    wb = openpyxl.Workbook(); wb.remove(wb.active)
+    for s in config.WEEKLY_SHEETS:
+        ws = wb.create_sheet(s)
+        for col, (h, v) in enumerate([("Brand", "Apple"), ("Model", "iPhone"), ("Month", datetime.datetime(2024, 1, 1)), ("Week", 1), ("Sales", values.get(s, 0)), ("Region", "W.Europe")], 2):
+            ws.cell(9, col, h); ws.cell(10, col, v)
+    wb.create_sheet("Notes")["A1"] = values.get("Notes", 0)
+    wb.save(path)
@@ -0,0 +1,50 @@
+# 테스트용 xlwings 대체 (openpyxl 기반): 리더가 쓰는 App / books.open / sheets[...] / used_range 만 흉내냄
+# spawn 자식 프로세스도 부모의 sys.path를 물려받으므로 격리 리더 안에서도 이 모듈이 import됨
+import os
+import time
+import openpyxl
+
+class _Cell:
+    def __init__(self, row, column): self.row = row; self.column = column
+
+class _Range:
+    def __init__(self, ws, r1=None, c1=None, r2=None, c2=None):
+        self.row = r1 or ws.min_row; self.column = c1 or ws.min_column
+        r2 = r2 or ws.max_row; c2 = c2 or ws.max_column; self.last_cell = _Cell(r2, c2)
+        self.value = [list(r) for r in ws.iter_rows(min_row=self.row, max_row=r2, min_col=self.column, max_col=c2, values_only=True)]
+    def options(self, **kw): return self
+
+class _Sheet:
+    def __init__(self, ws): self.ws = ws; self.name = ws.title
+    @property
+    def used_range(self): return _Range(self.ws)
+    def range(self, a, b): return _Range(self.ws, a[0], a[1], b[0], b[1])
+
+class _Sheets(dict):
+    # 읽은 시트 이름을 FAKE_XLWINGS_LOG 파일에 한 줄씩 기록 (자식 프로세스에서 읽은 시트도 부모 테스트가 확인할 수 있게)
+    def __getitem__(self, name):
+        log = os.environ.get("FAKE_XLWINGS_LOG")
+        if log:
+            with open(log, "a", encoding="utf-8") as f: f.write(name + "\n")
+        return super().__getitem__(name)
+
+class _Book:
+    def __init__(self, path): self.wb = openpyxl.load_workbook(path, data_only=True)
+    @property
+    def sheets(self): return _Sheets((ws.title, _Sheet(ws)) for ws in self.wb.worksheets)
+    def close(self): self.wb.close()
+
+class _Books:
+    def open(self, path, read_only=True): return _Book(path)
+
+def _log_session(event):
+    # FAKE_XLWINGS_SESSIONS: 세션 시작/종료를 "+"/"-"로 기록, FAKE_XLWINGS_HOLD: 세션을 여는 데 걸리는 시간(초)
+    log = os.environ.get("FAKE_XLWINGS_SESSIONS")
+    if log:
+        with open(log, "a", encoding="utf-8") as f: f.write(event + "\n")
+
+class App:
+    def __init__(self, visible=False): self.books = _Books()
+    def __enter__(self):
+        _log_session("+"); time.sleep(float(os.environ.get("FAKE_XLWINGS_HOLD", 0))); return self
+    def __exit__(self, *exc): _log_session("-"); return False
@@ -0,0 +1,49 @@
+import gc
+import threading
+import pandas as pd
+import analytics
+from analytics import FrameCache, cube_for, indexed_for
+
+def frame(n=4): return pd.DataFrame({"Brand_Group": ["A", "B"] * (n // 2), "Region": "US", "Year": 2024, "Month": range(1, n + 1), "Sales": 1.0})
+
+def test_frame_cache_builds_once_per_frame_and_key():
+    calls = []; cache = FrameCache(lambda df, k: calls.append(k) or object())
+    df = frame(); a = cache.get(df, 1)
+    assert cache.get(df, 1) is a and cache.get(df, 2) is not a and calls == [1, 2]
+    assert cache.get(frame(), 1) is not a
+
+def test_frame_cache_drops_entries_when_frame_is_released():
+    cache = FrameCache(lambda df: object()); df = frame(); cache.get(df)
+    assert len(cache.items) == 1
+    del df; gc.collect()
+    assert len(cache.items) == 0
+
+def test_frame_cache_is_bounded():
+    cache = FrameCache(lambda df: object(), size=3); frames = [frame() for _ in range(5)]
+    for df in frames: cache.get(df)
+    assert [k[0] for k in cache.items] == [id(df) for df in frames[-3:]]
+
+def test_frame_cache_concurrent_gets_share_one_value():
+    cache = FrameCache(lambda df: object()); df = frame(); out = []
+    threads = [threading.Thread(target=lambda: out.append(cache.get(df))) for _ in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert len({id(v) for v in out}) == 1
+
+def test_cached_structures_do_not_keep_frames_alive():
+    df = frame(); cube_for(df, "Month"); ix = indexed_for(df)
+    assert ix.df is df and len(ix.select(Region="US")) == len(df)
+    n_cubes, n_indexed = len(analytics._CUBES.items), len(analytics._INDEXED.items)
+    del df; gc.collect()
+    assert len(analytics._CUBES.items) == n_cubes - 1 and len(analytics._INDEXED.items) == n_indexed - 1
+
+def test_month_cutoffs_match_month_filtered_cube():
+    weeks = pd.DataFrame({"Year": [2024] * 10 + [2025] * 6, "Week": list(range(1, 11)) + list(range(1, 7))})
+    df = weeks.assign(MonthNum=(weeks["Week"] + 3) // 4, Brand_Group="A", Region="US", Sales=1.0)
+    cube = cube_for(df, "Week"); cuts = analytics.month_cutoffs(df, "Week")
+    for m in range(1, 13):
+        filtered = cube_for(df[df["MonthNum"] <= m].copy(), "Week")
+        for y in (2024, 2025):
+            assert analytics.ytd_cutoff(cube, y, "Week", cuts.at[y, m]) == analytics.ytd_cutoff(filtered, y, "Week")
+            assert cube.ytd(y, cuts.at[y, m]).equals(filtered.ytd(y, 52))
+    assert cuts.at[2025, 1] == 4 and cuts.at[2025, 12] == 6 and analytics.ytd_cutoff(cube, 2026, "Week", -1) == 52
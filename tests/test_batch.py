@@ -0,0 +1,51 @@
+import os
+import json
+import pandas as pd
+import pytest
+import config
+import batch
+from conftest import write_weekly
+
+def args(argv): return batch.build_parser().parse_args(argv)
+
+def test_plan_pairs_consecutive_files():
+    tasks = batch.plan(args(["weekly", "a.xlsx", "b.xlsx", "c.xlsx", "-o", "out"]))
+    assert [t[0] for t in tasks] == ["weekly a -> b", "weekly b -> c"]
+    assert tasks[0][1] is batch.task_compare and tasks[0][2][:4] == ("weekly", "a.xlsx", "b.xlsx", "out")
+
+def test_plan_requires_two_files_for_compare():
+    with pytest.raises(SystemExit): batch.plan(args(["monthly", "a.xlsx"]))
+
+def test_manifest_paths_are_relative_to_manifest(tmp_path):
+    m = tmp_path / "m.json"
+    m.write_text(json.dumps({"out": "rep", "format": ["csv"], "tasks": [{"kind": "region", "path": "r.xlsx", "years": [2024, 2025]}, {"kind": "cache", "loader": "omdia", "path": "o.xlsx"}]}))
+    a = args(["run", str(m)]); tasks = batch.plan(a)
+    assert a.out == str(tmp_path / "rep") and a.format == ["csv"]
+    assert tasks[0][2] == (str(tmp_path / "r.xlsx"), str(tmp_path / "rep"), ["csv"], [2024, 2025])
+    assert tasks[1][2] == ("omdia", str(tmp_path / "o.xlsx"))
+
+def test_manifest_rejects_unknown_task(tmp_path):
+    m = tmp_path / "m.json"; m.write_text(json.dumps({"tasks": [{"kind": "nope"}]}))
+    with pytest.raises(SystemExit): batch.plan(args(["run", str(m)]))
+
+def test_write_tables_keeps_only_meaningful_index(tmp_path):
+    pivot = pd.DataFrame({"US": [1, 2]}, index=pd.Index(["A", "B"], name="Brand")); flat = pd.DataFrame({"x": [1]})
+    written = batch.write_tables(str(tmp_path), "r", {"YoY %": pivot, "Flat": flat}, ["xlsx", "csv"])
+    assert [os.path.basename(p) for p in written] == ["r.xlsx", "r_YoY_pct.csv", "r_Flat.csv"]
+    assert pd.read_csv(tmp_path / "r_YoY_pct.csv").columns.tolist() == ["Brand", "US"]
+    assert pd.read_csv(tmp_path / "r_Flat.csv").columns.tolist() == ["x"]
+
+def test_main_runs_weekly_compare_end_to_end(fake_excel, capsys):
+    # 프로세스 풀(spawn) + 실제 주간 리더 (xlwings 대체 모듈), 캐시는 GUI와 같은 폴더 규칙
+    for name, v in (("w1.xlsx", 1), ("w2.xlsx", 2)): write_weekly(str(fake_excel / name), {s: v for s in config.WEEKLY_SHEETS})
+    code = batch.main(["weekly", str(fake_excel / "w1.xlsx"), str(fake_excel / "w2.xlsx"), "-o", str(fake_excel / "rep"), "--format", "csv", "-j", "2"])
+    out = capsys.readouterr().out
+    assert code == 0 and "[OK]   weekly w1 -> w2" in out and "1/1 tasks done" in out
+    assert sorted(os.listdir(fake_excel / "rep")) == ["w2_weekly_diff_Changes.csv", "w2_weekly_diff_Summary.csv"]
+    changes = pd.read_csv(fake_excel / "rep" / "w2_weekly_diff_Changes.csv")
+    assert len(changes) == len(config.WEEKLY_SHEETS) and set(changes["Type"]) == {"Changed"} and (changes["Sales_new"] - changes["Sales_old"] == 1).all()
+    assert any(f.startswith("cache_weekly_w2.xlsx_") for f in os.listdir(fake_excel / "cache"))
+
+def test_main_reports_failures(fake_excel, capsys):
+    code = batch.main(["cache", "weekly", str(fake_excel / "missing.xlsx"), "-j", "1"])
+    assert code == 1 and "[FAIL] cache weekly missing" in capsys.readouterr().out
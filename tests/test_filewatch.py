@@ -0,0 +1,36 @@
+import pytest
+from PyQt5.QtCore import QCoreApplication
+import filewatch
+
+@pytest.fixture
+def watcher(monkeypatch):
+    # 실제 파일 대신 가짜 stat: {경로: (크기, 수정 시각) 또는 None}
+    app = QCoreApplication.instance() or QCoreApplication([])
+    stats = {}; monkeypatch.setattr(filewatch, "_stat", lambda p: stats.get(p)); monkeypatch.setattr(filewatch, "_complete", lambda p: True)
+    w = filewatch.SourceWatcher(); w.stats = stats; yield w
+    w.timer.stop()
+
+def test_settle_waits_until_stat_is_stable(watcher):
+    hits = []; watcher.stats["f"] = (1, 1.0); watcher.defer("f", [hits.append])
+    watcher.stats["f"] = (2, 2.0); watcher.settle()   # 아직 쓰는 중
+    assert hits == [] and "f" in watcher.pending
+    watcher.settle()                                   # 한 간격 동안 그대로 → 완료
+    assert hits == ["f"] and not watcher.pending and not watcher.timer.isActive()
+
+def test_repeated_events_notify_once(watcher):
+    hits = []; watcher.stats["f"] = (1, 1.0)
+    for _ in range(3): watcher.defer("f", [hits.append])
+    watcher.settle(); watcher.settle()
+    assert hits == ["f"]
+
+def test_incomplete_file_is_not_reported(watcher, monkeypatch):
+    hits = []; watcher.stats["f"] = (1, 1.0); monkeypatch.setattr(filewatch, "_complete", lambda p: False)
+    watcher.defer("f", [hits.append]); watcher.settle()
+    assert hits == [] and "f" in watcher.pending
+
+def test_rename_save_waits_and_deleted_file_is_dropped(watcher):
+    hits = []; watcher.defer("f", [hits.append])       # 이름 바꾸기 저장 중: 잠깐 없음
+    watcher.settle(); assert hits == [] and not watcher.pending   # 두 번 연속 없음 → 삭제로 보고 포기
+    watcher.defer("g", [hits.append]); watcher.stats["g"] = (1, 1.0)
+    watcher.settle(); watcher.settle()
+    assert hits == ["g"]
@@ -0,0 +1,43 @@
+import types
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import charts
+
+def make_axes(series):
+    fig = Figure(figsize=(8, 4), dpi=100); FigureCanvasAgg(fig); ax = fig.add_subplot(111)
+    lines = [ax.plot(x, y)[0] for x, y in series]; ax.set_xlim(0, 60); ax.set_ylim(0, 100)
+    return ax, lines
+
+def event_at(ax, x, y):
+    # 데이터 좌표 (x, y) 위치의 마우스 이벤트 (화면 좌표 x/y + 데이터 좌표 xdata/ydata)
+    px, py = ax.transData.transform((x, y))
+    return types.SimpleNamespace(x=px, y=py, xdata=x, ydata=y, inaxes=ax)
+
+def widget(ax, lines, snap):
+    index = charts.HoverIndex(); index.build(lines)
+    return types.SimpleNamespace(ax=ax, hover_index=index, hover_snap=snap)
+
+def test_snap_picks_nearest_series_at_cursor_x():
+    weeks = np.arange(1, 53, dtype=float); ax, (low, high) = make_axes([(weeks, np.full(52, 20.0)), (weeks, np.full(52, 80.0))])
+    ev = event_at(ax, 10.3, 60)   # 두 선 사이, 반경 밖
+    assert charts.BaseChartWidget.find_hover_point(widget(ax, [low, high], False), ev) is None
+    line, x, y = charts.BaseChartWidget.find_hover_point(widget(ax, [low, high], True), ev)
+    assert (line, x, y) == (high, 10.0, 80.0)
+
+def test_snap_skips_gaps_and_clamps_to_series_ends():
+    ax, (line,) = make_axes([(np.array([1, 2, np.nan, 40, 41]), np.array([5, 6, 7, 8, 9]))])
+    index = charts.HoverIndex(); index.build([line])
+    assert index.snap(ax, event_at(ax, 20, 50))[1:] == (2.0, 6.0)
+    assert index.snap(ax, event_at(ax, 59, 50))[1:] == (41.0, 9.0)
+
+def test_nearest_uses_radius_with_many_points():
+    x = np.linspace(0, 60, 500); ax, (line,) = make_axes([(x, np.full(500, 50.0))])
+    index = charts.HoverIndex(); index.build([line])
+    hit = index.nearest(ax, event_at(ax, 30.01, 50.5))
+    assert hit is not None and index._tree is not None and abs(hit[1] - 30.01) < 0.2
+    assert index.nearest(ax, event_at(ax, 30, 90)) is None and index.snap(ax, event_at(ax, 30, 90)) is not None
+
+def test_line_charts_snap_by_default():
+    assert charts.LineChartWidget.hover_snap and charts.LaunchTrendWidget.hover_snap
+    assert not charts.HeatmapWidget.hover_snap
@@ -0,0 +1,35 @@
+import os
+import pandas as pd
+import pytest
+import config
+import isolation
+import data_loader as dl
+from conftest import write_weekly, max_sessions
+
+def make_frames(n):
+    return {"a": pd.DataFrame({"x": range(n), "s": [f"v{i % 3}" for i in range(n)], "t": pd.date_range("2024-01-01", periods=n)}), "b": (1, [2, 3])}
+
+def fail(msg): raise ValueError(msg)
+
+def read_weekly_multicore(path):
+    # 격리 자식 안에서 실행: 시트 그룹 3개를 각자 프로세스로 나눠 읽게 함 (Excel 세션 한도 2보다 많게)
+    config.SHEET_WORKERS = 3
+    return dl._read_weekly_impl(path)
+
+def test_run_isolated_round_trip():
+    out = isolation.run_isolated(make_frames, 5)
+    pd.testing.assert_frame_equal(out["a"], make_frames(5)["a"])
+    assert out["b"] == (1, [2, 3])
+
+def test_run_isolated_propagates_errors():
+    with pytest.raises(RuntimeError, match="boom"): isolation.run_isolated(fail, "boom")
+
+def test_load_task_reads_sheet_groups_within_excel_limit(fake_excel, monkeypatch):
+    # 기본 설정 (ISOLATED_READERS=True): 격리 리더 프로세스가 시트 그룹 프로세스를 띄움, 동시 세션은 JOB_LIMITS["excel"] 이하
+    assert config.ISOLATED_READERS and config.JOB_LIMITS["excel"] == 2
+    monkeypatch.setenv("FAKE_XLWINGS_HOLD", "0.5")
+    path = str(fake_excel / "w1.xlsx"); write_weekly(path, {s: i for i, s in enumerate(config.WEEKLY_SHEETS)})
+    data = dl.load_task(path, "weekly", read_weekly_multicore)
+    assert list(data) == config.WEEKLY_SHEETS
+    assert [int(d["Sales"].iloc[0]) for d in data.values()] == list(range(len(config.WEEKLY_SHEETS)))
+    assert max_sessions(fake_excel) == 2
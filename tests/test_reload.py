@@ -0,0 +1,44 @@
+import os
+import config
+import isolation
+import data_loader as dl
+from conftest import write_weekly, sheet_reads
+
+def with_workers(workers, fn, *args):
+    # 격리 자식 안에서 실행: 시트 그룹을 여러 개로 나눠 읽게 함 (load_task와 같은 중첩 경로, 테스트 머신 코어 수와 무관)
+    config.SHEET_WORKERS = workers
+    return fn(*args)
+
+def load(path): return isolation.run_isolated(with_workers, 3, dl.load_or_cache, path, "weekly", dl._read_weekly_impl)
+
+def save(path, values, bump):
+    write_weekly(path, values); st = os.stat(path); os.utime(path, (st.st_atime, st.st_mtime + bump))
+
+def test_sheet_hashes_change_only_for_edited_sheet(fake_excel):
+    path = str(fake_excel / "w.xlsx"); write_weekly(path, {}); before = dl.sheet_hashes(path)
+    write_weekly(path, {"Basefile_China": 7}); after = dl.sheet_hashes(path)
+    assert set(before) == set(config.WEEKLY_SHEETS) | {"Notes"}
+    assert [s for s in before if before[s] != after[s]] == ["Basefile_China"]
+
+def test_sheet_hashes_none_for_non_zip(fake_excel):
+    (fake_excel / "old.xls").write_bytes(b"not a zip"); assert dl.sheet_hashes(str(fake_excel / "old.xls")) is None
+
+def test_reload_changed_merges_only_edited_sheet(fake_excel):
+    path = str(fake_excel / "w.xlsx"); base = {s: i for i, s in enumerate(config.WEEKLY_SHEETS)}
+    save(path, base, 0); load(path); assert sheet_reads(fake_excel) == sorted(config.WEEKLY_SHEETS)
+    save(path, {**base, "Basefile_China": 99}, 10); data = load(path)
+    assert sheet_reads(fake_excel) == ["Basefile_China"]
+    assert list(data) == config.WEEKLY_SHEETS
+    assert {s: int(d["Sales"].iloc[0]) for s, d in data.items()} == {**base, "Basefile_China": 99}
+
+def test_reload_changed_reuses_cache_when_other_sheets_change(fake_excel):
+    path = str(fake_excel / "w.xlsx"); save(path, {}, 0); first = load(path); sheet_reads(fake_excel)
+    save(path, {"Notes": 5}, 10); data = load(path)
+    assert sheet_reads(fake_excel) == []
+    assert all(data[s].equals(first[s]) for s in config.WEEKLY_SHEETS)
+
+def test_reload_changed_ignores_cache_from_other_path(fake_excel):
+    os.makedirs(fake_excel / "a"); os.makedirs(fake_excel / "b")
+    save(str(fake_excel / "a" / "w.xlsx"), {}, 0); load(str(fake_excel / "a" / "w.xlsx")); sheet_reads(fake_excel)
+    save(str(fake_excel / "b" / "w.xlsx"), {"Basefile_US": 3}, 10); data = load(str(fake_excel / "b" / "w.xlsx"))
+    assert sheet_reads(fake_excel) == sorted(config.WEEKLY_SHEETS) and int(data["Basefile_US"]["Sales"].iloc[0]) == 3
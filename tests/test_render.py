@@ -0,0 +1,32 @@
+import os
+import pytest
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt5.QtWidgets import QApplication
+import charts
+
+FRAME = ((10, 5), 100, 100, dict(left=0.1, right=0.9, top=0.9, bottom=0.1))
+
+@pytest.fixture
+def launch_widget():
+    app = QApplication.instance() or QApplication([])
+    w = charts.LaunchTrendWidget(); yield w
+    w.deleteLater()
+
+def render(widget, fn, *args):
+    # 워커 스레드가 하는 일을 현재 스레드에서 한 번 실행 → (데이터 상태, 화면 상태)
+    rt = charts.RenderThread(); out = []; rt.rendered.connect(lambda gen, result: out.append(result)); rt.error.connect(lambda gen, msg: out.append(msg))
+    rt.submit((widget, 1, fn, args, {}, FRAME, charts.snapshot_state(widget))); rt.submit(None); rt.run()
+    return out[0]
+
+def test_scene_writes_to_copy_and_reports_only_changes(launch_widget):
+    cache = launch_widget._color_cache; launch_widget.current_brand = "Apple"
+    data, scene = render(launch_widget, charts.LaunchTrendWidget._color_map, "Apple", "Smartphone", ["m2", "m1"])
+    assert cache == {} and launch_widget._color_cache is cache     # 워커는 위젯의 캐시를 건드리지 않음
+    assert set(data) == {"_color_cache"} and list(data["_color_cache"][("Apple", "Smartphone")]) == ["m1", "m2"]
+    assert scene is None
+
+def test_scene_does_not_forward_to_widget(launch_widget):
+    launch_widget.extra = 1; scene = launch_widget.make_scene(1, FRAME, {})
+    assert not hasattr(scene, "extra") and not hasattr(scene, "current_brand")
+    scene = launch_widget.make_scene(1, FRAME, charts.snapshot_state(launch_widget)[1])
+    assert scene.extra == 1 and scene.canvas is not launch_widget.canvas and scene.fig is not launch_widget.fig
@@ -0,0 +1,61 @@
+import time
+import threading
+import pandas as pd
+import pytest
+from PyQt5.QtCore import QCoreApplication
+import jobs
+from data_loader import extract_version, revision_row, revision_timeline
+
+def diff(rows, sumy=()):
+    return pd.DataFrame(rows, columns=["Sheet", "Brand", "Model", "Region", "Type", "Sales_old", "Sales_new"]), list(sumy), {}
+
+def test_versions_sort_by_week_then_date():
+    names = ["/d/Tracker W10 2026.xlsx", "/d/Tracker W2 2026.xlsx", "/d/Tracker W40 2025.xlsx"]
+    assert sorted(names, key=extract_version) == ["/d/Tracker W40 2025.xlsx", "/d/Tracker W2 2026.xlsx", "/d/Tracker W10 2026.xlsx"]
+
+def test_revision_row_counts_and_net_change():
+    df, sumy, _ = diff([("S", "A", "m1", "US", "Changed", 10, 15), ("S", "A", "m2", "US", "Changed", 5, 3), ("S", "B", "m3", "US", "Deleted", 4, "")], [{"Region": "US", "Latest Δ": 7}])
+    row = revision_row("/d/w1.xlsx", "/d/w2.xlsx", df, sumy)
+    assert row == {"From": "w1.xlsx", "To": "w2.xlsx", "Changed": 2, "Deleted": 1, "Net Δ": 15 - 10 + 3 - 5 - 4, "US Δ": 7}
+
+def test_revision_timeline_one_row_per_consecutive_pair():
+    t = revision_timeline(["w1", "w2", "w3"], diff([]), diff([("S", "A", "m", "China", "Changed", 1, 2)], [{"Region": "China", "Latest Δ": 1}]))
+    assert t[["From", "To", "Changed", "Net Δ"]].values.tolist() == [["w1", "w2", 0, 0], ["w2", "w3", 1, 1]]
+    assert t["China Δ"].tolist() == ["", 1]
+
+@pytest.fixture
+def scheduler():
+    app = QCoreApplication.instance() or QCoreApplication([])
+    s = jobs.JobScheduler(workers=3, limits={"excel": 2, "cpu": 2}); yield s
+    s.shutdown()
+
+def wait(cond, timeout=5):
+    end = time.time() + timeout
+    while not cond() and time.time() < end: QCoreApplication.processEvents(); time.sleep(0.01)
+    return cond()
+
+def test_series_pipeline_diffs_in_version_order(scheduler):
+    # 로드(excel) → 연속 쌍 diff(after=[new, old]) → 타임라인(after=모든 diff), 결과는 메인 스레드로 전달
+    paths = ["w1", "w2", "w3"]; got = {}
+    loads = [scheduler.submit(lambda p: p.upper(), p, resource="excel") for p in paths]
+    diffs = [scheduler.submit(lambda new, old: (old, new), after=[loads[i + 1], loads[i]]) for i in range(2)]
+    scheduler.submit(lambda ps, *ds: list(ds), paths, after=diffs, on_result=lambda r: got.setdefault("timeline", r))
+    assert wait(lambda: "timeline" in got)
+    assert got["timeline"] == [("W1", "W2"), ("W2", "W3")]
+
+def test_cancelling_a_load_cancels_dependent_diffs(scheduler):
+    gate = threading.Event(); delivered = []
+    load = scheduler.submit(lambda: gate.wait(5), resource="excel")
+    d = scheduler.submit(lambda r: r, after=[load], on_result=delivered.append)
+    t = scheduler.submit(lambda r: r, after=[d], on_result=delivered.append)
+    load.cancel(); gate.set()
+    assert wait(lambda: load.state == "cancelled")
+    assert d.state == "cancelled" and t.state == "cancelled"
+    QCoreApplication.processEvents(); assert delivered == []
+
+def test_failed_diff_fails_timeline(scheduler):
+    errors = []
+    def boom(): raise ValueError("bad sheet")
+    d = scheduler.submit(boom); t = scheduler.submit(lambda r: r, after=[d], on_error=errors.append)
+    assert wait(lambda: errors == ["bad sheet"])
+    assert d.state == "failed" and t.state == "failed"
@@ -0,0 +1,43 @@
+import openpyxl
+import pandas as pd
+import pytest
+from data_loader import SheetStream
+
+@pytest.fixture
+def sheet(fake_excel):
+    # B2 헤더, 10행 데이터, 빈 행 뒤에 표 밖 메모 (expand('table')처럼 무시되어야 함)
+    import xlwings
+    wb = openpyxl.Workbook(); ws = wb.active; ws.title = "Raw"
+    ws.append([]); ws.append([None, "Vendor", "Year", "Units", None, "note"])
+    for i in range(10): ws.append([None, f"V{i % 3}", 2020 + i % 2, i])
+    ws.append([]); ws.append([None, "memo", 1, 1])
+    path = str(fake_excel / "raw.xlsx"); wb.save(path)
+    return xlwings.App().books.open(path).sheets["Raw"]
+
+def test_chunks_stop_at_first_blank_row(sheet):
+    stream = SheetStream(sheet, 2, 2, chunk_rows=3)
+    assert stream.header == ["Vendor", "Year", "Units"]
+    assert [len(c) for c in stream.chunks()] == [3, 3, 3, 1]
+
+def test_frame_matches_whole_table_read(sheet):
+    df = SheetStream(sheet, 2, 2, chunk_rows=4).frame()
+    assert list(df.columns) == ["Vendor", "Year", "Units"] and df["Units"].tolist() == list(range(10))
+
+def test_projection_predicate_and_normalize_per_chunk(sheet):
+    norm = lambda d: d.assign(Units=d["Units"] * 10)
+    df = SheetStream(sheet, 2, 2, chunk_rows=3).frame(["Vendor", "Units"], {"Year": 2021}, norm)
+    assert list(df.columns) == ["Vendor", "Units"] and df["Units"].tolist() == [10, 30, 50, 70, 90]
+
+def test_empty_result_keeps_columns(sheet):
+    df = SheetStream(sheet, 2, 2, chunk_rows=3).frame(["Vendor"], {"Year": 1999})
+    assert df.empty and list(df.columns) == ["Vendor"]
+
+def test_ti_reader_keeps_only_ytd_columns(fake_excel):
+    import xlwings, config, data_loader as dl
+    wb = openpyxl.Workbook(); ws = wb.active; ws.title = config.TI_SHEET
+    ws.append(["Vendor", "Model", "Measure", "Year", "Month", "Value (M)", "Comment"])
+    for m in ("January", "February"): ws.append(["apple", "iPhone", "Sell-through", 2024, m, 1.5, "x" * 50])
+    path = str(fake_excel / "ti.xlsx"); wb.save(path)
+    df = dl._read_ti_impl(xlwings.App().books.open(path))
+    assert set(df.columns) == set(config.TI_COLUMNS) | {"Sales", "Brand"}
+    assert df["Month"].tolist() == [1, 2] and df["Sales"].tolist() == [1500000.0] * 2
@@ -0,0 +1,42 @@
+import pytest
+from PyQt5.QtCore import QCoreApplication
+import ui
+
+@pytest.fixture
+def updates(monkeypatch):
+    # 가짜 시계 (ms): 타이머 대신 flush()를 직접 호출
+    app = QCoreApplication.instance() or QCoreApplication([])
+    clock = [0.0]; monkeypatch.setattr(ui, "_now_ms", lambda: clock[0])
+    u = ui.UpdateCoordinator(None); u.clock = clock; yield u
+    u.timer.stop()
+
+def test_short_request_does_not_flush_longer_debounce(updates):
+    hits = []
+    updates.request("views", lambda: hits.append("views"), 400)
+    updates.request("pair", lambda: hits.append("pair"), 0)
+    assert updates.timer.interval() == 0
+    updates.flush(); assert hits == ["pair"] and list(updates.pending) == ["views"]
+    assert updates.timer.isActive() and updates.timer.interval() == 400
+    updates.clock[0] = 250; updates.flush(); assert hits == ["pair"]
+    updates.clock[0] = 400; updates.flush(); assert hits == ["pair", "views"] and not updates.timer.isActive()
+
+def test_repeated_request_restarts_only_its_own_deadline(updates):
+    hits = []
+    updates.request("month", lambda: hits.append("month"), 300); updates.request("launch", lambda: hits.append("launch"), 250)
+    updates.clock[0] = 200; updates.request("launch", lambda: hits.append("launch"), 250)
+    updates.clock[0] = 300; updates.flush(); assert hits == ["month"]
+    assert updates.timer.interval() == 150
+    updates.clock[0] = 450; updates.flush(); assert hits == ["month", "launch"]
+
+def test_batch_runs_its_requests_at_block_end(updates):
+    hits = []; updates.request("views", lambda: hits.append("views"), 400)
+    with updates.batch():
+        updates.request("launch", lambda: hits.append("launch"), 250)
+        assert updates.timer.interval() == 400
+    assert updates.timer.interval() == 0
+    updates.flush(); assert hits == ["launch"] and list(updates.pending) == ["views"]
+
+def test_cancel_rearms_for_remaining_keys(updates):
+    updates.request("a", lambda: None, 100); updates.request("b", lambda: None, 300)
+    updates.cancel("a"); assert updates.timer.interval() == 300
+    updates.cancel(); assert not updates.timer.isActive() and not updates.due